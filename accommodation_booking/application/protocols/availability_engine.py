@@ -0,0 +1,20 @@
+from datetime import date
+from typing import Protocol
+
+from accommodations.models import Accommodation
+
+
+class AvailabilityEngine(Protocol):
+    def next_available_date(
+        self,
+        accommodation: Accommodation,
+        reference_date: date,
+    ) -> date: ...
+
+    def is_booked(
+        self,
+        accommodation: Accommodation,
+        start_date: date,
+        end_date: date,
+        exclude_booking_id: int | None = None,
+    ) -> bool: ...
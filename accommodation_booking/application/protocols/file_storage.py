@@ -1,6 +1,18 @@
-from typing import Protocol
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Protocol
+
+
+@dataclass
+class StoredFile:
+    size: int
+    sha256: str
 
 
 class FileStorage(Protocol):
     def save_file_as(self, audio_file: bytes, file_id: str): ...
+    def save_stream(self, chunks: Iterable[bytes], file_id: str) -> StoredFile: ...
     def load_file(self, file_id: str) -> bytes: ...
+    def open_stream(self, file_id: str) -> BinaryIO: ...
+    def path(self, file_id: str) -> Path: ...
+    async def aload_file(self, file_id: str) -> bytes: ...
@@ -0,0 +1,18 @@
+from typing import Any, Protocol
+
+
+class ResponseCache(Protocol):
+    """Serialized response data keyed by request, invalidated through versions.
+
+    A version is an opaque token naming the current state of some data, e.g.
+    one accommodation; bumping it replaces the token so every entry keyed with
+    the old one is never read again.
+    """
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any) -> None: ...
+
+    def get_version(self, name: str) -> str: ...
+
+    def bump_version(self, name: str) -> None: ...
@@ -4,6 +4,7 @@ from accommodation_booking.application.commands.transcribe_voice_note import (
 from accommodation_booking.application.protocols.file_storage import FileStorage
 from bookings.models import VoiceNote
 from logging import getLogger
+from typing import Iterable
 
 logger = getLogger(__name__)
 
@@ -48,10 +49,11 @@ class CreateVoiceNoteUseCase:
     def execute(
         self,
         booking_id: int,
-        audio_file: bytes,
+        audio_chunks: Iterable[bytes],
         file_name: str,
         file_type: str,
     ) -> VoiceNote:
+        """Store the audio, read chunk by chunk, and queue its transcription"""
 
         if (
             file_type not in ACCEPTED_AUDIO_MIME_TYPES
@@ -70,7 +72,12 @@ class CreateVoiceNoteUseCase:
             file_type=file_type,
         )
 
-        self.file_storage.save_file_as(audio_file, voice_note.storage_key.as_string())
+        stored = self.file_storage.save_stream(
+            audio_chunks, voice_note.storage_key.as_string()
+        )
+        voice_note.file_size = stored.size
+        voice_note.file_sha256 = stored.sha256
+        voice_note.save(update_fields=["file_size", "file_sha256"])
         logger.debug(
             "Sending Transcribe Voice Note Command to Celery Worker"
             + " (booking_id: %d, voice_note_id: %d, file_name: %s, file_type: %s",
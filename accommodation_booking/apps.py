@@ -5,10 +5,18 @@ class ApplicationConfig(AppConfig):
     name = "accommodation_booking"
 
     def ready(self):
+        from accommodation_booking import checks  # noqa: F401
         from accommodation_booking.container import ApplicationContainer
 
-        container = ApplicationContainer()
+        # Kept for tests overriding its providers
+        self.container = container = ApplicationContainer()
         container.wire(
-            modules=["bookings.views"],
+            modules=[
+                "accommodations.async_views",
+                "accommodations.caching",
+                "accommodations.views",
+                "bookings.async_views",
+                "bookings.views",
+            ],
             packages=["accommodation_booking.application.commands"],
         )
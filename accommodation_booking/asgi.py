@@ -9,8 +9,13 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+
+from accommodation_booking.handlers import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'accommodation_booking.settings')
 
-application = get_asgi_application() 
\ No newline at end of file
+# As `get_asgi_application()`, with the handler closing connections on
+# client disconnects
+django.setup(set_prefix=False)
+application = ASGIHandler()
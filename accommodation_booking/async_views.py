@@ -0,0 +1,94 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.request import Request
+
+from .renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class AsyncAPIView(View):
+    """Async Django view standing in for the read side of a DRF view.
+
+    DRF views are synchronous, so under ASGI every request to them holds a
+    thread. Subclasses implement the hot reads as coroutines and answer like
+    `sync_view` would: same renderers and negotiation, DRF-shaped errors for
+    raised `APIException`s. Every other method is handed to `sync_view`, which
+    also documents the endpoint in the schema.
+    """
+
+    sync_view = None
+    delegate_view = None
+    renderer_classes = [ORJSONRenderer, MessagePackRenderer]
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(delegate_view=cls.sync_view.as_view(), **initkwargs)
+        # Like DRF views: CSRF is left to the session authentication
+        view = csrf_exempt(view)
+        view.cls = cls.sync_view
+        view.initkwargs = {}
+        return view
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.drf_request = Request(request)
+        for method in self.http_method_names:
+            own = getattr(type(self), method, None)
+            if hasattr(self.sync_view, method) and own is getattr(View, method, None):
+                setattr(self, method, self.delegate)
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            self.negotiate()
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as ex:
+            if isinstance(ex, NotAcceptable):
+                self.negotiate(force=True)
+            data = (
+                ex.detail
+                if isinstance(ex.detail, (list, dict))
+                else {"detail": ex.detail}
+            )
+            return self.respond(data, status=ex.status_code)
+
+    async def delegate(self, request, *args, **kwargs):
+        return await sync_to_async(self.delegate_view)(request, *args, **kwargs)
+
+    def negotiate(self, force: bool = False):
+        renderers = [renderer() for renderer in self.renderer_classes]
+        if force:
+            renderer, media_type = renderers[0], renderers[0].media_type
+        else:
+            renderer, media_type = DefaultContentNegotiation().select_renderer(
+                self.drf_request, renderers
+            )
+        self.drf_request.accepted_renderer = renderer
+        self.drf_request.accepted_media_type = media_type
+
+    def respond(self, data, status: int = 200, etag: str | None = None) -> HttpResponse:
+        """Render `data` like a DRF `Response`; no data means 304 Not Modified"""
+        if data is None:
+            response = HttpResponse(status=304)
+        else:
+            renderer = self.drf_request.accepted_renderer
+            content = renderer.render(
+                data,
+                self.drf_request.accepted_media_type,
+                {"request": self.drf_request, "view": self},
+            )
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f"{content_type}; charset={renderer.charset}"
+            response = HttpResponse(content, status=status, content_type=content_type)
+            # Like `Response.data`, for the test client
+            response.data = data
+
+        if etag is not None:
+            response["ETag"] = etag
+        patch_vary_headers(response, ["Accept"])
+        return response
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core import checks
+
+from accommodation_booking.container import ApplicationContainer
+
+PER_PROCESS_CACHES = {
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+}
+
+
+@checks.register(checks.Tags.caches)
+def check_response_cache(app_configs, **kwargs):
+    """Warn when responses are cached in each of several worker processes"""
+    response_cache = ApplicationContainer.config.response_cache()
+    if response_cache == "local":
+        if settings.WEB_CONCURRENCY <= 1:
+            return []
+        return [
+            checks.Warning(
+                "RESPONSE_CACHE=local keeps responses in each of the "
+                f"{settings.WEB_CONCURRENCY} worker processes, which serve them "
+                "for up to LOCAL_RESPONSE_CACHE_TIMEOUT seconds after the "
+                "writes of the others.",
+                hint="Set RESPONSE_CACHE=django and CACHE_BACKEND=database.",
+                id="accommodation_booking.W002",
+            )
+        ]
+    if response_cache != "django":
+        return []
+    if settings.CACHES["default"]["BACKEND"] not in PER_PROCESS_CACHES:
+        return []
+    return [
+        checks.Warning(
+            "RESPONSE_CACHE=django keeps responses in a per-process cache, so "
+            "each worker process misses the invalidations of the others.",
+            hint="Set CACHE_BACKEND=database for a cache shared by every process.",
+            id="accommodation_booking.W001",
+        )
+    ]
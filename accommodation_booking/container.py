@@ -3,20 +3,38 @@ from pathlib import Path
 
 from dependency_injector import containers, providers
 
+from accommodation_booking.application.protocols.availability_engine import (
+    AvailabilityEngine,
+)
 from accommodation_booking.application.protocols.file_storage import FileStorage
+from accommodation_booking.application.protocols.response_cache import (
+    ResponseCache,
+)
 from accommodation_booking.application.protocols.transcription_service import (
     TranscriptionService,
 )
 from accommodation_booking.application.usecases.create_voice_note import (
     CreateVoiceNoteUseCase,
 )
+from accommodation_booking.infrastructure.django.response_cache import (
+    DjangoResponseCache,
+)
+from accommodation_booking.infrastructure.local.availability_engine import (
+    LocalAvailabilityEngine,
+)
 from accommodation_booking.infrastructure.local.file_storage import LocalFileStorage
+from accommodation_booking.infrastructure.local.response_cache import (
+    LocalResponseCache,
+)
 from accommodation_booking.infrastructure.local.transcription_service import (
     LocalTranscriptionService,
 )
 from accommodation_booking.infrastructure.openai.transcription_service import (
     OpenAITranscriptionService,
 )
+from accommodation_booking.infrastructure.postgres.availability_engine import (
+    PostgresAvailabilityEngine,
+)
 
 BOOKINGS_APP_DIRECTORY = Path(__file__).parent
 CONFIG_FILE = BOOKINGS_APP_DIRECTORY / "config.yaml"
@@ -51,6 +69,27 @@ class ApplicationContainer(containers.DeclarativeContainer):
         )
     )
 
+    availability_engine: providers.Provider[AvailabilityEngine] = providers.Selector(
+        config.availability_engine,
+        postgres=providers.Singleton(
+            PostgresAvailabilityEngine,
+        ),
+        local=providers.Singleton(
+            LocalAvailabilityEngine,
+        ),
+    )
+
+    response_cache: providers.Provider[ResponseCache] = providers.Selector(
+        config.response_cache,
+        local=providers.Singleton(
+            LocalResponseCache,
+            timeout=config.local_response_cache_timeout.as_float(),
+        ),
+        django=providers.Singleton(
+            DjangoResponseCache,
+        ),
+    )
+
     # UseCases
     create_voice_note_usecase: providers.Provider[CreateVoiceNoteUseCase] = (
         providers.Factory(
@@ -0,0 +1,55 @@
+import weakref
+
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresWrapper
+from django.db.backends.postgresql.creation import DatabaseCreation as PostgresCreation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pool import ConnectionPool, close_pools, get_pool
+
+
+class DatabaseCreation(PostgresCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle pooled connections would keep the database from being dropped
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(PostgresWrapper):
+    """PostgreSQL connections checked out of a process-wide pool.
+
+    Configured by `OPTIONS["pool"]`, the keyword arguments of
+    `ConnectionPool`. Closing a connection, which Django does at the end of
+    every request (see `accommodation_booking.handlers` for ASGI), checks it
+    back in instead. So does garbage collecting a wrapper left unclosed.
+    """
+
+    creation_class = DatabaseCreation
+    pool: ConnectionPool | None = None
+    _checkin_on_collect: weakref.finalize | None = None
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(
+            self.alias, conn_params, **self.settings_dict["OPTIONS"].get("pool", {})
+        )
+        connection = self.pool.checkout(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+        )
+        # Set by the parent class on new connections only
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get(
+                "isolation_level", IsolationLevel.READ_COMMITTED
+            )
+        )
+        self._checkin_on_collect = weakref.finalize(self, self.pool.checkin, connection)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            self._checkin_on_collect.detach()
+            with self.wrap_database_errors:
+                self.pool.checkin(self.connection)
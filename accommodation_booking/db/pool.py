@@ -0,0 +1,198 @@
+from threading import Condition, Lock
+from time import monotonic
+from typing import Callable
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extensions import connection as Connection
+
+from accommodation_booking.metrics import counter, gauge, histogram
+
+checkout_latency = histogram(
+    "db_pool_checkout_seconds",
+    "Time taken to get a database connection from the pool, waits and new "
+    "connections included",
+)
+checkout_waits = counter(
+    "db_pool_waits_total",
+    "Checkouts that waited for a connection because the pool was at its size",
+)
+connections_opened = counter(
+    "db_pool_connections_opened_total",
+    "Database connections opened by the pool",
+)
+
+
+class ConnectionPool:
+    """Open psycopg2 connections of one database, shared by a process' threads.
+
+    Connections are checked out when Django connects and checked in when it
+    closes them, at the end of every request. At most `max_size` are open;
+    checkouts beyond that wait up to `timeout` seconds for a check-in. The
+    most recently returned connection is reused first, so idle ones beyond
+    the load age out. Before reuse, a connection idle for more than
+    `check_after` seconds is pinged, and one open for more than
+    `max_lifetime` seconds is replaced.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10,
+        timeout: float = 10,
+        check_after: float = 30,
+        max_lifetime: float = 3600,
+    ):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.max_lifetime = max_lifetime
+        # (connection, checked in at), most recent last
+        self._idle: list[tuple] = []
+        self._opened_at: dict[int, float] = {}
+        # Slots reserved by checkouts opening a connection
+        self._opening = 0
+        self._condition = Condition()
+
+    @property
+    def size(self) -> int:
+        """Open connections, idle or checked out"""
+        return len(self._opened_at) + self._opening
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    @property
+    def in_use(self) -> int:
+        return self.size - self.idle
+
+    def checkout(self, connect: Callable[[], Connection]) -> Connection:
+        """An idle connection, or one opened with `connect` if there is room"""
+        started = monotonic()
+        while True:
+            connection, checked_in_at = self._take(started + self.timeout)
+            if connection is None:
+                connection = self._open(connect)
+                break
+            if self._is_usable(connection, checked_in_at):
+                break
+            self._discard(connection)
+        checkout_latency.observe(monotonic() - started)
+        return connection
+
+    def checkin(self, connection: Connection):
+        """Give a connection back, rolled back if a transaction was left open"""
+        if connection.closed:
+            self._discard(connection)
+            return
+        if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except psycopg2.Error:
+                self._discard(connection)
+                return
+        with self._condition:
+            self._idle.append((connection, monotonic()))
+            self._condition.notify()
+
+    def close(self):
+        """Close the idle connections"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def _take(self, deadline: float) -> tuple:
+        """An idle connection, or (None, None) with a slot to open one in"""
+        with self._condition:
+            waited = False
+            while not self._idle and self.size >= self.max_size:
+                if not waited:
+                    checkout_waits.inc()
+                    waited = True
+                remaining = deadline - monotonic()
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    raise psycopg2.OperationalError(
+                        f"No database connection was returned to the pool of "
+                        f"{self.max_size} within {self.timeout} seconds"
+                    )
+            if self._idle:
+                return self._idle.pop()
+            self._opening += 1
+            return None, None
+
+    def _open(self, connect: Callable[[], Connection]) -> Connection:
+        try:
+            connection = connect()
+        except BaseException:
+            with self._condition:
+                self._opening -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._opening -= 1
+            self._opened_at[id(connection)] = monotonic()
+        connections_opened.inc()
+        return connection
+
+    def _is_usable(self, connection: Connection, checked_in_at: float) -> bool:
+        now = monotonic()
+        if connection.closed or now - self._opened_at[id(connection)] > (
+            self.max_lifetime
+        ):
+            return False
+        if now - checked_in_at <= self.check_after:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, connection: Connection):
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+        with self._condition:
+            self._opened_at.pop(id(connection), None)
+            self._condition.notify()
+
+
+POOLS: dict[tuple, ConnectionPool] = {}
+POOLS_LOCK = Lock()
+
+
+def get_pool(alias: str, conn_params: dict, **options) -> ConnectionPool:
+    """The pool of a database alias and connection parameters, created with
+    `options` on first use"""
+    key = (alias, *sorted((name, str(value)) for name, value in conn_params.items()))
+    with POOLS_LOCK:
+        if key not in POOLS:
+            POOLS[key] = ConnectionPool(**options)
+        return POOLS[key]
+
+
+def close_pools():
+    """Close the idle connections of every pool"""
+    with POOLS_LOCK:
+        pools = list(POOLS.values())
+    for pool in pools:
+        pool.close()
+
+
+def read_pool_connections():
+    with POOLS_LOCK:
+        pools = list(POOLS.items())
+    for (alias, *params), pool in pools:
+        database = dict(params).get("dbname", "")
+        for state, value in [("in_use", pool.in_use), ("idle", pool.idle)]:
+            yield {"alias": alias, "database": database, "state": state}, value
+
+
+gauge(
+    "db_pool_connections",
+    "Open database connections of the pool, checked out or idle",
+    read_pool_connections,
+)
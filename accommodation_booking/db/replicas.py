@@ -0,0 +1,111 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.decorators import sync_and_async_middleware
+from rest_framework.permissions import SAFE_METHODS
+
+# Set by a client's writes, so its next requests read from the primary
+PIN_COOKIE = "db_primary"
+
+_read_from_replicas = ContextVar("read_from_replicas", default=False)
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary within the block"""
+    token = _read_from_replicas.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replicas.reset(token)
+
+
+class ReplicaRouter:
+    """Route the reads of the booking apps to a random replica when allowed.
+
+    Reads go to the primary unless `replica_middleware` allows replicas for
+    the request, so management commands and Celery tasks, which may read rows
+    they have just been told about, always see them. Inside transactions they
+    go to the primary as well. Writes always go to the primary, also for
+    instances read from a replica.
+    """
+
+    route_app_labels = {"accommodations", "bookings"}
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in self.route_app_labels:
+            return None
+        if (
+            settings.REPLICA_DATABASES
+            and _read_from_replicas.get()
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return random.choice(settings.REPLICA_DATABASES)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label in self.route_app_labels:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same rows
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
+
+
+def reads_from_replicas(request) -> bool:
+    return request.method in SAFE_METHODS and PIN_COOKIE not in request.COOKIES
+
+
+def pin_to_primary(request, response):
+    """Make the client read from the primary for a while after it writes, so
+    it sees its writes before they reach the replicas"""
+    if request.method not in SAFE_METHODS:
+        response.set_cookie(
+            PIN_COOKIE,
+            "1",
+            max_age=settings.DB_REPLICA_STICKINESS,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+@sync_and_async_middleware
+def replica_middleware(get_response):
+    """Let the safe requests of clients that have not written lately read from
+    the replicas"""
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            if not settings.REPLICA_DATABASES:
+                return await get_response(request)
+            token = _read_from_replicas.set(reads_from_replicas(request))
+            try:
+                response = await get_response(request)
+            finally:
+                _read_from_replicas.reset(token)
+            return pin_to_primary(request, response)
+
+    else:
+
+        def middleware(request):
+            if not settings.REPLICA_DATABASES:
+                return get_response(request)
+            token = _read_from_replicas.set(reads_from_replicas(request))
+            try:
+                response = get_response(request)
+            finally:
+                _read_from_replicas.reset(token)
+            return pin_to_primary(request, response)
+
+    return middleware
@@ -0,0 +1,52 @@
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+
+from .fast_reads import FastListMixin
+from .renderers import CSVRenderer, NDJSONRenderer, ORJSONRenderer
+
+
+class StreamingExportMixin(FastListMixin):
+    """Export endpoint streaming every row of a queryset as NDJSON or CSV.
+
+    Rows are read from a server-side cursor `chunk_size` at a time and each
+    chunk is rendered and sent before the next is fetched, so memory does not
+    grow with the export. The format is negotiated (`Accept` or `?format=`,
+    NDJSON by default); errors are answered in JSON.
+    """
+
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    pagination_class = None
+    chunk_size = 2000
+    export_name = "export"
+
+    def export(self, queryset) -> StreamingHttpResponse:
+        rows, represent = self.read_rows(queryset)
+        renderer = self.request.accepted_renderer
+        fields = list(self.get_read_columns())
+
+        def stream():
+            iterator = rows.iterator(chunk_size=self.chunk_size)
+            chunks = iter(lambda: list(islice(iterator, self.chunk_size)), [])
+            header = True
+            for chunk in chunks:
+                yield renderer.render(
+                    represent(chunk), None, {"fields": fields, "header": header}
+                )
+                header = False
+            if header and isinstance(renderer, CSVRenderer):
+                yield renderer.render([], None, {"fields": fields})
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        response = StreamingHttpResponse(stream(), content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.export_name}.{renderer.format}"'
+        )
+        return response
+
+    def handle_exception(self, exc):
+        self.request.accepted_renderer = ORJSONRenderer()
+        self.request.accepted_media_type = ORJSONRenderer.media_type
+        return super().handle_exception(exc)
@@ -0,0 +1,82 @@
+from functools import partial
+
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .sparse_fields import SparseFieldsMixin
+
+
+def represent_rows(rows, keys, datetimes) -> list[dict]:
+    """Output dicts of `values()` rows, in the serializer's field order"""
+    data = [{name: row[key] for name, key in keys} for row in rows]
+    if datetimes:
+        current_timezone = timezone.get_current_timezone()
+        for item in data:
+            for name in datetimes:
+                if item[name] is not None:
+                    item[name] = item[name].astimezone(current_timezone)
+    return data
+
+
+class FastListMixin(SparseFieldsMixin):
+    """List endpoint building its rows from `values()` instead of serializers.
+
+    The serializer declares `read_columns`, mapping each field of its output,
+    in order, to the column or expression giving the value its JSON would
+    hold: `DecimalField`s cast to text in SQL, related strings read through a
+    join. Dates and datetimes are left to the renderer, datetimes moved to the
+    current time zone first, exactly as the serializer fields would. Only the
+    columns of the fields requested with `?fields=` are read.
+    """
+
+    def list(self, request, *args, **kwargs):
+        rows, represent = self.read_rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(represent(page))
+        return Response(represent(rows))
+
+    def get_read_columns(self) -> dict:
+        """Output fields to read, and their columns"""
+        columns = self.get_serializer_class().read_columns
+        fields = self.sparse_fields()
+        if fields is None:
+            return columns
+        return {name: column for name, column in columns.items() if name in fields}
+
+    def read_rows(self, queryset):
+        """`values()` of the queryset and the function representing its rows"""
+        columns = self.get_read_columns()
+
+        plain, aliased = [], {}
+        for name, column in columns.items():
+            if column == name:
+                plain.append(name)
+            else:
+                aliased[f"read_{name}"] = (
+                    F(column) if isinstance(column, str) else column
+                )
+        keys = [(name, name if name in plain else f"read_{name}") for name in columns]
+        datetimes = [
+            name
+            for name in plain
+            if isinstance(queryset.model._meta.get_field(name), models.DateTimeField)
+        ]
+
+        # Paginators read their position from the rows, so their columns are
+        # read even when `?fields=` leaves them out of the output
+        positions = [
+            name for name in self.position_columns(queryset) if name not in plain
+        ]
+        rows = queryset.values(*plain, *positions, **aliased)
+        return rows, partial(represent_rows, keys=keys, datetimes=datetimes)
+
+    def position_columns(self, queryset) -> tuple[str, ...]:
+        """Columns the paginators order the rows by: the primary key, after the
+        `rank` of search results"""
+        pk = queryset.model._meta.pk.name
+        if "rank" in queryset.query.annotations:
+            return ("rank", pk)
+        return (pk,)
@@ -0,0 +1,22 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler as DjangoASGIHandler
+from django.db import close_old_connections
+
+
+class ASGIHandler(DjangoASGIHandler):
+    """Django's ASGI handler, closing the request's database connections even
+    when the client disconnects.
+
+    Django 5.0 cancels the request as soon as the client disconnects, which
+    clients do once they have read the response, before `response.close()`
+    sends `request_finished`. The connections of the request's thread, which
+    that signal closes, would stay open until garbage collected: checked out
+    of the pool with `DB_CONNECTIONS=pool`.
+    """
+
+    async def handle(self, scope, receive, send):
+        try:
+            await super().handle(scope, receive, send)
+        finally:
+            # In the request's thread, like the rest of its database work
+            await sync_to_async(close_old_connections, thread_sensitive=True)()
@@ -0,0 +1,39 @@
+from secrets import token_hex
+from typing import Any, final
+
+from django.core.cache import caches
+
+from accommodation_booking.application.protocols.response_cache import (
+    ResponseCache,
+)
+
+
+@final
+class DjangoResponseCache(ResponseCache):
+    """Entries and versions in a Django cache, shared by every process using it"""
+
+    def __init__(self, alias: str = "default", timeout: int = 3600):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def _cache(self):
+        return caches[self.alias]
+
+    def get(self, key: str) -> Any | None:
+        return self._cache.get(f"response:{key}")
+
+    def set(self, key: str, value: Any) -> None:
+        self._cache.set(f"response:{key}", value, self.timeout)
+
+    def get_version(self, name: str) -> str:
+        key = f"version:{name}"
+        version = self._cache.get(key)
+        if version is None:
+            # Another process may create the version at the same time
+            self._cache.add(key, token_hex(8), None)
+            version = self._cache.get(key)
+        return version
+
+    def bump_version(self, name: str) -> None:
+        self._cache.set(f"version:{name}", token_hex(8), None)
@@ -0,0 +1,190 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from logging import getLogger
+from threading import Lock
+from typing import Iterable, final
+
+from accommodation_booking.application.protocols.availability_engine import (
+    AvailabilityEngine,
+)
+from accommodations.models import Accommodation
+from bookings.models import Booking
+
+logger = getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BookedIntervals:
+    """Bookings of one accommodation as parallel arrays of date ordinals.
+
+    Rows are sorted by (start, end). `reached` holds the running maximum of
+    `ends` and `chain_ends` the last end date of the chain of back-to-back or
+    overlapping bookings each row belongs to.
+    """
+
+    version: int
+    ids: array
+    starts: array
+    ends: array
+    reached: array
+    chain_ends: array
+
+    @classmethod
+    def from_rows(
+        cls, version: int, rows: Iterable[tuple[int, date, date]]
+    ) -> "BookedIntervals":
+        ordered = sorted(
+            (start.toordinal(), end.toordinal(), id) for id, start, end in rows
+        )
+        ids = array("q", [id for _, _, id in ordered])
+        starts = array("q", [start for start, _, _ in ordered])
+        ends = array("q", [end for _, end, _ in ordered])
+
+        reached = array("q", ends)
+        for index in range(1, len(reached)):
+            reached[index] = max(reached[index], reached[index - 1])
+
+        # A chain ends where the next booking starts after every booking so
+        # far has ended.
+        chain_ends = array("q", reached)
+        for index in range(len(chain_ends) - 2, -1, -1):
+            if starts[index + 1] <= reached[index]:
+                chain_ends[index] = chain_ends[index + 1]
+
+        return cls(version, ids, starts, ends, reached, chain_ends)
+
+    def next_available_date(self, reference_date: date) -> date:
+        day = reference_date.toordinal()
+        index = bisect_right(self.starts, day) - 1
+        if index < 0 or self.reached[index] <= day:
+            return reference_date
+        return date.fromordinal(self.chain_ends[index])
+
+    def overlaps(
+        self,
+        start_date: date,
+        end_date: date,
+        exclude_booking_id: int | None = None,
+    ) -> bool:
+        start, end = start_date.toordinal(), end_date.toordinal()
+        index = bisect_left(self.starts, end) - 1
+        while index >= 0 and self.reached[index] > start:
+            if self.ends[index] > start and self.ids[index] != exclude_booking_id:
+                return True
+            index -= 1
+        return False
+
+    def booked_rooms(
+        self,
+        start_date: date,
+        end_date: date,
+        exclude_booking_id: int | None = None,
+    ) -> list[int]:
+        """Bookings covering each night of [start_date, end_date)"""
+        start, end = start_date.toordinal(), end_date.toordinal()
+        counts = [0] * (end - start)
+        index = bisect_left(self.starts, end) - 1
+        while index >= 0 and self.reached[index] > start:
+            if self.ends[index] > start and self.ids[index] != exclude_booking_id:
+                for night in range(
+                    max(self.starts[index], start), min(self.ends[index], end)
+                ):
+                    counts[night - start] += 1
+            index -= 1
+        return counts
+
+    def next_free_night(self, reference_date: date, rooms: int) -> date:
+        """First night from the reference date with fewer bookings than rooms"""
+        day = reference_date.toordinal()
+        last_end = self.reached[-1] if self.reached else day
+        while day < last_end:
+            end = min(day + 31, last_end)
+            counts = self.booked_rooms(date.fromordinal(day), date.fromordinal(end))
+            for offset, count in enumerate(counts):
+                if count < rooms:
+                    return date.fromordinal(day + offset)
+            day = end
+        return date.fromordinal(day)
+
+
+@final
+class LocalAvailabilityEngine(AvailabilityEngine):
+    """Answers availability from per-process copies of booking intervals.
+
+    Hotels with a room count are full on the nights their bookings cover as
+    many times as they have rooms, which is what the room inventory counts.
+    Every booking write bumps `Accommodation.bookings_version`, and the copy
+    held here is reloaded whenever the version on the accommodation row being
+    checked differs from the one it was built from. Callers already load that
+    row, so a warm lookup does not touch the booking table.
+    """
+
+    def __init__(self, max_accommodations: int = 10_000):
+        self.max_accommodations = max_accommodations
+        self._intervals: OrderedDict[int, BookedIntervals] = OrderedDict()
+        self._lock = Lock()
+
+    def next_available_date(
+        self,
+        accommodation: Accommodation,
+        reference_date: date,
+    ) -> date:
+        if accommodation.type == Accommodation.AccommodationType.APARTMENT:
+            return self._get_intervals(accommodation).next_available_date(
+                reference_date
+            )
+        if not accommodation.has_room_inventory:
+            return reference_date
+        return self._get_intervals(accommodation).next_free_night(
+            reference_date, accommodation.rooms
+        )
+
+    def is_booked(
+        self,
+        accommodation: Accommodation,
+        start_date: date,
+        end_date: date,
+        exclude_booking_id: int | None = None,
+    ) -> bool:
+        if accommodation.type == Accommodation.AccommodationType.APARTMENT:
+            return self._get_intervals(accommodation).overlaps(
+                start_date, end_date, exclude_booking_id
+            )
+        if not accommodation.has_room_inventory:
+            return False
+        booked = self._get_intervals(accommodation).booked_rooms(
+            start_date, end_date, exclude_booking_id
+        )
+        return max(booked) >= accommodation.rooms
+
+    def _get_intervals(self, accommodation: Accommodation) -> BookedIntervals:
+        with self._lock:
+            intervals = self._intervals.get(accommodation.id)
+            if (
+                intervals is not None
+                and intervals.version == accommodation.bookings_version
+            ):
+                self._intervals.move_to_end(accommodation.id)
+                return intervals
+
+        logger.debug(
+            "Loading booking intervals (accommodation_id: %d, version: %d)",
+            accommodation.id,
+            accommodation.bookings_version,
+        )
+        intervals = BookedIntervals.from_rows(
+            accommodation.bookings_version,
+            Booking.objects.filter(accommodation_id=accommodation.id).values_list(
+                "id", "start_date", "end_date"
+            ),
+        )
+
+        with self._lock:
+            self._intervals[accommodation.id] = intervals
+            self._intervals.move_to_end(accommodation.id)
+            while len(self._intervals) > self.max_accommodations:
+                self._intervals.popitem(last=False)
+        return intervals
@@ -1,8 +1,27 @@
 import os
+from hashlib import sha256
 from pathlib import Path
-from typing import final
+from tempfile import NamedTemporaryFile
+from typing import BinaryIO, Iterable, final
 
-from accommodation_booking.application.protocols.file_storage import FileStorage
+import aiofiles
+
+from accommodation_booking.application.protocols.file_storage import (
+    FileStorage,
+    StoredFile,
+)
+
+
+def _umask() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# The mode open() gives new files, so that a front proxy can read them;
+# NamedTemporaryFile creates them readable by their owner only. Read once, as
+# reading the umask sets it
+FILE_MODE = 0o666 & ~_umask()
 
 
 @final
@@ -11,12 +30,31 @@ class LocalFileStorage(FileStorage):
         self.data_directory = data_directory
 
     def save_file_as(self, file: bytes, file_id: str):
-        if not self.data_directory.exists():
-            os.makedirs(self.data_directory)
+        self.save_stream([file], file_id)
 
-        file_path = self.get_file_path(file_id)
-        with open(file_path, "wb") as fout:
-            fout.write(file)
+    def save_stream(self, chunks: Iterable[bytes], file_id: str) -> StoredFile:
+        """Write the chunks to the file as they come, measuring and hashing them.
+
+        They are written to a temporary file renamed once complete, so a failed
+        upload leaves no truncated file behind.
+        """
+        os.makedirs(self.data_directory, exist_ok=True)
+
+        digest, size = sha256(), 0
+        with NamedTemporaryFile(
+            dir=self.data_directory, prefix=f".{file_id}.", delete=False
+        ) as fout:
+            try:
+                for chunk in chunks:
+                    fout.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            except BaseException:
+                os.unlink(fout.name)
+                raise
+        os.chmod(fout.name, FILE_MODE)
+        os.replace(fout.name, self.get_file_path(file_id))
+        return StoredFile(size=size, sha256=digest.hexdigest())
 
     def load_file(self, file_id: str) -> bytes:
         file_path = self.get_file_path(file_id)
@@ -24,5 +62,25 @@ class LocalFileStorage(FileStorage):
             return file_path.read_bytes()
         raise FileNotFoundError(file_id)
 
+    def open_stream(self, file_id: str) -> BinaryIO:
+        try:
+            return open(self.get_file_path(file_id), "rb")
+        except FileNotFoundError:
+            raise FileNotFoundError(file_id) from None
+
+    def path(self, file_id: str) -> Path:
+        """Path of the stored file, for servers sending it themselves"""
+        file_path = self.get_file_path(file_id)
+        if file_path.exists():
+            return file_path
+        raise FileNotFoundError(file_id)
+
+    async def aload_file(self, file_id: str) -> bytes:
+        try:
+            async with aiofiles.open(self.get_file_path(file_id), "rb") as fin:
+                return await fin.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(file_id) from None
+
     def get_file_path(self, file_id: str) -> Path:
         return self.data_directory / file_id
@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from secrets import token_hex
+from threading import Lock
+from time import monotonic
+from typing import Any, final
+
+from accommodation_booking.application.protocols.response_cache import (
+    ResponseCache,
+)
+
+
+@final
+class LocalResponseCache(ResponseCache):
+    """Least recently used entries and versions in process memory.
+
+    Versions are only bumped in the process handling the write, so this is
+    meant for single-process deployments and development. Entries and versions
+    expire `timeout` seconds after they are set, which bounds how long another
+    process serves responses and ETags from before a write.
+    """
+
+    def __init__(self, max_entries: int = 10_000, timeout: float = 5):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        # Values with the monotonic time they expire at
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            return self._get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._set(key, value)
+
+    def get_version(self, name: str) -> str:
+        key = f"version:{name}"
+        with self._lock:
+            version = self._get(key)
+            if version is None:
+                # An evicted or expired version comes back as a new token,
+                # which only costs misses on the entries keyed with the old one
+                version = token_hex(8)
+                self._set(key, version)
+            return version
+
+    def bump_version(self, name: str) -> None:
+        with self._lock:
+            self._set(f"version:{name}", token_hex(8))
+
+    def _get(self, key: str) -> Any | None:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires, value = item
+        if expires <= monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: Any):
+        self._entries[key] = (monotonic() + self.timeout, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,49 @@
+from datetime import date
+from typing import final
+
+from accommodation_booking.application.protocols.availability_engine import (
+    AvailabilityEngine,
+)
+from accommodations.availability import next_available_dates
+from accommodations.models import Accommodation
+from bookings.inventory import is_sold_out
+from bookings.models import Booking
+
+
+@final
+class PostgresAvailabilityEngine(AvailabilityEngine):
+    def next_available_date(
+        self,
+        accommodation: Accommodation,
+        reference_date: date,
+    ) -> date:
+        if (
+            accommodation.type == Accommodation.AccommodationType.HOTEL
+            and not accommodation.has_room_inventory
+        ):
+            return reference_date
+        return next_available_dates([accommodation.id], reference_date)[
+            accommodation.id
+        ]
+
+    def is_booked(
+        self,
+        accommodation: Accommodation,
+        start_date: date,
+        end_date: date,
+        exclude_booking_id: int | None = None,
+    ) -> bool:
+        if accommodation.type == Accommodation.AccommodationType.HOTEL:
+            if not accommodation.has_room_inventory:
+                return False
+            return is_sold_out(
+                accommodation.id, start_date, end_date, exclude_booking_id
+            )
+        queryset = Booking.objects.filter(
+            accommodation_id=accommodation.id,
+            start_date__lt=end_date,
+            end_date__gt=start_date,
+        )
+        if exclude_booking_id is not None:
+            queryset = queryset.exclude(id=exclude_booking_id)
+        return queryset.exists()
@@ -0,0 +1,137 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Callable, Iterable
+
+from django.http import HttpResponse
+
+# Upper bounds, in seconds, of the default histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Count and sum of observed values, and how many fell in each bucket.
+
+    Kept in process memory, so every worker reports its own observations
+    since it started.
+    """
+
+    def __init__(self, name: str, documentation: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def render(self) -> list[str]:
+        """Lines of the Prometheus text format, with cumulative buckets"""
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        cumulative = 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {total}")
+        lines.append(f"{self.name}_count {cumulative}")
+        return lines
+
+
+class Counter:
+    """Number of times something happened since the process started"""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self.value = 0
+        self._lock = Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self.value += amount
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+            f"{self.name} {self.value}",
+        ]
+
+
+Labels = dict[str, str]
+
+
+class Gauge:
+    """Current values, read when the metrics are rendered.
+
+    `read` returns a value for each set of labels, e.g. one per database.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        read: Callable[[], Iterable[tuple[Labels, float]]],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+        ]
+        for labels, value in self.read():
+            rendered = ",".join(f'{key}="{label}"' for key, label in labels.items())
+            lines.append(f"{self.name}{{{rendered}}} {value}")
+        return lines
+
+
+REGISTRY: dict[str, Histogram | Counter | Gauge] = {}
+
+
+def histogram(name: str, documentation: str, buckets=DEFAULT_BUCKETS) -> Histogram:
+    """The histogram registered under `name`, registered on first use"""
+    if name not in REGISTRY:
+        REGISTRY[name] = Histogram(name, documentation, buckets)
+    return REGISTRY[name]
+
+
+def counter(name: str, documentation: str) -> Counter:
+    """The counter registered under `name`, registered on first use"""
+    if name not in REGISTRY:
+        REGISTRY[name] = Counter(name, documentation)
+    return REGISTRY[name]
+
+
+def gauge(name: str, documentation: str, read) -> Gauge:
+    """Register a gauge reading its values with `read`"""
+    REGISTRY[name] = Gauge(name, documentation, read)
+    return REGISTRY[name]
+
+
+def metrics_view(request):
+    """Every registered metric, in the Prometheus text format"""
+    lines = [line for metric in REGISTRY.values() for line in metric.render()]
+    return HttpResponse(
+        "".join(f"{line}\n" for line in lines), content_type=CONTENT_TYPE
+    )
@@ -0,0 +1,213 @@
+import json
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    Cursor,
+    CursorPagination,
+    PageNumberPagination,
+)
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """Row count of a queryset as estimated by the PostgreSQL planner.
+
+    Unfiltered querysets read the table statistics from `pg_class.reltuples`;
+    filtered ones use the row estimate of their plan. Falls back to an exact
+    `COUNT(*)` for tables that have never been analyzed.
+    """
+    if not queryset.query.where:
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return int(row[0])
+        return queryset.count()
+
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator counting the rows with `estimate_count` instead of `COUNT(*)`"""
+
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
+
+def wants_estimated_count(request) -> bool:
+    return request.query_params.get("count") == "estimated"
+
+
+class EstimatedPageNumberPagination(PageNumberPagination):
+    """Page number pagination with an optional estimated total"""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if wants_estimated_count(request):
+            self.django_paginator_class = EstimatedCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+
+class IdCursorPagination(CursorPagination):
+    """Keyset pagination on the primary key, without COUNT(*) or OFFSET
+
+    A total is only returned when an estimated count is requested.
+    """
+
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    count = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = (
+            estimate_count(queryset) if wants_estimated_count(request) else None
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = {"count": self.count, **response.data}
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"] = {
+            "count": {"type": "integer", "example": 123},
+            **response_schema["properties"],
+        }
+        return response_schema
+
+
+class RankCursorPagination(CursorPagination):
+    """Keyset pagination of search results on a `rank` annotation, highest
+    first, then on the primary key.
+
+    Many results share a rank, so the cursor holds both the rank and the id of
+    the last result, and the next page is the results after that pair, rather
+    than an offset past the tied ones. Only `next` links are returned.
+    """
+
+    ordering = ("-rank", "id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        queryset = queryset.order_by(*self.ordering)
+        if self.cursor is not None:
+            rank, pk = self.cursor.position
+            queryset = queryset.filter(Q(rank__lt=rank) | Q(rank=rank, pk__gt=pk))
+
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        self.has_next = len(results) > self.page_size
+        self.has_previous = False
+        return self.page
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None:
+            return None
+        try:
+            rank, pk = cursor.position.split("|")
+            return cursor._replace(position=(float(rank), int(pk)))
+        except (AttributeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        # Model instances, or the dicts of `values()`
+        if isinstance(last, dict):
+            rank, pk = last["rank"], last["id"]
+        else:
+            rank, pk = last.rank, last.pk
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=f"{rank!r}|{pk}")
+        )
+
+    def get_previous_link(self):
+        return None
+
+
+class FlexiblePagination(BasePagination):
+    """Page numbers by default, keyset pages on `id` when opted in.
+
+    A request opts in with `?pagination=cursor` (or by following a `cursor`
+    link); a view opts in by setting `pagination_mode = "cursor"`, and requests
+    can still ask it for `?pagination=page`. Search results, annotated with
+    their `rank`, are keyset-paged on the rank and `id` instead.
+    """
+
+    def __init__(self):
+        self.paginator = EstimatedPageNumberPagination()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        mode = request.query_params.get("pagination")
+        if mode not in ("cursor", "page"):
+            mode = getattr(view, "pagination_mode", "page")
+        if "cursor" in request.query_params:
+            mode = "cursor"
+
+        if mode != "cursor":
+            self.paginator = EstimatedPageNumberPagination()
+        elif "rank" in queryset.query.annotations:
+            self.paginator = RankCursorPagination()
+        else:
+            self.paginator = IdCursorPagination()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_results(self, data):
+        return self.paginator.get_results(data)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": "pagination",
+                "required": False,
+                "in": "query",
+                "description": (
+                    "`cursor` pages by id without counting or offsetting rows; "
+                    "`page` uses page numbers"
+                ),
+                "schema": {"type": "string", "enum": ["cursor", "page"]},
+            },
+            *EstimatedPageNumberPagination().get_schema_operation_parameters(view),
+            *IdCursorPagination().get_schema_operation_parameters(view),
+            {
+                "name": "count",
+                "required": False,
+                "in": "query",
+                "description": (
+                    "`estimated` replaces the exact total with the planner's "
+                    "estimate, avoiding a COUNT(*) over large tables"
+                ),
+                "schema": {"type": "string", "enum": ["estimated"]},
+            },
+        ]
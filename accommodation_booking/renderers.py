@@ -0,0 +1,108 @@
+import csv
+from io import StringIO
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer encoding with orjson, byte for byte like `JSONRenderer`.
+
+    Like the default compact, non-ASCII settings it emits UTF-8 with short
+    separators and escapes U+2028/U+2029. Objects orjson does not know go
+    through the DRF encoder, UTC datetimes end in `Z`, and anything orjson
+    rejects (indented output, lone surrogates, oversized integers) is left to
+    `JSONRenderer`.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            rendered = orjson.dumps(
+                data, default=JSONEncoder().default, option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return rendered.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack renderer for clients sending `Accept: application/msgpack`
+
+    Values without a MessagePack type are encoded as in the JSON output.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=JSONEncoder().default)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON: one line per item of a list, as `ORJSONRenderer`
+    would render it"""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        items = data if isinstance(data, list) else [data]
+        json_renderer = ORJSONRenderer()
+        return b"".join(json_renderer.render(item) + b"\n" for item in items)
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV of a list of flat dicts, one column per key.
+
+    The header row lists `fields` from the renderer context, or the keys of
+    the first item; it is left out when the context sets `header` to False.
+    Values are written as they read in the JSON output, None as an empty cell.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        items = data if isinstance(data, list) else [data]
+        fields = renderer_context.get("fields") or (list(items[0]) if items else [])
+
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        if renderer_context.get("header", True):
+            writer.writerow(fields)
+        default = JSONEncoder().default
+        writer.writerows(
+            [
+                (
+                    value
+                    if isinstance(value, (str, int, float))
+                    else "" if value is None else default(value)
+                )
+                for value in map(item.__getitem__, fields)
+            ]
+            for item in items
+        )
+        return buffer.getvalue().encode(self.charset)
@@ -28,6 +28,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "corsheaders",
     "drf_spectacular",
@@ -37,6 +38,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "accommodation_booking.db.replicas.replica_middleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -79,6 +81,56 @@ DATABASES = {
     }
 }
 
+# How requests get their database connection: "per_request" opens and closes
+# one per request; "persistent" keeps each worker thread's connection open for
+# DB_CONN_MAX_AGE seconds, checked before reuse; "pool" checks them out of a
+# pool of DB_POOL_SIZE connections per process, whose usage is reported at
+# /metrics/
+DB_CONNECTIONS = os.getenv("DB_CONNECTIONS", "per_request")
+if DB_CONNECTIONS == "persistent":
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+elif DB_CONNECTIONS == "pool":
+    DATABASES["default"]["ENGINE"] = "accommodation_booking.db"
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "max_size": int(os.getenv("DB_POOL_SIZE", "10")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+    }
+
+# Worker processes of gunicorn and uvicorn, which both read WEB_CONCURRENCY
+# as their default worker count
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Django's default cache, which RESPONSE_CACHE=django keeps responses in:
+# "locmem" (default) is the memory of each process; "database" is the
+# django_cache table (python manage.py createcachetable), shared by every
+# process using the database
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+if CACHE_BACKEND == "database":
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "django_cache",
+    }
+
+# Read replicas of the primary, as comma-separated host[:port] pairs sharing
+# its name and credentials. Safe requests read the booking apps from them,
+# unless the client wrote in the last DB_REPLICA_STICKINESS seconds
+REPLICA_DATABASES = []
+for index, replica in enumerate(filter(None, os.getenv("DB_REPLICAS", "").split(","))):
+    host, _, port = replica.strip().partition(":")
+    REPLICA_DATABASES.append(f"replica{index + 1}")
+    DATABASES[REPLICA_DATABASES[-1]] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+DB_REPLICA_STICKINESS = int(os.getenv("DB_REPLICA_STICKINESS", "5"))
+DATABASE_ROUTERS = ["accommodation_booking.db.replicas.ReplicaRouter"]
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -110,7 +162,12 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework configuration
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "accommodation_booking.pagination.FlexiblePagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "accommodation_booking.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        "accommodation_booking.renderers.MessagePackRenderer",
+    ],
     "PAGE_SIZE": 20,
 }
 
@@ -182,6 +239,27 @@ LOGGING = {
     },
 }
 
+# Async implementations of the hot read endpoints, for ASGI deployments
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "False").lower() == "true"
+
+# URL prefix of a front proxy location serving LOCAL_FILE_STORAGE_DIRECTORY
+# (nginx `internal` location); when set, voice-note audio downloads answer
+# with X-Accel-Redirect and the proxy sends the file
+AUDIO_ACCEL_REDIRECT_PREFIX = os.getenv("AUDIO_ACCEL_REDIRECT_PREFIX", "")
+
+# Occupancy analytics read whole months from a rollup table refreshed on
+# booking writes; run `manage.py refresh_occupancy_rollup` after enabling
+ANALYTICS_ROLLUP = os.getenv("ANALYTICS_ROLLUP", "False").lower() == "true"
+
+# Apartment booking writes take a transaction-level advisory lock of the
+# apartment and check for overlaps themselves, instead of relying on the
+# exclusion constraint alone; waits are reported at /metrics/
+BOOKING_ADVISORY_LOCKS = os.getenv("BOOKING_ADVISORY_LOCKS", "False").lower() == "true"
+
+# Seconds a response to a POST with an Idempotency-Key header is replayed for;
+# run `manage.py purge_idempotency_keys` to delete the expired ones
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", "86400"))
+
 # Transcription provider selection
 TRANSCRIPTION_PROVIDER = os.getenv("TRANSCRIPTION_PROVIDER", "local")
 
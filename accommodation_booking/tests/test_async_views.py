@@ -0,0 +1,244 @@
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import msgpack
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.core.management import call_command
+from django.test import AsyncRequestFactory, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accommodation_booking.infrastructure.django.response_cache import (
+    DjangoResponseCache,
+)
+from accommodation_booking.infrastructure.local.file_storage import LocalFileStorage
+from accommodations.async_views import (
+    AsyncAccommodationAvailabilityView,
+    AsyncAccommodationDetailView,
+    AsyncAccommodationListView,
+)
+from accommodations.caching import (
+    ACCOMMODATIONS,
+    accommodation_version,
+    availability_version,
+    invalidate,
+)
+from accommodations.models import Accommodation
+from bookings.async_views import AsyncVoiceNoteAudioDownloadView
+from bookings.models import Booking, VoiceNote
+
+
+class AsyncViewTests(APITestCase):
+    def setUp(self):
+        self._apartments = [
+            Accommodation.objects.create(
+                name=f"Apartment {index}",
+                description="",
+                price="100.0",
+                location="City",
+                type=Accommodation.AccommodationType.APARTMENT,
+            )
+            for index in range(3)
+        ]
+        self._booking = Booking.objects.create(
+            accommodation=self._apartments[0],
+            start_date="2025-01-01",
+            end_date="2025-01-08",
+            guest_name="Guest",
+        )
+        self._voice_note = VoiceNote.objects.create(
+            booking=self._booking,
+            transcript="",
+            status=VoiceNote.Status.SUCCEEDED,
+            file_name="note.mp3",
+            file_type="audio/mpeg",
+        )
+
+    def _cases(self):
+        pk = self._apartments[0].id
+        list_url = reverse("accommodation-list-create")
+        detail_url = reverse("accommodation-detail", args=[pk])
+        availability_url = reverse("accommodation-availability", args=[pk])
+        missing_url = reverse("accommodation-detail", args=[0])
+        return [
+            (AsyncAccommodationListView, list_url, {}, {}),
+            (AsyncAccommodationListView, list_url, {}, {"type": "apartment"}),
+            (AsyncAccommodationListView, list_url, {}, {"page_size": 1}),
+            (
+                AsyncAccommodationListView,
+                list_url,
+                {},
+                {"page_size": 2, "pagination": "cursor", "count": "estimated"},
+            ),
+            (AsyncAccommodationDetailView, detail_url, {"pk": pk}, {}),
+            (AsyncAccommodationDetailView, missing_url, {"pk": 0}, {}),
+            (
+                AsyncAccommodationAvailabilityView,
+                availability_url,
+                {"pk": pk},
+                {"date": "2025-01-02"},
+            ),
+            (AsyncAccommodationAvailabilityView, availability_url, {"pk": pk}, {}),
+            (
+                AsyncAccommodationAvailabilityView,
+                missing_url,
+                {"pk": 0},
+                {"date": "2025-01-02"},
+            ),
+            (AsyncAccommodationListView, list_url, {}, {"fields": "name,id"}),
+            (AsyncAccommodationDetailView, detail_url, {"pk": pk}, {"fields": "price"}),
+            (AsyncAccommodationDetailView, detail_url, {"pk": pk}, {"fields": "x"}),
+        ]
+
+    async def _get(self, view_class, url, kwargs, params, **headers):
+        request = AsyncRequestFactory().get(url, params, headers=headers)
+        return await view_class.as_view()(request, **kwargs)
+
+    async def test_reads_match_sync_views(self):
+        for view_class, url, kwargs, params in self._cases():
+            for accept in ["application/json", "application/msgpack"]:
+                with self.subTest(url=url, params=params, accept=accept):
+                    response = await self._get(
+                        view_class, url, kwargs, params, accept=accept
+                    )
+                    # Let the sync view build its response too
+                    await sync_to_async(invalidate)(
+                        ACCOMMODATIONS,
+                        accommodation_version(kwargs.get("pk", 0)),
+                        availability_version(kwargs.get("pk", 0)),
+                    )
+                    expected = await self.async_client.get(
+                        url, params, headers={"accept": accept}
+                    )
+
+                    self.assertEqual(response.status_code, expected.status_code)
+                    self.assertEqual(response["Content-Type"], expected["Content-Type"])
+                    self.assertEqual(response.content, expected.content)
+                    self.assertEqual("ETag" in response, "ETag" in expected)
+
+    async def test_reads_revalidate_with_etag(self):
+        response = await self._get(*self._cases()[0])
+
+        revalidated = await self._get(*self._cases()[0], if_none_match=response["ETag"])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated["ETag"], response["ETag"])
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                "LOCATION": "django_cache",
+            }
+        }
+    )
+    async def test_reads_use_the_database_cache(self):
+        await sync_to_async(call_command)("createcachetable", verbosity=0)
+        container = apps.get_app_config("accommodation_booking").container
+
+        with container.response_cache.override(DjangoResponseCache()):
+            for view_class, url, kwargs, params in self._cases():
+                with self.subTest(url=url, params=params):
+                    built = await self._get(view_class, url, kwargs, params)
+                    cached = await self._get(view_class, url, kwargs, params)
+
+                    self.assertLess(built.status_code, 500)
+                    self.assertEqual(cached.status_code, built.status_code)
+                    self.assertEqual(cached.content, built.content)
+
+            response = await self._get(*self._cases()[0])
+            revalidated = await self._get(
+                *self._cases()[0], if_none_match=response["ETag"]
+            )
+            self.assertEqual(revalidated.status_code, 304)
+
+    async def test_msgpack_is_negotiated(self):
+        response = await self._get(*self._cases()[4], accept="application/msgpack")
+
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(
+            msgpack.unpackb(response.content)["name"], self._apartments[0].name
+        )
+
+    async def test_writes_are_delegated_to_sync_views(self):
+        url = reverse("accommodation-list-create")
+        request = AsyncRequestFactory().post(
+            url,
+            {
+                "name": "New",
+                "description": "",
+                "price": "80.0",
+                "location": "City",
+                "type": "apartment",
+            },
+            content_type="application/json",
+        )
+
+        response = await AsyncAccommodationListView.as_view()(request)
+        await sync_to_async(response.render)()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.content)["name"], "New")
+        self.assertTrue(await Accommodation.objects.filter(name="New").aexists())
+
+    async def test_should_download_voice_note_audio(self):
+        audio = bytes(range(256)) * 400
+        kwargs = {"booking_id": self._booking.id, "pk": self._voice_note.id}
+        url = reverse("voice-note-audio", kwargs=kwargs)
+
+        with (
+            TemporaryDirectory() as directory,
+            patch.object(
+                LocalFileStorage,
+                "get_file_path",
+                lambda _, file_id: Path(directory) / file_id,
+            ),
+        ):
+            (Path(directory) / self._voice_note.storage_key.as_string()).write_bytes(
+                audio
+            )
+            response = await self._get(AsyncVoiceNoteAudioDownloadView, url, kwargs, {})
+            content = b"".join([chunk async for chunk in response])
+            partial = await self._get(
+                AsyncVoiceNoteAudioDownloadView,
+                url,
+                kwargs,
+                {},
+                range="bytes=70000-",
+                if_range=response["ETag"],
+            )
+            partial_content = b"".join([chunk async for chunk in partial])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content, audio)
+        self.assertEqual(response["Content-Type"], "audio/mpeg")
+        self.assertEqual(response["Content-Length"], str(len(audio)))
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="note.mp3"'
+        )
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial_content, audio[70000:])
+        self.assertEqual(
+            partial["Content-Range"], f"bytes 70000-{len(audio) - 1}/{len(audio)}"
+        )
+
+    @patch(
+        "accommodation_booking.infrastructure.local.file_storage.LocalFileStorage.path"
+    )
+    async def test_should_return_404_when_audio_is_missing(self, mock_path):
+        mock_path.side_effect = FileNotFoundError
+        kwargs = {"booking_id": self._booking.id, "pk": self._voice_note.id}
+
+        response = await self._get(
+            AsyncVoiceNoteAudioDownloadView,
+            reverse("voice-note-audio", kwargs=kwargs),
+            kwargs,
+            {},
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            json.loads(response.content), {"message": "Audio file not found"}
+        )
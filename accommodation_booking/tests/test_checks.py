@@ -0,0 +1,40 @@
+from django.test import SimpleTestCase, override_settings
+
+from accommodation_booking.checks import check_response_cache
+from accommodation_booking.container import ApplicationContainer
+
+DATABASE_CACHE = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "django_cache",
+    }
+}
+
+
+class ResponseCacheCheckTests(SimpleTestCase):
+    def test_warns_about_a_django_response_cache_kept_in_each_process(self):
+        with ApplicationContainer.config.response_cache.override("django"):
+            warnings = check_response_cache(None)
+
+        self.assertEqual(
+            [warning.id for warning in warnings], ["accommodation_booking.W001"]
+        )
+
+    @override_settings(CACHES=DATABASE_CACHE)
+    def test_accepts_a_shared_cache(self):
+        with ApplicationContainer.config.response_cache.override("django"):
+            self.assertEqual(check_response_cache(None), [])
+
+    @override_settings(WEB_CONCURRENCY=1)
+    def test_accepts_the_local_response_cache_in_one_process(self):
+        with ApplicationContainer.config.response_cache.override("local"):
+            self.assertEqual(check_response_cache(None), [])
+
+    @override_settings(WEB_CONCURRENCY=4)
+    def test_warns_about_the_local_response_cache_in_several_processes(self):
+        with ApplicationContainer.config.response_cache.override("local"):
+            warnings = check_response_cache(None)
+
+        self.assertEqual(
+            [warning.id for warning in warnings], ["accommodation_booking.W002"]
+        )
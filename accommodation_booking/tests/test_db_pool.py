@@ -0,0 +1,197 @@
+import asyncio
+import gc
+from threading import Thread
+from time import sleep
+
+import psycopg2
+from django.db import connection, connections
+from django.test import TestCase
+
+from accommodation_booking.db.base import DatabaseWrapper
+from accommodation_booking.db.pool import POOLS, ConnectionPool, checkout_waits
+from accommodation_booking.handlers import ASGIHandler
+
+
+class ConnectionPoolTests(TestCase):
+    def setUp(self):
+        self.pool = ConnectionPool(max_size=1, timeout=0.2)
+        self.opened = []
+
+    def tearDown(self):
+        self.pool.close()
+        for opened in self.opened:
+            opened.close()
+
+    def connect(self):
+        opened = psycopg2.connect(**connection.get_connection_params())
+        self.opened.append(opened)
+        return opened
+
+    def test_reuses_checked_in_connections(self):
+        first = self.pool.checkout(self.connect)
+        self.pool.checkin(first)
+
+        self.assertIs(self.pool.checkout(self.connect), first)
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual((self.pool.in_use, self.pool.idle), (1, 0))
+
+    def test_rolls_back_open_transactions_on_checkin(self):
+        opened = self.pool.checkout(self.connect)
+        with opened.cursor() as cursor:
+            cursor.execute("CREATE TEMPORARY TABLE pool_test (id int)")
+        self.pool.checkin(opened)
+
+        with self.pool.checkout(self.connect).cursor() as cursor:
+            cursor.execute("SELECT to_regclass('pg_temp.pool_test')")
+            self.assertIsNone(cursor.fetchone()[0])
+
+    def test_replaces_closed_and_old_connections(self):
+        closed = self.pool.checkout(self.connect)
+        self.pool.checkin(closed)
+        closed.close()
+
+        old = self.pool.checkout(self.connect)
+        self.assertIsNot(old, closed)
+        self.pool.checkin(old)
+        self.pool.max_lifetime = 0
+
+        self.assertIsNot(self.pool.checkout(self.connect), old)
+        self.assertTrue(old.closed)
+        self.assertEqual(self.pool.size, 1)
+
+    def test_pings_connections_idle_for_long(self):
+        opened = self.pool.checkout(self.connect)
+        self.pool.checkin(opened)
+        self.pool.check_after = 0
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_terminate_backend(%s)", [opened.info.backend_pid])
+        sleep(0.1)
+
+        replacement = self.pool.checkout(self.connect)
+
+        self.assertIsNot(replacement, opened)
+        with replacement.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+    def test_waits_for_a_connection_when_full(self):
+        opened = self.pool.checkout(self.connect)
+        waits = checkout_waits.value
+        checked_out = []
+        waiter = Thread(
+            target=lambda: checked_out.append(self.pool.checkout(self.connect))
+        )
+        waiter.start()
+        sleep(0.05)
+        self.pool.checkin(opened)
+        waiter.join()
+
+        self.assertEqual(checked_out, [opened])
+        self.assertEqual(checkout_waits.value, waits + 1)
+
+    def test_times_out_when_no_connection_is_returned(self):
+        self.pool.checkout(self.connect)
+
+        with self.assertRaises(psycopg2.OperationalError):
+            self.pool.checkout(self.connect)
+
+
+class PooledDatabaseWrapperTests(TestCase):
+    def setUp(self):
+        self.pools = set(POOLS)
+        self.wrapper = DatabaseWrapper(
+            {
+                **connection.settings_dict,
+                "ENGINE": "accommodation_booking.db",
+                "OPTIONS": {"pool": {"max_size": 2}},
+            },
+            alias=connection.alias,
+        )
+
+    def tearDown(self):
+        if hasattr(self, "wrapper"):
+            self.wrapper.close()
+        for key in set(POOLS) - self.pools:
+            POOLS.pop(key).close()
+
+    def test_closing_checks_the_connection_in(self):
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            backend_pid = cursor.fetchone()[0]
+        self.wrapper.close()
+
+        self.assertEqual((self.wrapper.pool.in_use, self.wrapper.pool.idle), (0, 1))
+        with self.wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            self.assertEqual(cursor.fetchone()[0], backend_pid)
+        self.assertEqual(self.wrapper.pool.in_use, 1)
+
+    def test_collecting_the_wrapper_checks_the_connection_in(self):
+        self.wrapper.ensure_connection()
+        pool = self.wrapper.pool
+        del self.wrapper
+        gc.collect()
+
+        self.assertEqual((pool.in_use, pool.idle), (0, 1))
+
+
+class ASGIConnectionTests(TestCase):
+    def setUp(self):
+        self.pools = set(POOLS)
+        # Connections of the request threads, created after this, are pooled
+        self.settings_dict = connections.settings[connection.alias]
+        self.saved = {name: self.settings_dict[name] for name in ["ENGINE", "OPTIONS"]}
+        self.settings_dict["ENGINE"] = "accommodation_booking.db"
+        self.settings_dict["OPTIONS"] = {"pool": {"max_size": 2, "timeout": 1}}
+
+    def tearDown(self):
+        self.settings_dict.update(self.saved)
+        for key in set(POOLS) - self.pools:
+            POOLS.pop(key).close()
+
+    async def get(self, application, path: str) -> int:
+        """Status of a GET from a client disconnecting once it has read the
+        response, as HTTP clients closing their connection do"""
+        messages, responded = [], asyncio.Event()
+
+        async def receive():
+            if not messages:
+                messages.append({"type": "http.request", "body": b""})
+                return messages[0]
+            await responded.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                responded.set()
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [],
+        }
+        await application(scope, receive, send)
+        return messages[1]["status"]
+
+    def test_requests_check_their_connections_in(self):
+        application = ASGIHandler()
+
+        async def get_many():
+            return [
+                await self.get(application, "/accommodations/0/") for _ in range(20)
+            ]
+
+        # Only closing connections checks them in, not collecting them. Run
+        # outside of an async test so each request gets its own thread, as
+        # under an ASGI server.
+        gc.disable()
+        try:
+            statuses = asyncio.run(get_many())
+        finally:
+            gc.enable()
+
+        self.assertEqual(set(statuses), {404})
+        (pool,) = [POOLS[key] for key in set(POOLS) - self.pools]
+        self.assertEqual((pool.in_use, pool.idle), (0, 1))
@@ -0,0 +1,84 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from accommodation_booking.db.replicas import (
+    PIN_COOKIE,
+    ReplicaRouter,
+    replica_middleware,
+    use_primary,
+)
+from accommodations.models import Accommodation
+
+
+@override_settings(REPLICA_DATABASES=["replica1"], DB_REPLICA_STICKINESS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    # Not wrapped in a transaction like TestCase, which reads from the primary
+    databases = {"default"}
+
+    def setUp(self):
+        self.routed = []
+
+        def view(request):
+            self.routed.append(Accommodation.objects.all().db)
+            with use_primary():
+                self.routed.append(Accommodation.objects.all().db)
+            return HttpResponse()
+
+        async def async_view(request):
+            self.routed.append(Accommodation.objects.all().db)
+            return HttpResponse()
+
+        self.middleware = replica_middleware(view)
+        self.async_middleware = replica_middleware(async_view)
+        self.factory = RequestFactory()
+
+    def test_safe_requests_read_from_replicas(self):
+        response = self.middleware(self.factory.get("/accommodations/"))
+
+        self.assertEqual(self.routed, ["replica1", "default"])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    async def test_safe_async_requests_read_from_replicas(self):
+        await self.async_middleware(self.factory.get("/accommodations/"))
+
+        self.assertEqual(self.routed, ["replica1"])
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        response = self.middleware(self.factory.post("/bookings/"))
+
+        self.assertEqual(self.routed, ["default", "default"])
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 5)
+
+        self.factory.cookies[PIN_COOKIE] = response.cookies[PIN_COOKIE].value
+        self.middleware(self.factory.get("/bookings/"))
+
+        self.assertEqual(self.routed[2:], ["default", "default"])
+
+    def test_reads_outside_requests_and_in_transactions_use_the_primary(self):
+        self.assertEqual(Accommodation.objects.all().db, "default")
+
+        def view(request):
+            with transaction.atomic():
+                self.routed.append(Accommodation.objects.all().db)
+            return HttpResponse()
+
+        replica_middleware(view)(self.factory.get("/accommodations/"))
+
+        self.assertEqual(self.routed, ["default"])
+
+    def test_only_the_booking_apps_are_routed(self):
+        router = ReplicaRouter()
+
+        self.assertIsNone(router.db_for_read(User))
+        self.assertIsNone(router.db_for_write(User))
+        self.assertFalse(router.allow_migrate("replica1", "bookings"))
+        self.assertIsNone(router.allow_migrate("default", "bookings"))
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_does_nothing_without_replicas(self):
+        response = self.middleware(self.factory.post("/bookings/"))
+
+        self.assertEqual(self.routed, ["default", "default"])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
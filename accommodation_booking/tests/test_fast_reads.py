@@ -0,0 +1,118 @@
+import json
+from datetime import datetime, timezone
+
+import msgpack
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import generics
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from accommodations.models import Accommodation
+from accommodations.serializers import AccommodationSerializer
+from bookings.models import Booking, VoiceNote
+from bookings.serializers import BookingSerializer, VoiceNoteSerializer
+
+AWKWARD_TEXT = (
+    'Quote " back\\slash \t tab \x01 é 東京 \U0001f600 \u2028 \u2029 </script>'
+)
+
+
+class FastListTests(APITestCase):
+    def setUp(self):
+        self._apartments = [
+            Accommodation.objects.create(
+                name=f"Apartment {index} {AWKWARD_TEXT}",
+                description=AWKWARD_TEXT if index % 2 else "",
+                price=price,
+                location="City",
+                type=Accommodation.AccommodationType.APARTMENT,
+            )
+            for index, price in enumerate(["100", "0.10", "12345678.99", "7.5"])
+        ]
+        self._bookings = [
+            Booking.objects.create(
+                accommodation=accommodation,
+                start_date="2025-01-01",
+                end_date="2025-01-08",
+                guest_name=AWKWARD_TEXT,
+            )
+            for accommodation in self._apartments
+        ]
+        for index, created_at in enumerate(
+            [
+                datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc),
+                datetime(2025, 1, 1, 10, 0, 0, 123456, tzinfo=timezone.utc),
+            ]
+        ):
+            voice_note = VoiceNote.objects.create(
+                booking=self._bookings[0],
+                transcript=AWKWARD_TEXT,
+                status=VoiceNote.Status.SUCCEEDED,
+                file_name=f"note {index}.mp3",
+                file_type="audio/mpeg",
+            )
+            VoiceNote.objects.filter(id=voice_note.id).update(created_at=created_at)
+
+    def _reference(self, queryset, serializer_class, params):
+        """Response of a plain DRF list view rendered with the stock renderer"""
+
+        class ReferenceView(generics.ListAPIView):
+            renderer_classes = [JSONRenderer]
+
+        view = ReferenceView.as_view(
+            queryset=queryset, serializer_class=serializer_class
+        )
+        response = view(APIRequestFactory().get("/reference/", params))
+        return response.render().content.replace(
+            b"http://testserver/reference/", b"http://testserver{path}"
+        )
+
+    def _cases(self):
+        booking_id = self._bookings[0].id
+        return [
+            (
+                reverse("accommodation-list-create"),
+                Accommodation.objects.all(),
+                AccommodationSerializer,
+            ),
+            (
+                reverse("booking-list-create"),
+                Booking.objects.select_related("accommodation"),
+                BookingSerializer,
+            ),
+            (
+                reverse("voice-note-list-create", args=[booking_id]),
+                VoiceNote.objects.filter(booking_id=booking_id),
+                VoiceNoteSerializer,
+            ),
+        ]
+
+    def test_output_is_byte_identical_to_serializers(self):
+        for params in [{}, {"page_size": 2, "pagination": "cursor"}]:
+            for url, queryset, serializer_class in self._cases():
+                with self.subTest(url=url, params=params):
+                    response = self.client.get(url, data=params)
+                    expected = self._reference(queryset, serializer_class, params)
+                    self.assertEqual(
+                        response.content, expected.replace(b"{path}", url.encode())
+                    )
+
+    @override_settings(TIME_ZONE="America/New_York")
+    def test_datetimes_follow_current_time_zone(self):
+        self.test_output_is_byte_identical_to_serializers()
+
+    def test_list_reads_in_one_query(self):
+        for url, _, _ in self._cases():
+            # the rows and the page count
+            with self.assertNumQueries(2):
+                self.client.get(url)
+
+    def test_msgpack_negotiation(self):
+        for url, _, _ in self._cases():
+            response = self.client.get(url, HTTP_ACCEPT="application/msgpack")
+            self.assertEqual(response["Content-Type"], "application/msgpack")
+            self.assertEqual(
+                msgpack.unpackb(response.content),
+                json.loads(self.client.get(url).content),
+            )
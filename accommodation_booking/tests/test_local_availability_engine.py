@@ -0,0 +1,209 @@
+from datetime import date
+
+from django.test import TestCase
+
+from accommodation_booking.infrastructure.local.availability_engine import (
+    LocalAvailabilityEngine,
+)
+from accommodation_booking.infrastructure.postgres.availability_engine import (
+    PostgresAvailabilityEngine,
+)
+from accommodations.models import Accommodation
+from bookings.models import Booking
+
+
+class LocalAvailabilityEngineTests(TestCase):
+    def setUp(self):
+        self._apartment = Accommodation.objects.create(
+            name="Apartment",
+            description="",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+        self._hotel = Accommodation.objects.create(
+            name="Hotel",
+            description="",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.HOTEL,
+        )
+        for start_date, end_date in [
+            ("2025-01-01", "2025-01-08"),
+            ("2025-01-08", "2025-01-10"),
+            ("2025-01-12", "2025-01-15"),
+        ]:
+            Booking.objects.create(
+                accommodation=self._apartment,
+                start_date=start_date,
+                end_date=end_date,
+                guest_name="Guest",
+            )
+        self._apartment.refresh_from_db()
+        self._engine = LocalAvailabilityEngine()
+
+    def test_next_available_date(self):
+        cases = [
+            (date(2024, 12, 31), date(2024, 12, 31)),
+            (date(2025, 1, 1), date(2025, 1, 10)),
+            (date(2025, 1, 8), date(2025, 1, 10)),
+            (date(2025, 1, 10), date(2025, 1, 10)),
+            (date(2025, 1, 13), date(2025, 1, 15)),
+            (date(2025, 1, 20), date(2025, 1, 20)),
+        ]
+        for reference_date, expected_date in cases:
+            self.assertEqual(
+                self._engine.next_available_date(self._apartment, reference_date),
+                expected_date,
+            )
+
+    def test_is_booked(self):
+        cases = [
+            (date(2024, 12, 20), date(2025, 1, 1), False),
+            (date(2024, 12, 20), date(2025, 1, 2), True),
+            (date(2025, 1, 7), date(2025, 1, 8), True),
+            (date(2025, 1, 10), date(2025, 1, 12), False),
+            (date(2025, 1, 9), date(2025, 1, 20), True),
+            (date(2025, 1, 15), date(2025, 1, 20), False),
+        ]
+        for start_date, end_date, expected in cases:
+            self.assertEqual(
+                self._engine.is_booked(self._apartment, start_date, end_date),
+                expected,
+            )
+
+    def test_is_booked_excludes_booking(self):
+        booking = Booking.objects.get(start_date="2025-01-12")
+        self.assertFalse(
+            self._engine.is_booked(
+                self._apartment,
+                date(2025, 1, 12),
+                date(2025, 1, 14),
+                exclude_booking_id=booking.id,
+            )
+        )
+
+    def test_hotels_are_always_available(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self._engine.next_available_date(self._hotel, date(2025, 1, 1)),
+                date(2025, 1, 1),
+            )
+            self.assertFalse(
+                self._engine.is_booked(self._hotel, date(2025, 1, 1), date(2025, 1, 2))
+            )
+
+    def test_hotel_with_rooms_matches_postgres_engine(self):
+        hotel = Accommodation.objects.create(
+            name="Small hotel",
+            description="",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.HOTEL,
+            rooms=2,
+        )
+        for start_date, end_date in [
+            ("2025-01-01", "2025-01-05"),
+            ("2025-01-03", "2025-01-08"),
+            ("2025-01-05", "2025-01-06"),
+            ("2025-01-06", "2025-01-07"),
+        ]:
+            Booking.objects.create(
+                accommodation=hotel,
+                start_date=start_date,
+                end_date=end_date,
+                guest_name="Guest",
+            )
+        hotel.refresh_from_db()
+        postgres = PostgresAvailabilityEngine()
+
+        # sold out from the 3rd to the 6th
+        for reference_date, expected_date in [
+            (date(2025, 1, 1), date(2025, 1, 1)),
+            (date(2025, 1, 3), date(2025, 1, 7)),
+            (date(2025, 1, 5), date(2025, 1, 7)),
+            (date(2025, 1, 7), date(2025, 1, 7)),
+        ]:
+            for engine in [self._engine, postgres]:
+                self.assertEqual(
+                    engine.next_available_date(hotel, reference_date),
+                    expected_date,
+                )
+
+        for start_date, end_date, expected in [
+            (date(2025, 1, 1), date(2025, 1, 3), False),
+            (date(2025, 1, 2), date(2025, 1, 4), True),
+            (date(2025, 1, 7), date(2025, 1, 9), False),
+        ]:
+            for engine in [self._engine, postgres]:
+                self.assertEqual(
+                    engine.is_booked(hotel, start_date, end_date), expected
+                )
+
+        # not counting its own room, a booking can stay where it is
+        booking = Booking.objects.get(accommodation=hotel, start_date="2025-01-05")
+        for engine in [self._engine, postgres]:
+            self.assertFalse(
+                engine.is_booked(
+                    hotel,
+                    date(2025, 1, 5),
+                    date(2025, 1, 6),
+                    exclude_booking_id=booking.id,
+                )
+            )
+
+    def test_reuses_intervals_until_version_changes(self):
+        self._engine.next_available_date(self._apartment, date(2025, 1, 1))
+        with self.assertNumQueries(0):
+            self._engine.next_available_date(self._apartment, date(2025, 1, 1))
+
+        Booking.objects.create(
+            accommodation=self._apartment,
+            start_date="2025-01-10",
+            end_date="2025-01-12",
+            guest_name="Guest",
+        )
+        self._apartment.refresh_from_db()
+
+        self.assertEqual(
+            self._engine.next_available_date(self._apartment, date(2025, 1, 1)),
+            date(2025, 1, 15),
+        )
+
+
+class BookingsVersionSignalTests(TestCase):
+    def setUp(self):
+        self._first = Accommodation.objects.create(
+            name="First",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+        self._second = Accommodation.objects.create(
+            name="Second",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+
+    def _versions(self):
+        self._first.refresh_from_db()
+        self._second.refresh_from_db()
+        return self._first.bookings_version, self._second.bookings_version
+
+    def test_booking_writes_bump_version(self):
+        booking = Booking.objects.create(
+            accommodation=self._first,
+            start_date="2025-01-01",
+            end_date="2025-01-02",
+            guest_name="Guest",
+        )
+        self.assertEqual(self._versions(), (1, 0))
+
+        booking = Booking.objects.get(id=booking.id)
+        booking.accommodation = self._second
+        booking.save()
+        self.assertEqual(self._versions(), (2, 1))
+
+        booking.delete()
+        self.assertEqual(self._versions(), (2, 2))
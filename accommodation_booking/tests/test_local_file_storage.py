@@ -1,3 +1,4 @@
+from hashlib import sha256
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
@@ -29,3 +30,52 @@ class LocalFileStorageTests(SimpleTestCase):
     def test_load_file_should_raise_exception(self):
         with self.assertRaises(FileNotFoundError):
             self._storage.load_file("invalid_file_name")
+
+    async def test_aload_file_should_return_without_errors(self):
+        file = await self._storage.aload_file("file")
+        self.assertEqual(file, b"1234")
+
+    async def test_aload_file_should_raise_exception(self):
+        with self.assertRaises(FileNotFoundError):
+            await self._storage.aload_file("invalid_file_name")
+
+    def test_save_stream_should_write_chunks(self):
+        stored = self._storage.save_stream(iter([b"12", b"", b"3456"]), "streamed")
+
+        self.assertEqual((self._datadir / "streamed").read_bytes(), b"123456")
+        self.assertEqual(stored.size, 6)
+        self.assertEqual(stored.sha256, sha256(b"123456").hexdigest())
+
+    def test_save_stream_should_create_files_as_open_does(self):
+        self._storage.save_stream(iter([b"12"]), "streamed")
+        (self._datadir / "opened").touch()
+
+        self.assertEqual(
+            (self._datadir / "streamed").stat().st_mode,
+            (self._datadir / "opened").stat().st_mode,
+        )
+
+    def test_save_stream_should_leave_nothing_when_interrupted(self):
+        def chunks():
+            yield b"12"
+            raise OSError("connection reset")
+
+        with self.assertRaises(OSError):
+            self._storage.save_stream(chunks(), "streamed")
+
+        self.assertEqual(
+            sorted(path.name for path in self._datadir.iterdir()), ["file"]
+        )
+
+    def test_open_stream_should_return_the_file(self):
+        with self._storage.open_stream("file") as fin:
+            self.assertEqual(fin.read(), b"1234")
+
+        with self.assertRaises(FileNotFoundError):
+            self._storage.open_stream("invalid_file_name")
+
+    def test_path_should_return_the_file_path(self):
+        self.assertEqual(self._storage.path("file"), self._datadir / "file")
+
+        with self.assertRaises(FileNotFoundError):
+            self._storage.path("invalid_file_name")
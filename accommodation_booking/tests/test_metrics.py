@@ -0,0 +1,74 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from accommodation_booking.metrics import REGISTRY, Counter, Gauge, Histogram, histogram
+
+
+class HistogramTests(SimpleTestCase):
+    def test_renders_cumulative_buckets(self):
+        waits = Histogram("waits_seconds", "Waits", buckets=(0.1, 1.0))
+        for value in [0.05, 0.1, 0.5, 3.0]:
+            waits.observe(value)
+
+        self.assertEqual(
+            waits.render(),
+            [
+                "# HELP waits_seconds Waits",
+                "# TYPE waits_seconds histogram",
+                'waits_seconds_bucket{le="0.1"} 2',
+                'waits_seconds_bucket{le="1.0"} 3',
+                'waits_seconds_bucket{le="+Inf"} 4',
+                "waits_seconds_sum 3.65",
+                "waits_seconds_count 4",
+            ],
+        )
+
+    def test_endpoint_exposes_registered_metrics(self):
+        try:
+            histogram("test_seconds", "Test", buckets=(1.0,)).observe(0.5)
+
+            response = self.client.get(reverse("metrics"))
+        finally:
+            del REGISTRY["test_seconds"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn('test_seconds_bucket{le="1.0"} 1\n', response.content.decode())
+        self.assertIn(
+            "# TYPE booking_lock_wait_seconds histogram", response.content.decode()
+        )
+
+
+class CounterTests(SimpleTestCase):
+    def test_renders_total(self):
+        retries = Counter("retries_total", "Retries")
+        retries.inc()
+        retries.inc(2)
+
+        self.assertEqual(
+            retries.render(),
+            [
+                "# HELP retries_total Retries",
+                "# TYPE retries_total counter",
+                "retries_total 3",
+            ],
+        )
+
+
+class GaugeTests(SimpleTestCase):
+    def test_renders_values_read_per_label_set(self):
+        connections = Gauge(
+            "connections",
+            "Connections",
+            lambda: [({"state": "idle"}, 2), ({"state": "in_use"}, 1)],
+        )
+
+        self.assertEqual(
+            connections.render(),
+            [
+                "# HELP connections Connections",
+                "# TYPE connections gauge",
+                'connections{state="idle"} 2',
+                'connections{state="in_use"} 1',
+            ],
+        )
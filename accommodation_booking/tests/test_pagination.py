@@ -0,0 +1,145 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import generics
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from accommodations.models import Accommodation
+from accommodations.serializers import AccommodationSerializer
+from bookings.models import Booking
+
+
+class FlexiblePaginationTests(APITestCase):
+    def setUp(self):
+        self._accommodations = [
+            Accommodation.objects.create(
+                name=f"Accommodation {index}",
+                price="100.0",
+                location="City",
+                type=(
+                    Accommodation.AccommodationType.HOTEL
+                    if index % 5 == 0
+                    else Accommodation.AccommodationType.APARTMENT
+                ),
+            )
+            for index in range(45)
+        ]
+        for index, accommodation in enumerate(self._accommodations[:25]):
+            Booking.objects.create(
+                accommodation=accommodation,
+                start_date="2025-01-01",
+                end_date="2025-01-03",
+                guest_name=f"Guest {index}",
+            )
+
+    def _collect_cursor_pages(self, url, data):
+        ids, pages = [], 0
+        response = self.client.get(url, data=data)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            ids += [item["id"] for item in response.data["results"]]
+            pages += 1
+            if not response.data["next"]:
+                return ids, pages
+            response = self.client.get(response.data["next"])
+
+    def test_page_numbers_by_default(self):
+        response = self.client.get(
+            reverse("accommodation-list-create"), data={"page": 2}
+        )
+
+        self.assertEqual(response.data["count"], 45)
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [accommodation.id for accommodation in self._accommodations[20:40]],
+        )
+
+    def test_cursor_pages_walk_every_row_once(self):
+        cases = [
+            (reverse("accommodation-list-create"), self._accommodations),
+            (
+                reverse("booking-list-create"),
+                list(Booking.objects.order_by("id")),
+            ),
+        ]
+        for url, expected in cases:
+            ids, pages = self._collect_cursor_pages(
+                url, {"pagination": "cursor", "page_size": 10}
+            )
+            self.assertEqual(ids, [row.id for row in expected])
+            self.assertEqual(pages, (len(expected) + 9) // 10)
+
+    def test_cursor_pages_keep_filters(self):
+        ids, _ = self._collect_cursor_pages(
+            reverse("accommodation-list-create"),
+            {"pagination": "cursor", "type": "hotel", "page_size": 3},
+        )
+
+        self.assertEqual(
+            ids,
+            [
+                accommodation.id
+                for accommodation in self._accommodations
+                if accommodation.type == Accommodation.AccommodationType.HOTEL
+            ],
+        )
+
+    def test_cursor_pages_do_not_count(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(
+                reverse("accommodation-list-create"), data={"pagination": "cursor"}
+            )
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn("COUNT(", context.captured_queries[0]["sql"])
+
+    def test_estimated_count(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE accommodation")
+
+        cases = [
+            {"count": "estimated"},
+            {"count": "estimated", "pagination": "cursor"},
+            {"count": "estimated", "type": "hotel"},
+        ]
+        for params in cases:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(
+                    reverse("accommodation-list-create"), data=params
+                )
+            self.assertIsInstance(response.data["count"], int)
+            for query in context.captured_queries:
+                self.assertNotIn("COUNT(", query["sql"])
+
+        response = self.client.get(
+            reverse("accommodation-list-create"), data={"count": "estimated"}
+        )
+        self.assertEqual(response.data["count"], 45)
+
+    def test_voice_note_list_accepts_cursor(self):
+        booking = Booking.objects.first()
+        response = self.client.get(
+            reverse("voice-note-list-create", args=[booking.id]),
+            data={"pagination": "cursor"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"], [])
+        self.assertIn("next", response.data)
+
+    def test_view_can_default_to_cursor(self):
+        class CursorListView(generics.ListAPIView):
+            queryset = Accommodation.objects.all()
+            serializer_class = AccommodationSerializer
+            pagination_mode = "cursor"
+
+        view = CursorListView.as_view()
+        factory = APIRequestFactory()
+
+        response = view(factory.get("/"))
+        self.assertNotIn("count", response.data)
+        self.assertIsNotNone(response.data["next"])
+
+        response = view(factory.get("/", {"pagination": "page"}))
+        self.assertEqual(response.data["count"], 45)
@@ -0,0 +1,245 @@
+import re
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accommodations.models import Accommodation
+from bookings.inventory import take_rooms
+from bookings.models import Booking, VoiceNote
+from bookings.serializers import BookingSerializer
+
+
+class QueryPlanTests(TestCase):
+    """Fail when hot booking and accommodation queries stop using indexes.
+
+    The queries are captured from the real code paths and explained against a
+    seeded dataset large enough for the planner to prefer index scans.
+    """
+
+    ACCOMMODATIONS = 20_000
+    BOOKINGS_PER_ACCOMMODATION = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO accommodation (name, description, price, location, type, rooms, bookings_version)
+                SELECT
+                    'Stay ' || substr(md5(i::text), 1, 10),
+                    '',
+                    50 + i %% 200,
+                    (ARRAY['Lisbon', 'Porto', 'Faro', 'Braga'])[1 + i %% 4],
+                    CASE WHEN i %% 10 = 0 THEN 'hotel' ELSE 'apartment' END,
+                    CASE WHEN i %% 10 = 0 THEN 1 + i %% 3 END,
+                    0
+                FROM generate_series(1, %s) i
+                """,
+                [cls.ACCOMMODATIONS],
+            )
+            cursor.execute(
+                """
+                INSERT INTO booking (accommodation_id, start_date, end_date, guest_name, accommodation_type)
+                SELECT
+                    a.id,
+                    DATE '2025-01-01' + j * 7,
+                    DATE '2025-01-01' + j * 7 + 5,
+                    'Guest ' || substr(md5(a.id || '-' || j), 1, 10),
+                    a.type
+                FROM accommodation a, generate_series(0, %s) j
+                """,
+                [cls.BOOKINGS_PER_ACCOMMODATION - 1],
+            )
+            cursor.execute(
+                """
+                INSERT INTO room_inventory (accommodation_id, night, remaining)
+                SELECT a.id, night::date, a.rooms - 1
+                FROM accommodation a
+                JOIN booking b ON b.accommodation_id = a.id
+                CROSS JOIN LATERAL generate_series(
+                    b.start_date::timestamp, b.end_date::timestamp - interval '1 day', interval '1 day'
+                ) AS night
+                WHERE a.rooms IS NOT NULL
+                """
+            )
+            cursor.execute(
+                """
+                INSERT INTO voicenote (booking_id, transcript, status, file_name, file_type, file_sha256, created_at)
+                SELECT
+                    b.id,
+                    'Asked about ' || (ARRAY['late check-in', 'parking', 'breakfast'])[1 + b.id %% 3]
+                        || ', reference ' || substr(md5(b.id::text), 1, 10),
+                    'succeeded',
+                    'note.mp3',
+                    'audio/mpeg',
+                    '',
+                    now()
+                FROM booking b
+                WHERE b.id %% %s = 0
+                """,
+                [cls.BOOKINGS_PER_ACCOMMODATION],
+            )
+            # Move the seeded rows out of the GIN pending list, as autovacuum would
+            cursor.execute("SELECT gin_clean_pending_list('voicenote_search_vector')")
+            cursor.execute("ANALYZE accommodation, booking, room_inventory, voicenote")
+        cls._superuser = User.objects.create_superuser(
+            "admin", "admin@example.com", "admin"
+        )
+
+        cls._apartment = Accommodation.objects.filter(type="apartment").first()
+        cls._hotel = Accommodation.objects.filter(rooms__isnull=False).first()
+
+    def explain(self, sql: str) -> str:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}")
+            return "\n".join(row[0] for row in cursor.fetchall())
+
+    def captured_plans(self, action, table: str) -> list[str]:
+        """Plans of the captured queries reading `table`"""
+        with CaptureQueriesContext(connection) as context:
+            action()
+        plans = [
+            self.explain(query["sql"])
+            for query in context.captured_queries
+            if re.search(rf'FROM "?{table}\b', query["sql"])
+        ]
+        self.assertTrue(plans, f"No query on {table} was captured")
+        return plans
+
+    def assertUsesIndexScans(self, plans: list[str], table: str):
+        for plan in plans:
+            self.assertNotIn(f"Seq Scan on {table}", plan, plan)
+            self.assertIn("Index", plan, plan)
+
+    def test_availability_uses_booking_indexes(self):
+        url = reverse("accommodation-availability", args=[self._apartment.id])
+        plans = self.captured_plans(
+            lambda: self.client.get(url, data={"date": "2025-03-03"}), "booking"
+        )
+        self.assertUsesIndexScans(plans, "booking")
+
+    def test_batch_availability_uses_booking_indexes(self):
+        url = reverse("accommodation-batch-availability")
+        ids = list(
+            Accommodation.objects.values_list("id", flat=True).order_by("id")[:50]
+        )
+        plans = self.captured_plans(
+            lambda: self.client.post(
+                url, {"ids": ids, "date": "2025-03-03"}, format="json"
+            ),
+            "booking",
+        )
+        self.assertUsesIndexScans(plans, "booking")
+
+    def test_locked_overlap_check_uses_booking_indexes(self):
+        booking = Booking(
+            accommodation=self._apartment,
+            start_date=date(2025, 3, 1),
+            end_date=date(2025, 3, 4),
+        )
+        plans = self.captured_plans(
+            lambda: BookingSerializer._overlaps(booking), "booking"
+        )
+        self.assertUsesIndexScans(plans, "booking")
+
+    def test_room_taking_uses_inventory_index(self):
+        plans = self.captured_plans(
+            lambda: take_rooms([(self._hotel.id, date(2025, 3, 1), date(2025, 3, 4))]),
+            "room_inventory",
+        )
+        self.assertUsesIndexScans(plans, "room_inventory")
+
+    def test_calendar_uses_booking_indexes(self):
+        url = reverse("accommodation-calendar", args=[self._apartment.id])
+        plans = self.captured_plans(
+            lambda: self.client.get(
+                url, data={"from": "2025-01-01", "to": "2026-01-01"}
+            ),
+            "booking",
+        )
+        self.assertUsesIndexScans(plans, "booking")
+
+    def test_type_filter_uses_accommodation_index(self):
+        url = reverse("accommodation-list-create")
+        plans = self.captured_plans(
+            lambda: self.client.get(url, data={"type": "hotel", "page": 3}),
+            "accommodation",
+        )
+        # The COUNT(*) of a whole type may legitimately scan the table
+        page_plans = [plan for plan in plans if "Limit" in plan]
+        self.assertTrue(page_plans)
+        self.assertUsesIndexScans(page_plans, "accommodation")
+
+    def test_search_uses_indexes(self):
+        url = reverse("accommodation-search")
+        plans = self.captured_plans(
+            lambda: self.client.get(
+                url,
+                data={
+                    "start_date": "2025-03-03",
+                    "end_date": "2025-03-05",
+                    "location": "Lisbon",
+                    "max_price": "60",
+                },
+            ),
+            "accommodation",
+        )
+        self.assertUsesIndexScans(plans, "accommodation")
+        self.assertUsesIndexScans(plans, "booking")
+        self.assertUsesIndexScans(plans, "room_inventory")
+
+    def test_text_search_uses_text_indexes(self):
+        plans = self.captured_plans(
+            lambda: self.client.get(
+                reverse("booking-list-create"),
+                data={"q": Booking.objects.first().guest_name[:-1]},
+            ),
+            "booking",
+        )
+        self.assertUsesIndexScans(plans, "booking")
+
+    def test_voice_note_search_uses_text_index(self):
+        reference = VoiceNote.objects.first().transcript.split()[-1]
+        plans = self.captured_plans(
+            lambda: self.client.get(
+                reverse("voice-note-search"), data={"q": f"reference {reference}"}
+            ),
+            "voicenote",
+        )
+        self.assertUsesIndexScans(plans, "voicenote")
+        self.assertIn("voicenote_search_vector", plans[0], plans[0])
+
+    def test_accommodation_text_search_can_use_text_indexes(self):
+        # Scanning this many accommodations is cheaper than probing the five
+        # indexes, so only check that every branch of the search can use one
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plans = self.captured_plans(
+            lambda: self.client.get(
+                reverse("accommodation-list-create"),
+                data={"q": self._apartment.name[:-1]},
+            ),
+            "accommodation",
+        )
+        self.assertUsesIndexScans(plans, "accommodation")
+        for index in [
+            "accommodation_search_vector",
+            "accommodation_name_trgm",
+            "accommodation_location_trgm",
+        ]:
+            self.assertIn(index, plans[0], plans[0])
+
+    def test_admin_search_uses_text_indexes(self):
+        self.client.force_login(self._superuser)
+        url = reverse("admin:bookings_booking_changelist")
+        plans = self.captured_plans(
+            lambda: self.client.get(url, data={"q": self._hotel.name}), "booking"
+        )
+        # The changelist also counts every booking, for "x of y selected"
+        search_plans = [plan for plan in plans if "UPPER" in plan.upper()]
+        self.assertTrue(search_plans)
+        self.assertUsesIndexScans(search_plans, "booking")
@@ -0,0 +1,163 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accommodations.models import Accommodation
+from bookings.models import Booking, VoiceNote
+
+
+class SparseFieldsTests(APITestCase):
+    def setUp(self):
+        self._apartment = Accommodation.objects.create(
+            name="Apartment",
+            description="Quiet",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+        self._booking = Booking.objects.create(
+            accommodation=self._apartment,
+            start_date="2025-01-01",
+            end_date="2025-01-08",
+            guest_name="Guest",
+        )
+        self._voice_notes = [
+            VoiceNote.objects.create(
+                booking=self._booking,
+                transcript=transcript,
+                status=VoiceNote.Status.SUCCEEDED,
+            )
+            for transcript in ["Late check-in " * 30, "Short"]
+        ]
+
+    def _get(self, url, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), [query["sql"] for query in context.captured_queries]
+
+    def test_lists_read_only_the_requested_columns(self):
+        booking_id = self._booking.id
+        for url, fields, expected, unread in [
+            (
+                reverse("accommodation-list-create"),
+                "price,id",
+                ["id", "price"],
+                "description",
+            ),
+            (
+                reverse("booking-list-create"),
+                "guest_name,id",
+                ["id", "guest_name"],
+                "accommodation",
+            ),
+            (
+                reverse("voice-note-list-create", args=[booking_id]),
+                "status,booking_id",
+                ["booking_id", "status"],
+                "transcript",
+            ),
+        ]:
+            with self.subTest(url=url):
+                data, queries = self._get(url, fields=fields)
+
+                # In the serializer's order
+                self.assertEqual(list(data["results"][0]), expected)
+                self.assertNotIn(f'"{unread}"', queries[-1])
+
+    def test_details_load_only_the_requested_columns(self):
+        for url, fields, unread in [
+            (
+                reverse("accommodation-detail", args=[self._apartment.id]),
+                "name",
+                "description",
+            ),
+            (reverse("booking-detail", args=[self._booking.id]), "guest_name", "name"),
+            (
+                reverse(
+                    "voice-note-detail",
+                    args=[self._booking.id, self._voice_notes[0].id],
+                ),
+                "booking_id,status",
+                "transcript",
+            ),
+        ]:
+            with self.subTest(url=url):
+                data, queries = self._get(url, fields=fields)
+
+                self.assertEqual(list(data), fields.split(","))
+                self.assertEqual(len(queries), 1)
+                self.assertNotIn(f'"{unread}"', queries[0])
+
+    def test_voice_notes_are_read_without_their_booking(self):
+        url = reverse(
+            "voice-note-detail", args=[self._booking.id, self._voice_notes[0].id]
+        )
+        data, queries = self._get(url)
+
+        self.assertEqual(data["booking_id"], self._booking.id)
+        self.assertEqual(len(queries), 1)
+
+    def test_search_results_and_exports_are_sparse(self):
+        data, _ = self._get(
+            reverse("voice-note-search"), q="late", fields="id,rank,headline"
+        )
+        self.assertEqual(list(data["results"][0]), ["id", "rank", "headline"])
+
+        response = self.client.get(
+            reverse("booking-export"), {"format": "csv", "fields": "guest_name,id"}
+        )
+        self.assertEqual(
+            b"".join(response.streaming_content).decode().splitlines(),
+            ["id,guest_name", f"{self._booking.id},Guest"],
+        )
+
+    def test_transcript_excerpts(self):
+        url = reverse("voice-note-list-create", args=[self._booking.id])
+
+        data, _ = self._get(url, transcript="excerpt", fields="transcript")
+
+        long, short = [note["transcript"] for note in data["results"]]
+        self.assertEqual(len(long), 200)
+        self.assertEqual(long, self._voice_notes[0].transcript[:199] + "…")
+        self.assertEqual(short, "Short")
+
+    def test_cursor_pages_without_the_ordering_field(self):
+        Accommodation.objects.create(
+            name="House",
+            description="",
+            price="80.0",
+            location="Town",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+
+        first, _ = self._get(
+            reverse("accommodation-list-create"),
+            fields="name",
+            pagination="cursor",
+            page_size=1,
+        )
+        second, _ = self._get(first["next"])
+
+        self.assertEqual(first["results"], [{"name": "Apartment"}])
+        self.assertEqual(second["results"], [{"name": "House"}])
+
+    def test_rejects_unknown_fields(self):
+        response = self.client.get(
+            reverse("booking-list-create"), {"fields": "id,accommodation_id,nope"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {"fields": ["Unknown fields: accommodation_id, nope"]}
+        )
+
+    def test_writes_answer_with_every_field(self):
+        url = reverse("booking-detail", args=[self._booking.id])
+
+        response = self.client.patch(f"{url}?fields=id", {"guest_name": "Other"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["guest_name"], "Other")
+        self.assertIn("start_date", response.json())
@@ -5,10 +5,13 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from accommodation_booking.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('accommodations/', include('accommodations.urls')),
     path('bookings/', include('bookings.urls')),
+    path('metrics/', metrics_view, name='metrics'),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('documentation/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
 ] 
\ No newline at end of file
@@ -1,10 +1,17 @@
 from django.contrib import admin
 
+from accommodation_booking.text_search import TextSearchAdmin
+
 from .models import Accommodation
+from .search import text_filter, text_rank
 
 
 @admin.register(Accommodation)
-class AccommodationAdmin(admin.ModelAdmin):
+class AccommodationAdmin(TextSearchAdmin):
     list_display = ["name", "location", "price", "type"]
     list_filter = ["location", "type"]
-    search_fields = ["name", "location", "type"]
+    search_fields = ["name", "location", "description"]
+    search_help_text = "Words or part of the name, location or description"
+
+    search_filter = staticmethod(text_filter)
+    search_rank = staticmethod(text_rank)
@@ -0,0 +1,194 @@
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection, transaction
+
+# Columns results can be grouped by
+GROUPS = {
+    "accommodation": "accommodation.id",
+    "location": "accommodation.location",
+}
+
+# Bookings are clipped to the window, then split into the months they span
+# with generate_series and clipped to each of them. Revenue is those nights at
+# the current price of the accommodation.
+LIVE_OCCUPANCY_SQL = """
+WITH clipped AS (
+    SELECT
+        {group} AS key,
+        GREATEST(booking.start_date, %(start_date)s) AS start_date,
+        LEAST(booking.end_date, %(end_date)s) AS end_date,
+        accommodation.price
+    FROM booking
+    JOIN accommodation ON accommodation.id = booking.accommodation_id
+    WHERE booking.start_date < %(end_date)s
+        AND booking.end_date > %(start_date)s
+        AND {conditions}
+),
+monthly AS (
+    SELECT
+        key,
+        month::date AS month,
+        LEAST(end_date, (month + interval '1 month')::date)
+            - GREATEST(start_date, month::date) AS nights,
+        price
+    FROM clipped
+    CROSS JOIN LATERAL generate_series(
+        date_trunc('month', start_date::timestamp),
+        (end_date - 1)::timestamp,
+        interval '1 month'
+    ) AS month
+)
+SELECT key, month, SUM(nights), SUM(nights * price)
+FROM monthly
+GROUP BY key, month
+"""
+
+ROLLUP_OCCUPANCY_SQL = """
+SELECT
+    {group} AS key,
+    occupancy_rollup.month,
+    SUM(occupancy_rollup.booked_nights),
+    SUM(occupancy_rollup.booked_nights * accommodation.price)
+FROM occupancy_rollup
+JOIN accommodation ON accommodation.id = occupancy_rollup.accommodation_id
+WHERE occupancy_rollup.month = ANY(%(months)s::date[]) AND {conditions}
+GROUP BY 1, 2
+"""
+
+DELETE_ROLLUP_SQL = """
+DELETE FROM occupancy_rollup
+WHERE %(rebuild)s OR accommodation_id = ANY(%(accommodation_ids)s)
+"""
+
+# Every booking is split into the months it spans with generate_series, and
+# clipped to each of them.
+INSERT_ROLLUP_SQL = """
+INSERT INTO occupancy_rollup (accommodation_id, month, booked_nights)
+SELECT
+    booking.accommodation_id,
+    month::date,
+    SUM(
+        LEAST(booking.end_date, (month + interval '1 month')::date)
+        - GREATEST(booking.start_date, month::date)
+    )
+FROM booking
+CROSS JOIN LATERAL generate_series(
+    date_trunc('month', booking.start_date::timestamp),
+    (booking.end_date - 1)::timestamp,
+    interval '1 month'
+) AS month
+WHERE %(rebuild)s OR booking.accommodation_id = ANY(%(accommodation_ids)s)
+GROUP BY 1, 2
+"""
+
+
+@dataclass(frozen=True)
+class Segment:
+    """Nights of the window in one calendar month"""
+
+    month: date
+    start_date: date
+    end_date: date
+
+    @property
+    def nights(self) -> int:
+        return (self.end_date - self.start_date).days
+
+    @property
+    def is_whole_month(self) -> bool:
+        return self.start_date == self.month and self.end_date == next_month(self.month)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def month_segments(start_date: date, end_date: date) -> list[Segment]:
+    """Split the nights of [start_date, end_date) at month boundaries"""
+    segments = []
+    month = start_date.replace(day=1)
+    while month < end_date:
+        following = next_month(month)
+        segments.append(
+            Segment(month, max(month, start_date), min(following, end_date))
+        )
+        month = following
+    return segments
+
+
+def contiguous(segments: list[Segment]) -> list[list[Segment]]:
+    """Group segments into runs of consecutive months"""
+    runs = []
+    for segment in segments:
+        if runs and runs[-1][-1].end_date == segment.start_date:
+            runs[-1].append(segment)
+        else:
+            runs.append([segment])
+    return runs
+
+
+def booked_nights(
+    segments: list[Segment],
+    group: str,
+    accommodation_ids: Iterable[int] | None = None,
+    location: str | None = None,
+    accommodation_type: str | None = None,
+) -> dict[tuple, tuple[int, Decimal]]:
+    """Booked nights and revenue of each group in each segment of a window.
+
+    Results are keyed by (group key, month), groups without bookings in a
+    month are left out. When `ANALYTICS_ROLLUP` is enabled, whole months are
+    read from the rollup table and only the partial months at the edges of
+    the window are computed from the bookings.
+    """
+    conditions, params = ["TRUE"], {}
+    if accommodation_ids is not None:
+        conditions.append("accommodation.id = ANY(%(accommodation_ids)s)")
+        params["accommodation_ids"] = list(accommodation_ids)
+    if location is not None:
+        conditions.append("UPPER(accommodation.location) = UPPER(%(location)s)")
+        params["location"] = location
+    if accommodation_type is not None:
+        conditions.append("accommodation.type = %(type)s")
+        params["type"] = accommodation_type
+    placeholders = {"group": GROUPS[group], "conditions": " AND ".join(conditions)}
+
+    rolled_up = []
+    if settings.ANALYTICS_ROLLUP:
+        rolled_up = [segment for segment in segments if segment.is_whole_month]
+    live = [segment for segment in segments if segment not in rolled_up]
+
+    rows = []
+    with connection.cursor() as cursor:
+        if rolled_up:
+            cursor.execute(
+                ROLLUP_OCCUPANCY_SQL.format(**placeholders),
+                {**params, "months": [segment.month for segment in rolled_up]},
+            )
+            rows += cursor.fetchall()
+        for run in contiguous(live):
+            cursor.execute(
+                LIVE_OCCUPANCY_SQL.format(**placeholders),
+                {
+                    **params,
+                    "start_date": run[0].start_date,
+                    "end_date": run[-1].end_date,
+                },
+            )
+            rows += cursor.fetchall()
+    return {(key, month): (nights, revenue) for key, month, nights, revenue in rows}
+
+
+def refresh_rollup(accommodation_ids: Iterable[int] | None = None):
+    """Recompute the rollup rows of the given accommodations, or all of them"""
+    params = {
+        "rebuild": accommodation_ids is None,
+        "accommodation_ids": list(accommodation_ids or []),
+    }
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(DELETE_ROLLUP_SQL, params)
+        cursor.execute(INSERT_ROLLUP_SQL, params)
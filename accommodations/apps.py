@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class AccommodationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'accommodations' 
\ No newline at end of file
+    name = 'accommodations'
+
+    def ready(self):
+        from . import signals  # noqa: F401
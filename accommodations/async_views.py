@@ -0,0 +1,118 @@
+from asgiref.sync import sync_to_async
+from dependency_injector.wiring import Provide, inject
+from rest_framework.exceptions import NotFound
+
+from accommodation_booking.application.protocols.availability_engine import (
+    AvailabilityEngine,
+)
+from accommodation_booking.async_views import AsyncAPIView
+from accommodation_booking.container import ApplicationContainer
+
+from .caching import (
+    ACCOMMODATIONS,
+    acached_data,
+    accommodation_version,
+    availability_version,
+)
+from .models import Accommodation
+from .views import (
+    AccommodationAvailabilityView,
+    AccommodationDetailView,
+    AccommodationListCreateView,
+)
+
+
+async def get_accommodation(pk: int, queryset=Accommodation.objects) -> Accommodation:
+    try:
+        return await queryset.aget(pk=pk)
+    except Accommodation.DoesNotExist:
+        raise NotFound
+
+
+class AsyncAccommodationListView(AsyncAPIView):
+    """Async reads of `AccommodationListCreateView`"""
+
+    sync_view = AccommodationListCreateView
+
+    async def get(self, request):
+        data, etag = await acached_data(
+            self.drf_request, [ACCOMMODATIONS], self.read_page
+        )
+        return self.respond(data, etag=etag)
+
+    async def read_page(self):
+        # The paginators count and slice synchronously, so the page is read
+        # through `sync_to_async` like the async queryset methods are
+        view = self.sync_view(
+            request=self.drf_request, args=(), kwargs={}, format_kwarg=None
+        )
+
+        def read():
+            rows, represent = view.read_rows(view.filter_queryset(view.get_queryset()))
+            page = view.paginate_queryset(rows)
+            return view.get_paginated_response(represent(page)).data
+
+        return await sync_to_async(read)()
+
+
+class AsyncAccommodationDetailView(AsyncAPIView):
+    """Async reads of `AccommodationDetailView`"""
+
+    sync_view = AccommodationDetailView
+
+    async def get(self, request, pk):
+        view = self.sync_view(
+            request=self.drf_request, args=(), kwargs={"pk": pk}, format_kwarg=None
+        )
+
+        async def build_data():
+            accommodation = await get_accommodation(
+                pk, view.project(Accommodation.objects.all())
+            )
+            return view.get_serializer(accommodation).data
+
+        data, etag = await acached_data(
+            self.drf_request, [accommodation_version(pk)], build_data
+        )
+        return self.respond(data, etag=etag)
+
+
+class AsyncAccommodationAvailabilityView(AsyncAPIView):
+    """Async `AccommodationAvailabilityView`"""
+
+    sync_view = AccommodationAvailabilityView
+
+    @inject
+    async def get(
+        self,
+        request,
+        pk,
+        availability_engine: AvailabilityEngine = Provide[
+            ApplicationContainer.availability_engine
+        ],
+    ):
+        async def build_data():
+            accommodation = await get_accommodation(pk)
+
+            request_serializer = self.sync_view.RequestSerializer(
+                data=self.drf_request.query_params
+            )
+            request_serializer.is_valid(raise_exception=True)
+
+            next_available_date = await sync_to_async(
+                availability_engine.next_available_date
+            )(accommodation, request_serializer.validated_data["date"])
+
+            return self.sync_view.AvailabilityResponse(
+                {
+                    "accommodation_id": accommodation.id,
+                    "next_available_date": next_available_date,
+                }
+            ).data
+
+        data, etag = await acached_data(
+            self.drf_request,
+            [accommodation_version(pk), availability_version(pk)],
+            build_data,
+        )
+        return self.respond(data, etag=etag)
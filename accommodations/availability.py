@@ -0,0 +1,103 @@
+from datetime import date
+from typing import Iterable
+
+from django.db import connection
+
+from .models import Accommodation
+
+# Bookings that end after the reference date are walked in start order per
+# accommodation. A booking opens a new chain when it starts after every
+# booking before it has already ended, so back-to-back bookings share a chain.
+# Only the first chain can contain the reference date; when it does, the
+# accommodation becomes free on the last end date of that chain.
+#
+# Hotels with a room inventory are full on its sold-out nights. Numbered in
+# night order from the reference date, the sold-out nights whose night is the
+# reference date plus their number form the run starting on it; the hotel has
+# a room again on the night after that run.
+NEXT_AVAILABLE_DATES_SQL = """
+WITH requested AS (
+    SELECT id, type
+    FROM accommodation
+    WHERE id = ANY(%(accommodation_ids)s)
+),
+upcoming AS (
+    SELECT
+        b.accommodation_id,
+        b.start_date,
+        b.end_date,
+        MAX(b.end_date) OVER (
+            PARTITION BY b.accommodation_id
+            ORDER BY b.start_date, b.end_date
+            ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+        ) AS reached_date
+    FROM booking b
+    JOIN requested r ON r.id = b.accommodation_id
+    WHERE r.type = %(apartment)s AND b.end_date > %(reference_date)s
+),
+chains AS (
+    SELECT
+        accommodation_id,
+        start_date,
+        end_date,
+        SUM(
+            CASE WHEN reached_date IS NULL OR start_date > reached_date THEN 1 ELSE 0 END
+        ) OVER (
+            PARTITION BY accommodation_id
+            ORDER BY start_date, end_date
+            ROWS UNBOUNDED PRECEDING
+        ) AS chain
+    FROM upcoming
+)
+SELECT r.id, COALESCE(blocked.end_date, full_hotel.end_date, %(reference_date)s)
+FROM requested r
+LEFT JOIN (
+    SELECT accommodation_id, MAX(end_date) AS end_date
+    FROM chains
+    GROUP BY accommodation_id, chain
+    HAVING MIN(start_date) <= %(reference_date)s
+) blocked ON blocked.accommodation_id = r.id
+LEFT JOIN (
+    SELECT accommodation_id, %(reference_date)s + COUNT(*)::integer AS end_date
+    FROM (
+        SELECT
+            i.accommodation_id,
+            i.night,
+            ROW_NUMBER() OVER (
+                PARTITION BY i.accommodation_id ORDER BY i.night
+            ) - 1 AS position
+        FROM room_inventory i
+        JOIN requested r ON r.id = i.accommodation_id
+        WHERE r.type = %(hotel)s
+            AND i.night >= %(reference_date)s
+            AND i.remaining = 0
+    ) sold_out
+    WHERE night = %(reference_date)s + position::integer
+    GROUP BY accommodation_id
+) full_hotel ON full_hotel.accommodation_id = r.id
+"""
+
+
+def next_available_dates(
+    accommodation_ids: Iterable[int],
+    reference_date: date,
+) -> dict[int, date]:
+    """Return the next available date for each existing accommodation.
+
+    Apartments are free on the reference date unless a booking covers it, in
+    which case the date is pushed to the end of the chain of back-to-back
+    bookings. Hotels with a room inventory are pushed past the consecutive
+    nights without a room left, other hotels are always available. Ids that do not
+    match an accommodation are left out of the result.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            NEXT_AVAILABLE_DATES_SQL,
+            {
+                "accommodation_ids": list(accommodation_ids),
+                "apartment": Accommodation.AccommodationType.APARTMENT.value,
+                "hotel": Accommodation.AccommodationType.HOTEL.value,
+                "reference_date": reference_date,
+            },
+        )
+        return dict(cursor.fetchall())
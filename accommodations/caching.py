@@ -0,0 +1,133 @@
+from hashlib import sha256
+from typing import Awaitable, Callable, Iterable
+
+from asgiref.sync import sync_to_async
+from dependency_injector.wiring import Provide, inject
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from accommodation_booking.application.protocols.response_cache import (
+    ResponseCache,
+)
+from accommodation_booking.container import ApplicationContainer
+from accommodation_booking.db.replicas import use_primary
+
+ACCOMMODATIONS = "accommodations"
+
+
+def accommodation_version(accommodation_id: int) -> str:
+    return f"accommodation:{accommodation_id}"
+
+
+def availability_version(accommodation_id: int) -> str:
+    return f"availability:{accommodation_id}"
+
+
+@inject
+def invalidate(
+    *names: str,
+    response_cache: ResponseCache = Provide[ApplicationContainer.response_cache],
+):
+    """Bump the given versions now and again once the transaction commits.
+
+    The first bump stops the cached responses from being served; the second
+    drops responses cached from the old rows while the transaction was open.
+    """
+
+    def bump():
+        for name in names:
+            response_cache.bump_version(name)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+@inject
+def response_key(
+    request,
+    versions: Iterable[str],
+    response_cache: ResponseCache = Provide[ApplicationContainer.response_cache],
+) -> tuple[str, str]:
+    """Cache key and strong ETag of a GET, given the versions its data follows.
+
+    Both derive from the request and the current tokens of `versions` only, so
+    revalidation needs no database query.
+    """
+    key = sha256(
+        "\n".join(
+            [
+                request.path,
+                request.accepted_renderer.format,
+                *(
+                    f"{name}={value}"
+                    for name, values in sorted(request.query_params.lists())
+                    for value in values
+                ),
+                *(response_cache.get_version(name) for name in versions),
+            ]
+        ).encode()
+    ).hexdigest()
+    return key, f'"{key[:32]}"'
+
+
+def is_current(request, etag: str) -> bool:
+    return etag in parse_etags(request.headers.get("If-None-Match", ""))
+
+
+@inject
+def cached_response(
+    request,
+    versions: Iterable[str],
+    build_response: Callable[[], Response],
+    response_cache: ResponseCache = Provide[ApplicationContainer.response_cache],
+) -> Response:
+    """Serve a GET from the response cache, or 304 when the client is current.
+
+    Only successful responses are cached. They are built from the primary: a
+    replica behind the version bump would get its old rows cached as current.
+    """
+    key, etag = response_key(request, versions)
+
+    if is_current(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        data = response_cache.get(key)
+        if data is None:
+            with use_primary():
+                response = build_response()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            response_cache.set(key, response.data)
+        else:
+            response = Response(data)
+
+    response["ETag"] = etag
+    return response
+
+
+@inject
+async def acached_data(
+    request,
+    versions: Iterable[str],
+    build_data: Callable[[], Awaitable],
+    response_cache: ResponseCache = Provide[ApplicationContainer.response_cache],
+) -> tuple:
+    """Async `cached_response` for `AsyncAPIView`s: the data and its ETag.
+
+    The data is None when the client is current. `build_data` reports errors
+    by raising, so they are never cached. The data is built from the primary.
+    The cache is called through `sync_to_async`, as the Django cache may be a
+    database table.
+    """
+    key, etag = await sync_to_async(response_key)(request, versions)
+    if is_current(request, etag):
+        return None, etag
+
+    data = await sync_to_async(response_cache.get)(key)
+    if data is None:
+        with use_primary():
+            data = await build_data()
+        await sync_to_async(response_cache.set)(key, data)
+    return data, etag
@@ -0,0 +1,84 @@
+from base64 import b64encode
+from datetime import date
+from typing import Iterable
+
+import numpy as np
+from django.db.models import DateField, ExpressionWrapper, F
+
+from bookings.models import Booking, RoomInventory
+
+from .models import Accommodation
+
+
+def busy_nights(
+    accommodation_ids: Iterable[int],
+    start_date: date,
+    end_date: date,
+) -> dict[int, np.ndarray]:
+    """Paint the booked nights in [start_date, end_date) of each accommodation.
+
+    Returns one boolean array per accommodation where index `i` is the night of
+    `start_date + i`. Every booking adds +1 on its first night and -1 after its
+    last one, so a cumulative sum over the nights counts the bookings covering
+    each night. Hotels are busy on the nights their room inventory is sold
+    out, read in the same query as one-night bookings; hotels without a room
+    count never are.
+    """
+    accommodation_ids = list(accommodation_ids)
+    nights = (end_date - start_date).days
+    rows = {id: row for row, id in enumerate(accommodation_ids)}
+
+    sold_out = (
+        RoomInventory.objects.filter(
+            accommodation_id__in=accommodation_ids,
+            night__gte=start_date,
+            night__lt=end_date,
+            remaining=0,
+        )
+        .annotate(next_night=ExpressionWrapper(F("night") + 1, DateField()))
+        .order_by()
+        .values_list("accommodation_id", "night", "next_night")
+    )
+    bookings = list(
+        Booking.objects.filter(
+            accommodation_id__in=accommodation_ids,
+            accommodation_type=Accommodation.AccommodationType.APARTMENT,
+            start_date__lt=end_date,
+            end_date__gt=start_date,
+        )
+        .order_by()
+        .values_list("accommodation_id", "start_date", "end_date")
+        .union(sold_out, all=True)
+    )
+
+    deltas = np.zeros((len(accommodation_ids), nights + 1), dtype=np.int32)
+    if bookings:
+        ids, starts, ends = zip(*bookings)
+        booking_rows = np.array([rows[id] for id in ids])
+        origin = np.datetime64(start_date, "D")
+        first_nights = np.array(starts, dtype="datetime64[D]") - origin
+        last_nights = np.array(ends, dtype="datetime64[D]") - origin
+        np.add.at(
+            deltas, (booking_rows, np.clip(first_nights.astype(int), 0, nights)), 1
+        )
+        np.add.at(
+            deltas, (booking_rows, np.clip(last_nights.astype(int), 0, nights)), -1
+        )
+
+    busy = np.cumsum(deltas[:, :-1], axis=1) > 0
+    return {id: busy[row] for id, row in rows.items()}
+
+
+def encode_bitmap(busy: np.ndarray) -> str:
+    """Base64 of one bit per night, most significant bit first, 1 meaning busy"""
+    return b64encode(np.packbits(busy).tobytes()).decode()
+
+
+def encode_runs(busy: np.ndarray) -> list[int]:
+    """Lengths of alternating free and busy runs, starting with a free run"""
+    boundaries = np.flatnonzero(np.diff(busy)) + 1
+    edges = np.concatenate(([0], boundaries, [len(busy)]))
+    runs = np.diff(edges).tolist()
+    if len(busy) and busy[0]:
+        runs.insert(0, 0)
+    return runs
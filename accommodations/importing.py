@@ -0,0 +1,144 @@
+import codecs
+import csv
+from dataclasses import dataclass, field
+from io import StringIO
+from typing import IO, Iterable, Iterator
+
+import orjson
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from .caching import ACCOMMODATIONS, invalidate
+from .serializers import AccommodationSerializer
+
+BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 1000
+# Media type and file extensions of each input format
+FORMATS = {
+    "csv": ("text/csv", (".csv",)),
+    "ndjson": ("application/x-ndjson", (".ndjson", ".jsonl")),
+}
+
+COLUMNS = ["name", "description", "price", "location", "type", "rooms"]
+COPY_SQL = """
+COPY accommodation (name, description, price, location, type, rooms, bookings_version)
+FROM STDIN WITH (FORMAT csv)
+"""
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    rejected: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def reject(self, row: int, errors):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+
+def detect_format(name: str = "", content_type: str = "") -> str | None:
+    """Format of an upload from its content type, or else its file extension"""
+    media_type = content_type.split(";")[0].strip()
+    for file_format, (format_media_type, _) in FORMATS.items():
+        if media_type == format_media_type:
+            return file_format
+    for file_format, (_, extensions) in FORMATS.items():
+        if name.lower().endswith(extensions):
+            return file_format
+    return None
+
+
+class UnreadableFile(ValueError):
+    """A file that cannot be read as rows: not UTF-8, or not CSV"""
+
+
+def read_rows(file: IO[bytes], file_format: str) -> Iterator:
+    """Rows of a binary CSV or NDJSON file, read line by line.
+
+    CSV rows are dicts keyed by the header row, without empty `rooms` cells.
+    A CSV file that is not UTF-8 or is malformed raises `UnreadableFile` when
+    the reading gets there. NDJSON lines that are not valid UTF-8 JSON come
+    out as `ValidationError`s, blank lines are skipped.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(codecs.iterdecode(file, "utf-8-sig"))
+        try:
+            for row in reader:
+                # An empty rooms cell is a hotel without a room count
+                if row.get("rooms") == "":
+                    del row["rooms"]
+                yield row
+        except UnicodeDecodeError:
+            raise UnreadableFile(
+                f"Line {reader.line_num + 1} is not valid UTF-8."
+            ) from None
+        except csv.Error as ex:
+            raise UnreadableFile(f"Line {reader.line_num}: {ex}.") from None
+        return
+
+    for index, line in enumerate(file):
+        if index == 0:
+            line = line.removeprefix(codecs.BOM_UTF8)
+        if not line.strip():
+            continue
+        try:
+            yield orjson.loads(line)
+        except orjson.JSONDecodeError as ex:
+            yield serializers.ValidationError(
+                {"non_field_errors": [f"Invalid JSON: {ex}"]}
+            )
+
+
+def quote(value) -> str:
+    """Field of COPY's CSV format: strings quoted, None as NULL"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+def copy_rows(cursor, rows: list[dict]):
+    buffer = StringIO()
+    for row in rows:
+        buffer.write(",".join([*(quote(row.get(column)) for column in COLUMNS), "0"]))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor.copy_expert(COPY_SQL, buffer)
+
+
+def import_accommodations(rows: Iterable, batch_size: int = BATCH_SIZE) -> ImportResult:
+    """Validate rows like `AccommodationSerializer` and `COPY` the valid ones.
+
+    Rows are loaded `batch_size` at a time in one transaction, so memory is
+    bounded by a batch and the first `MAX_REPORTED_ERRORS` rejected rows
+    whatever the size of the input. Rows are numbered from 1, header excluded.
+    """
+    result = ImportResult()
+    serializer = AccommodationSerializer()
+    batch = []
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for index, row in enumerate(rows, start=1):
+            try:
+                if isinstance(row, serializers.ValidationError):
+                    raise row
+                batch.append(serializer.run_validation(row))
+            except serializers.ValidationError as ex:
+                result.reject(index, ex.detail)
+
+            if len(batch) == batch_size:
+                copy_rows(cursor, batch)
+                result.created += len(batch)
+                batch = []
+
+        if batch:
+            copy_rows(cursor, batch)
+            result.created += len(batch)
+
+        if result.created:
+            invalidate(ACCOMMODATIONS)
+
+    return result
@@ -0,0 +1,63 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accommodations.importing import (
+    BATCH_SIZE,
+    FORMATS,
+    UnreadableFile,
+    detect_format,
+    import_accommodations,
+    read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import accommodations from a CSV or NDJSON file, validated like the API "
+        "and loaded with COPY"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for standard input")
+        parser.add_argument(
+            "--format",
+            choices=list(FORMATS),
+            help="Input format, by default from the file extension",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, path, format, batch_size, **options):
+        file_format = format or detect_format(name=path)
+        if file_format is None:
+            raise CommandError("Cannot tell the format from the path, use --format")
+
+        try:
+            if path == "-":
+                result = import_accommodations(
+                    read_rows(sys.stdin.buffer, file_format), batch_size
+                )
+            else:
+                with open(path, "rb") as file:
+                    result = import_accommodations(
+                        read_rows(file, file_format), batch_size
+                    )
+        except (OSError, UnreadableFile) as ex:
+            raise CommandError(ex)
+
+        for error in result.errors:
+            messages = "; ".join(
+                f"{name}: {' '.join(map(str, field_errors))}"
+                for name, field_errors in error["errors"].items()
+            )
+            self.stderr.write(f"Row {error['row']}: {messages}")
+        if result.rejected > len(result.errors):
+            self.stderr.write(
+                f"... {result.rejected - len(result.errors)} more rejected rows"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} accommodations, "
+                f"rejected {result.rejected} rows"
+            )
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from accommodations.analytics import refresh_rollup
+from bookings.models import OccupancyRollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the occupancy rollup table from every booking, to be run when "
+        "enabling ANALYTICS_ROLLUP"
+    )
+
+    def handle(self, *args, **options):
+        refresh_rollup()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rolled up {OccupancyRollup.objects.count()} accommodation months"
+            )
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 06:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accommodations", "0003_alter_accommodation_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accommodation",
+            name="bookings_version",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
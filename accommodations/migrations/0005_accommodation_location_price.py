@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-18 06:51
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accommodations", "0004_accommodation_bookings_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="accommodation",
+            index=models.Index(
+                django.db.models.functions.text.Upper("location"),
+                models.F("price"),
+                name="accommodation_location_price",
+            ),
+        ),
+    ]
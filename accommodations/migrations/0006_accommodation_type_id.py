@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-10-18 06:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accommodations", "0005_accommodation_location_price"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="accommodation",
+            index=models.Index(fields=["type", "id"], name="accommodation_type_id"),
+        ),
+    ]
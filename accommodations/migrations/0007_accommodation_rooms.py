@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-18 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accommodations", "0006_accommodation_type_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accommodation",
+            name="rooms",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Rooms of a hotel; hotels without a count are never full",
+                null=True,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="accommodation",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    ("rooms__isnull", True),
+                    models.Q(("rooms__gte", 1), ("type", "hotel")),
+                    _connector="OR",
+                ),
+                name="accommodation_rooms_hotels_only",
+            ),
+        ),
+    ]
@@ -1,4 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models.functions import Upper
+
+from accommodation_booking.text_search import SEARCH_CONFIG, trigram_index
 
 
 class Accommodation(models.Model):
@@ -13,10 +18,59 @@ class Accommodation(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     location = models.CharField(max_length=255)
     type = models.CharField(max_length=20, choices=AccommodationType)
+    rooms = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Rooms of a hotel; hotels without a count are never full",
+    )
+    bookings_version = models.PositiveBigIntegerField(default=0, editable=False)
+    # Name, location and description words, weighted in that order for ranking
+    search_vector = models.GeneratedField(
+        expression=SearchVector("name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("location", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="C", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    _loaded_rooms: tuple | None = None
 
     class Meta:
         db_table = "accommodation"
         ordering = ["id"]
+        indexes = [
+            models.Index(fields=["type", "id"], name="accommodation_type_id"),
+            models.Index(
+                Upper("location"),
+                "price",
+                name="accommodation_location_price",
+            ),
+            GinIndex(fields=["search_vector"], name="accommodation_search_vector"),
+            trigram_index("name", "accommodation_name_trgm"),
+            trigram_index("location", "accommodation_location_trgm"),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(rooms__isnull=True)
+                | models.Q(type="hotel", rooms__gte=1),
+                name="accommodation_rooms_hotels_only",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so a change of rooms or type rebuilds the room inventory
+        instance._loaded_rooms = (
+            instance.__dict__.get("type"),
+            instance.__dict__.get("rooms"),
+        )
+        return instance
+
+    @property
+    def has_room_inventory(self) -> bool:
+        """Whether bookings take rooms from the per-night room inventory"""
+        return self.type == self.AccommodationType.HOTEL and self.rooms is not None
 
     def __str__(self):
         return self.name
@@ -0,0 +1,46 @@
+from django.contrib.postgres.search import SearchRank, TrigramWordSimilarity
+from django.db.models import F, FloatField, Q, QuerySet
+from django.db.models.functions import Cast
+
+from accommodation_booking.text_search import matches_text, text_query
+
+
+def text_filter(text: str) -> Q:
+    """Accommodations whose name, location or description has the words of
+    `text`, or whose name or location contains it or a word similar to it.
+
+    Every branch is answered from an index: the GIN index of `search_vector`
+    and the trigram indexes of the name and location.
+    """
+    return (
+        Q(search_vector=text_query(text))
+        | matches_text("name", text)
+        | matches_text("location", text)
+    )
+
+
+def text_rank(text: str):
+    """Relevance of an accommodation to `text`.
+
+    Full-text matches rank by their `search_vector` weights (name, then
+    location, then description). The trigram similarity of the name, and half
+    that of the location, are added so partial and misspelled words rank too.
+    Cast to double precision so the rank read back compares equal to the one
+    computed in SQL.
+    """
+    return Cast(
+        SearchRank(F("search_vector"), text_query(text))
+        + TrigramWordSimilarity(text, "name")
+        + TrigramWordSimilarity(text, "location") / 2,
+        FloatField(),
+    )
+
+
+def search_accommodations(queryset: QuerySet, text: str) -> QuerySet:
+    """Accommodations matching `text`, the most relevant first, with their
+    `rank`"""
+    return (
+        queryset.filter(text_filter(text))
+        .annotate(rank=text_rank(text))
+        .order_by("-rank", "id")
+    )
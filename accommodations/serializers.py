@@ -1,4 +1,10 @@
+from django.db import IntegrityError, transaction
+from django.db.models import TextField
+from django.db.models.functions import Cast
 from rest_framework import serializers
+
+from bookings.models import is_overlap_violation, is_rooms_left_violation
+
 from .models import Accommodation
 
 
@@ -7,8 +13,21 @@ class AccommodationSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Accommodation
-        fields = ['id', 'name', 'description', 'price', 'location', 'type']
+        fields = ['id', 'name', 'description', 'price', 'location', 'type', 'rooms']
         read_only_fields = ['id']
+        extra_kwargs = {'rooms': {'min_value': 1}}
+
+    # Output fields as columns, for list endpoints reading `values()`
+    read_columns = {
+        'id': 'id',
+        'name': 'name',
+        'description': 'description',
+        # numeric(10, 2) as text matches the quantized string of the field
+        'price': Cast('price', TextField()),
+        'location': 'location',
+        'type': 'type',
+        'rooms': 'rooms',
+    }
 
     def validate_name(self, value):
         if len(value) < 3:
@@ -23,4 +42,31 @@ class AccommodationSerializer(serializers.ModelSerializer):
     def validate_location(self, value):
         if len(value) < 2:
             raise serializers.ValidationError("Location must be at least 2 characters")
-        return value 
+        return value
+
+    def validate(self, data):
+        accommodation_type = data.get("type", getattr(self.instance, "type", None))
+        rooms = data.get("rooms", getattr(self.instance, "rooms", None))
+        if rooms is not None and accommodation_type != Accommodation.AccommodationType.HOTEL:
+            raise serializers.ValidationError({"rooms": ["Only hotels have rooms"]})
+        return data
+
+    def update(self, instance, validated_data):
+        """Update accommodation, recounting the rooms left of a hotel if needed.
+
+        Its bookings take its new type, so a hotel with overlapping bookings
+        cannot become an apartment.
+        """
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError as ex:
+            if is_rooms_left_violation(ex):
+                raise serializers.ValidationError(
+                    {"rooms": ["Fewer rooms than bookings on some nights"]}
+                )
+            if is_overlap_violation(ex):
+                raise serializers.ValidationError(
+                    {"type": ["Overlapping bookings prevent changing to apartment"]}
+                )
+            raise
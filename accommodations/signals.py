@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import ACCOMMODATIONS, accommodation_version, invalidate
+from .models import Accommodation
+
+
+@receiver(post_save, sender=Accommodation)
+@receiver(post_delete, sender=Accommodation)
+def accommodation_changed(sender, instance: Accommodation, **kwargs):
+    invalidate(ACCOMMODATIONS, accommodation_version(instance.id))
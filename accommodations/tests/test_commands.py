@@ -0,0 +1,74 @@
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from accommodations.models import Accommodation
+from bookings.models import Booking, OccupancyRollup
+
+
+class ImportAccommodationsCommandTests(TestCase):
+    def setUp(self):
+        self._tempdir = TemporaryDirectory()
+        self._path = Path(self._tempdir.name) / "accommodations.csv"
+        self._path.write_text(
+            "name,description,price,location,type\n"
+            + "".join(f"Flat {index},,{index},Lisbon,apartment\n" for index in range(7))
+        )
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    @patch("accommodations.importing.MAX_REPORTED_ERRORS", 0)
+    def test_imports_in_batches_and_summarises_errors(self):
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command(
+            "import_accommodations",
+            str(self._path),
+            batch_size=2,
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        self.assertEqual(Accommodation.objects.filter(location="Lisbon").count(), 6)
+        self.assertIn("Created 6 accommodations, rejected 1 rows", stdout.getvalue())
+        self.assertIn("1 more rejected rows", stderr.getvalue())
+
+    def test_requires_known_format(self):
+        with self.assertRaises(CommandError):
+            call_command("import_accommodations", "accommodations.txt")
+
+
+class RefreshOccupancyRollupCommandTests(TestCase):
+    def test_rolls_up_bookings_per_month(self):
+        accommodation = Accommodation.objects.create(
+            name="Flat",
+            description="",
+            price="80.0",
+            location="Lisbon",
+            type="apartment",
+        )
+        Booking.objects.create(
+            accommodation=accommodation,
+            start_date="2025-01-30",
+            end_date="2025-02-02",
+            guest_name="Guest",
+        )
+        stdout = StringIO()
+
+        call_command("refresh_occupancy_rollup", stdout=stdout)
+
+        self.assertEqual(
+            list(
+                OccupancyRollup.objects.values_list("month", "booked_nights").order_by(
+                    "month"
+                )
+            ),
+            [(date(2025, 1, 1), 2), (date(2025, 2, 1), 1)],
+        )
+        self.assertIn("Rolled up 2 accommodation months", stdout.getvalue())
@@ -0,0 +1,182 @@
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accommodation_booking.infrastructure.django.response_cache import (
+    DjangoResponseCache,
+)
+from accommodation_booking.infrastructure.local.response_cache import (
+    LocalResponseCache,
+)
+from accommodations.models import Accommodation
+from bookings.models import Booking
+
+
+class ResponseCacheEndpointTests(APITestCase):
+    def setUp(self):
+        self._apartment = Accommodation.objects.create(
+            name="Apartment",
+            description="",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+        Booking.objects.create(
+            accommodation=self._apartment,
+            start_date="2025-01-01",
+            end_date="2025-01-08",
+            guest_name="Guest",
+        )
+
+    def test_repeated_reads_are_served_from_cache(self):
+        cases = [
+            (reverse("accommodation-list-create"), {"type": "apartment"}),
+            (reverse("accommodation-detail", args=[self._apartment.id]), {}),
+            (
+                reverse("accommodation-availability", args=[self._apartment.id]),
+                {"date": "2025-01-02"},
+            ),
+        ]
+        for url, params in cases:
+            response = self.client.get(url, data=params)
+            self.assertEqual(response.status_code, 200)
+
+            with self.assertNumQueries(0):
+                cached = self.client.get(url, data=params)
+            self.assertEqual(cached.content, response.content)
+            self.assertEqual(cached["ETag"], response["ETag"])
+
+            with self.assertNumQueries(0):
+                revalidated = self.client.get(
+                    url, data=params, HTTP_IF_NONE_MATCH=response["ETag"]
+                )
+            self.assertEqual(revalidated.status_code, 304)
+            self.assertEqual(revalidated.content, b"")
+
+    def test_accommodation_write_invalidates_its_responses(self):
+        list_url = reverse("accommodation-list-create")
+        detail_url = reverse("accommodation-detail", args=[self._apartment.id])
+        listed = self.client.get(list_url)
+        detailed = self.client.get(detail_url)
+
+        self.client.patch(detail_url, {"name": "Renamed"}, format="json")
+
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=detailed["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["name"], "Renamed")
+        self.assertNotEqual(response["ETag"], detailed["ETag"])
+
+        response = self.client.get(list_url, HTTP_IF_NONE_MATCH=listed["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["name"], "Renamed")
+
+    def test_booking_write_invalidates_availability_only(self):
+        availability_url = reverse(
+            "accommodation-availability", args=[self._apartment.id]
+        )
+        detail_url = reverse("accommodation-detail", args=[self._apartment.id])
+        available = self.client.get(availability_url, data={"date": "2025-01-02"})
+        detailed = self.client.get(detail_url)
+        self.assertEqual(available.data["next_available_date"], "2025-01-08")
+
+        self.client.post(
+            reverse("booking-list-create"),
+            {
+                "accommodation_id": self._apartment.id,
+                "start_date": "2025-01-08",
+                "end_date": "2025-01-10",
+                "guest_name": "Guest",
+            },
+            format="json",
+        )
+
+        response = self.client.get(
+            availability_url,
+            data={"date": "2025-01-02"},
+            HTTP_IF_NONE_MATCH=available["ETag"],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["next_available_date"], "2025-01-10")
+
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=detailed["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_errors_are_not_cached(self):
+        url = reverse("accommodation-availability", args=[self._apartment.id])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("ETag", response)
+
+        response = self.client.get(url, data={"date": "2025-01-02"})
+        self.assertEqual(response.status_code, 200)
+
+
+class ResponseCacheBackendTests(SimpleTestCase):
+    def test_versions_are_stable_until_bumped(self):
+        for response_cache in [LocalResponseCache(), DjangoResponseCache()]:
+            version = response_cache.get_version("accommodations")
+            self.assertEqual(response_cache.get_version("accommodations"), version)
+
+            response_cache.bump_version("accommodations")
+            self.assertNotEqual(response_cache.get_version("accommodations"), version)
+
+    def test_entries_round_trip(self):
+        for response_cache in [LocalResponseCache(), DjangoResponseCache()]:
+            self.assertIsNone(response_cache.get("key"))
+            response_cache.set("key", {"id": 1})
+            self.assertEqual(response_cache.get("key"), {"id": 1})
+
+    def test_local_cache_expires_entries_and_versions(self):
+        response_cache = LocalResponseCache(timeout=5)
+        with patch(
+            "accommodation_booking.infrastructure.local.response_cache.monotonic",
+            return_value=100,
+        ) as monotonic:
+            version = response_cache.get_version("accommodations")
+            response_cache.set("key", {"id": 1})
+
+            monotonic.return_value = 104.9
+            self.assertEqual(response_cache.get_version("accommodations"), version)
+            self.assertEqual(response_cache.get("key"), {"id": 1})
+
+            monotonic.return_value = 105
+            self.assertNotEqual(response_cache.get_version("accommodations"), version)
+            self.assertIsNone(response_cache.get("key"))
+
+    def test_local_cache_evicts_least_recently_used(self):
+        response_cache = LocalResponseCache(max_entries=2)
+        response_cache.set("first", 1)
+        response_cache.set("second", 2)
+        response_cache.get("first")
+        response_cache.set("third", 3)
+
+        self.assertEqual(response_cache.get("first"), 1)
+        self.assertIsNone(response_cache.get("second"))
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+        }
+    }
+)
+class DatabaseResponseCacheTests(TestCase):
+    def test_entries_and_versions_are_kept_in_the_cache_table(self):
+        call_command("createcachetable", verbosity=0)
+        response_cache = DjangoResponseCache()
+
+        version = response_cache.get_version("accommodations")
+        response_cache.set("key", {"id": 1})
+
+        self.assertEqual(response_cache.get_version("accommodations"), version)
+        self.assertEqual(response_cache.get("key"), {"id": 1})
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM django_cache")
+            self.assertEqual(cursor.fetchone(), (2,))
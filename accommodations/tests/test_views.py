@@ -1,6 +1,8 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from rest_framework.test import APITestCase
 
+from accommodations.analytics import refresh_rollup
 from accommodations.models import Accommodation
 from bookings.models import Booking
 
@@ -62,6 +64,50 @@ class AccommodationEndpointTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.data["count"], 2)
 
+    def test_text_search_ranks_matches(self):
+        Accommodation.objects.create(
+            name="Seaside Villa",
+            description="Quiet rooms with pools and a garden",
+            price="300.0",
+            location="Lisbon",
+            type="apartment",
+        )
+        Accommodation.objects.create(
+            name="Lisbon Central",
+            description="",
+            price="150.0",
+            location="Porto",
+            type="hotel",
+        )
+        url = reverse("accommodation-list-create")
+
+        def names(**query):
+            response = self.client.get(url, data=query)
+            self.assertEqual(response.status_code, 200)
+            return [item["name"] for item in response.data["results"]]
+
+        # Name matches outrank location ones; misspellings still match
+        self.assertEqual(names(q="lisbon"), ["Lisbon Central", "Seaside Villa"])
+        self.assertEqual(names(q="Lisbn"), ["Lisbon Central", "Seaside Villa"])
+        self.assertEqual(names(q="lisbon", type="apartment"), ["Seaside Villa"])
+        # Description words are stemmed, names matched by part
+        self.assertEqual(names(q="pool garden"), ["Seaside Villa"])
+        self.assertEqual(names(q="aside"), ["Seaside Villa"])
+        self.assertEqual(names(q="nowhere"), [])
+
+        # Cursor pages keep the rank order, with or without the id in the output
+        for fields in ["", "name"]:
+            names, next_url = [], url
+            query = {"q": "lisbon", "pagination": "cursor", "page_size": 1}
+            if fields:
+                query["fields"] = fields
+            while next_url:
+                response = self.client.get(next_url, data=query)
+                self.assertEqual(response.status_code, 200)
+                names += [item["name"] for item in response.data["results"]]
+                next_url, query = response.data["next"], None
+            self.assertEqual(names, ["Lisbon Central", "Seaside Villa"])
+
     def test_create_requires_type(self):
         url = reverse("accommodation-list-create")
         payload = {
@@ -100,3 +146,563 @@ class AccommodationEndpointTests(APITestCase):
             response = self.client.get(url, data={"date": reference_date})
             self.assertEqual(response.status_code, 200)
             self.assertEqual(response.data.get("next_available_date"), expected_date)
+
+    def test_availability_follows_back_to_back_bookings(self):
+        url = reverse("accommodation-availability", args=[self._apartment.id])
+        response = self.client.get(url, data={"date": "2025-01-08"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data.get("next_available_date"), "2025-01-10")
+
+    def test_batch_availability(self):
+        url = reverse("accommodation-batch-availability")
+        payload = {
+            "ids": [self._hotel.id, self._apartment.id],
+            "date": "2025-01-03",
+        }
+
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "accommodation_id": self._hotel.id,
+                    "next_available_date": "2025-01-03",
+                },
+                {
+                    "accommodation_id": self._apartment.id,
+                    "next_available_date": "2025-01-10",
+                },
+            ],
+        )
+
+    def test_batch_availability_matches_single_availability(self):
+        batch_url = reverse("accommodation-batch-availability")
+        for reference_date in [
+            "2024-12-31",
+            "2025-01-01",
+            "2025-01-09",
+            "2025-01-10",
+            "2025-01-11",
+            "2025-01-12",
+            "2025-01-15",
+        ]:
+            url = reverse("accommodation-availability", args=[self._apartment.id])
+            single = self.client.get(url, data={"date": reference_date})
+            batch = self.client.post(
+                batch_url,
+                {"ids": [self._apartment.id], "date": reference_date},
+                format="json",
+            )
+            self.assertEqual(
+                batch.data[0]["next_available_date"],  # type: ignore
+                single.data.get("next_available_date"),  # type: ignore
+            )
+
+    def test_batch_availability_uses_one_query(self):
+        url = reverse("accommodation-batch-availability")
+        payload = {"ids": [self._hotel.id, self._apartment.id], "date": "2025-01-03"}
+
+        with self.assertNumQueries(1):
+            self.client.post(url, payload, format="json")
+
+    def test_batch_availability_rejects_unknown_ids(self):
+        url = reverse("accommodation-batch-availability")
+        payload = {"ids": [self._apartment.id, 999999], "date": "2025-01-03"}
+
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ids", response.data)  # type: ignore
+
+    def test_calendar(self):
+        url = reverse("accommodation-calendar", args=[self._apartment.id])
+
+        response = self.client.get(
+            url, data={"from": "2025-01-01", "to": "2025-01-17", "encoding": "rle"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            {
+                "accommodation_id": self._apartment.id,
+                "from": "2025-01-01",
+                "to": "2025-01-17",
+                "nights": 16,
+                "encoding": "rle",
+                "busy": [0, 9, 2, 3, 2],
+            },
+        )
+
+        response = self.client.get(url, data={"from": "2025-01-01", "to": "2025-01-17"})
+        self.assertEqual(response.data["encoding"], "bitmap")  # type: ignore
+        self.assertEqual(response.data["busy"], "/5w=")  # type: ignore
+
+    def test_calendar_clips_bookings_to_window(self):
+        url = reverse("accommodation-calendar", args=[self._apartment.id])
+        response = self.client.get(
+            url, data={"from": "2025-01-05", "to": "2025-01-13", "encoding": "rle"}
+        )
+        self.assertEqual(response.data["busy"], [0, 5, 2, 1])  # type: ignore
+
+    def test_calendar_rejects_invalid_window(self):
+        url = reverse("accommodation-calendar", args=[self._apartment.id])
+        for window in [
+            {"from": "2025-01-05", "to": "2025-01-05"},
+            {"from": "2025-01-01", "to": "2030-01-01"},
+            {"to": "2025-01-05"},
+        ]:
+            response = self.client.get(url, data=window)
+            self.assertEqual(response.status_code, 400)
+
+    def test_batch_calendar(self):
+        url = reverse("accommodation-batch-calendar")
+        query = {
+            "ids": [self._apartment.id, self._hotel.id],
+            "from": "2025-01-01",
+            "to": "2025-01-17",
+            "encoding": "rle",
+        }
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url, data=query)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(c["accommodation_id"], c["busy"]) for c in response.data],  # type: ignore
+            [(self._apartment.id, [0, 9, 2, 3, 2]), (self._hotel.id, [16])],
+        )
+
+        response = self.client.get(url, data={**query, "ids": [self._hotel.id, 999999]})
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_excludes_booked_apartments(self):
+        url = reverse("accommodation-search")
+
+        response = self.client.get(
+            url, data={"start_date": "2025-01-10", "end_date": "2025-01-12"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [a["id"] for a in response.data["results"]],  # type: ignore
+            [self._apartment.id, self._hotel.id],
+        )
+
+        response = self.client.get(
+            url, data={"start_date": "2025-01-09", "end_date": "2025-01-11"}
+        )
+        self.assertEqual(
+            [a["id"] for a in response.data["results"]],  # type: ignore
+            [self._hotel.id],
+        )
+
+    def test_search_filters(self):
+        url = reverse("accommodation-search")
+        stay = {"start_date": "2025-02-01", "end_date": "2025-02-03"}
+
+        cases = [
+            ({"location": "city"}, [self._apartment.id, self._hotel.id]),
+            ({"location": "Elsewhere"}, []),
+            ({"type": "apartment"}, [self._apartment.id]),
+            ({"max_price": "150"}, [self._hotel.id]),
+            ({"min_price": "150"}, [self._apartment.id]),
+        ]
+        for filters, expected_ids in cases:
+            response = self.client.get(url, data={**stay, **filters})
+            self.assertEqual(
+                [a["id"] for a in response.data["results"]],  # type: ignore
+                expected_ids,
+            )
+
+    def test_search_paginates_with_cursor(self):
+        url = reverse("accommodation-search")
+        response = self.client.get(
+            url,
+            data={"start_date": "2025-02-01", "end_date": "2025-02-03", "page_size": 1},
+        )
+        self.assertEqual(
+            [a["id"] for a in response.data["results"]], [self._apartment.id]  # type: ignore
+        )
+        self.assertNotIn("count", response.data)  # type: ignore
+
+        response = self.client.get(response.data["next"])  # type: ignore
+        self.assertEqual(
+            [a["id"] for a in response.data["results"]], [self._hotel.id]  # type: ignore
+        )
+        self.assertIsNone(response.data["next"])  # type: ignore
+
+    def test_search_requires_valid_stay(self):
+        url = reverse("accommodation-search")
+        for query in [
+            {"start_date": "2025-02-03", "end_date": "2025-02-01"},
+            {"start_date": "2025-02-03"},
+        ]:
+            response = self.client.get(url, data=query)
+            self.assertEqual(response.status_code, 400)
+
+    def _small_hotel(self):
+        hotel = Accommodation.objects.create(
+            name="Acc 3",
+            description="",
+            price="100.0",
+            location="City",
+            type="hotel",
+            rooms=1,
+        )
+        for start_date, end_date in [
+            ("2025-01-01", "2025-01-03"),
+            ("2025-01-03", "2025-01-04"),
+        ]:
+            Booking.objects.create(
+                accommodation=hotel,
+                start_date=start_date,
+                end_date=end_date,
+                guest_name="Guest 5",
+            )
+        return hotel
+
+    def test_sold_out_hotel_nights(self):
+        hotel = self._small_hotel()
+
+        url = reverse("accommodation-availability", args=[hotel.id])
+        response = self.client.get(url, data={"date": "2025-01-02"})
+        self.assertEqual(response.data.get("next_available_date"), "2025-01-04")
+
+        response = self.client.post(
+            reverse("accommodation-batch-availability"),
+            {"ids": [hotel.id, self._hotel.id], "date": "2025-01-01"},
+            format="json",
+        )
+        self.assertEqual(
+            [a["next_available_date"] for a in response.data],  # type: ignore
+            ["2025-01-04", "2025-01-01"],
+        )
+
+        url = reverse("accommodation-calendar", args=[hotel.id])
+        response = self.client.get(
+            url, data={"from": "2024-12-31", "to": "2025-01-06", "encoding": "rle"}
+        )
+        self.assertEqual(response.data["busy"], [1, 3, 2])  # type: ignore
+
+        url = reverse("accommodation-search")
+        for stay, expected_ids in [
+            ({"start_date": "2025-01-03", "end_date": "2025-01-05"}, [self._hotel.id]),
+            (
+                {"start_date": "2025-01-04", "end_date": "2025-01-05"},
+                [self._hotel.id, hotel.id],
+            ),
+        ]:
+            response = self.client.get(url, data={**stay, "type": "hotel"})
+            self.assertEqual(
+                [a["id"] for a in response.data["results"]],  # type: ignore
+                expected_ids,
+            )
+
+    def test_rooms_are_validated(self):
+        url = reverse("accommodation-list-create")
+        payload = {
+            "name": "Test",
+            "price": "100.00",
+            "location": "City",
+            "type": "apartment",
+            "rooms": 3,
+        }
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.data, {"rooms": ["Only hotels have rooms"]})
+
+        hotel = self._small_hotel()
+        Booking.objects.create(
+            accommodation=hotel,
+            start_date="2025-01-05",
+            end_date="2025-01-06",
+            guest_name="Guest 5",
+        )
+        url = reverse("accommodation-detail", args=[hotel.id])
+        response = self.client.patch(url, {"rooms": None}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(hotel.inventory.exists())
+        hotel.refresh_from_db()
+
+        # the hotel now has two bookings on the 2nd
+        Booking.objects.create(
+            accommodation=hotel,
+            start_date="2025-01-02",
+            end_date="2025-01-03",
+            guest_name="Guest 5",
+        )
+        response = self.client.patch(url, {"rooms": 1}, format="json")
+        self.assertEqual(
+            response.data, {"rooms": ["Fewer rooms than bookings on some nights"]}
+        )
+
+        response = self.client.patch(url, {"rooms": 2}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(hotel.inventory.order_by("night").values_list("remaining", flat=True)),
+            [1, 0, 1, 1],
+        )
+
+    def test_hotels_with_overlapping_bookings_stay_hotels(self):
+        hotel = Accommodation.objects.create(
+            name="Hotel",
+            description="",
+            price="100.0",
+            location="City",
+            type="hotel",
+        )
+        bookings = [
+            Booking.objects.create(
+                accommodation=hotel,
+                start_date=start_date,
+                end_date=end_date,
+                guest_name="Guest",
+            )
+            for start_date, end_date in [
+                ("2025-01-01", "2025-01-05"),
+                ("2025-01-04", "2025-01-06"),
+            ]
+        ]
+        url = reverse("accommodation-detail", args=[hotel.id])
+
+        response = self.client.patch(url, {"type": "apartment"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data,
+            {"type": ["Overlapping bookings prevent changing to apartment"]},
+        )
+        hotel.refresh_from_db()
+        self.assertEqual(hotel.type, "hotel")
+
+        bookings[1].delete()
+        response = self.client.patch(url, {"type": "apartment"}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+    def test_import_creates_valid_rows_and_reports_the_others(self):
+        upload = SimpleUploadedFile(
+            "accommodations.csv",
+            b"name,description,price,location,type\n"
+            b'Sea Flat,"Nice, ""big""",120.50,Lisbon,apartment\n'
+            b"X,,-3,Porto,castle\n",
+            content_type="text/csv",
+        )
+
+        response = self.client.post(
+            reverse("accommodation-import"), {"file": upload}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["rejected"], 1)
+        self.assertEqual(response.data["errors"][0]["row"], 2)
+        self.assertEqual(
+            set(response.data["errors"][0]["errors"]), {"name", "price", "type"}
+        )
+        created = Accommodation.objects.get(name="Sea Flat")
+        self.assertEqual(created.description, 'Nice, "big"')
+        self.assertEqual(str(created.price), "120.50")
+        self.assertEqual(created.bookings_version, 0)
+
+    def test_import_rejects_csv_that_is_not_utf8(self):
+        upload = SimpleUploadedFile(
+            "accommodations.csv",
+            b"name,description,price,location,type\n"
+            b"Sea Flat,,120.50,Lisbon,apartment\n"
+            b"Caf\xff Flat,,80,Porto,apartment\n",
+            content_type="text/csv",
+        )
+
+        response = self.client.post(
+            reverse("accommodation-import"), {"file": upload}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["file"], ["Line 3 is not valid UTF-8."])
+        self.assertFalse(Accommodation.objects.filter(name="Sea Flat").exists())
+
+    def test_import_rejects_ndjson_lines_that_are_not_utf8(self):
+        body = (
+            b'{"name": "Town Hotel", "price": 80, "location": "Porto", "type": "hotel"}\n'
+            b'{"name": "Caf\xff", "price": 80, "location": "Porto", "type": "hotel"}\n'
+        )
+
+        response = self.client.post(
+            reverse("accommodation-import"),
+            body,
+            content_type="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["errors"][0]["row"], 2)
+
+    def test_import_reads_ndjson_body(self):
+        body = (
+            b'{"name": "Town Hotel", "price": 80, "location": "Porto", "type": "hotel"}\n'
+            b"\n"
+            b'{"name": "Old Flat", "price": "75.5", "location": "Faro", "type": "apartment"}\n'
+        )
+
+        response = self.client.post(
+            reverse("accommodation-import"),
+            body,
+            content_type="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"created": 2, "rejected": 0, "errors": []})
+        self.assertIsNone(Accommodation.objects.get(name="Town Hotel").description)
+
+        listed = self.client.get(reverse("accommodation-list-create"))
+        self.assertEqual(listed.data["count"], 4)
+
+    def test_import_rejects_file_without_valid_rows(self):
+        url = reverse("accommodation-import")
+
+        response = self.client.post(
+            url, b'{"name": broken\n', content_type="application/x-ndjson"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["created"], 0)
+        self.assertEqual(response.data["errors"][0]["row"], 1)
+
+        response = self.client.post(url, b"", content_type="text/csv")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"file": ["The file has no rows."]})
+
+        upload = SimpleUploadedFile("accommodations.xlsx", b"", content_type="")
+        response = self.client.post(url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+
+    def _analytics(self, name, **query):
+        response = self.client.get(reverse(name), data=query)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_analytics_clips_bookings_to_window(self):
+        data = self._analytics(
+            "accommodation-analytics", **{"from": "2024-12-20", "to": "2025-01-10"}
+        )
+
+        self.assertEqual(
+            [a["accommodation_id"] for a in data["results"]],  # type: ignore
+            [self._apartment.id, self._hotel.id],
+        )
+        self.assertEqual(
+            data["results"][0]["months"],  # type: ignore
+            [
+                {
+                    "month": "2024-12-01",
+                    "available_nights": 12,
+                    "booked_nights": 0,
+                    "occupancy": 0.0,
+                    "revenue": "0.00",
+                },
+                {
+                    "month": "2025-01-01",
+                    "available_nights": 9,
+                    "booked_nights": 9,
+                    "occupancy": 1.0,
+                    "revenue": "1800.00",
+                },
+            ],
+        )
+        self.assertEqual(
+            data["results"][1]["months"][1]["revenue"], "100.00"  # type: ignore
+        )
+
+    def test_analytics_splits_bookings_across_months(self):
+        Booking.objects.create(
+            accommodation=self._apartment,
+            start_date="2025-01-28",
+            end_date="2025-02-03",
+            guest_name="Guest 5",
+        )
+        query = {"from": "2025-01-01", "to": "2025-02-02", "type": "apartment"}
+
+        for rollup in [False, True]:
+            with self.subTest(rollup=rollup), self.settings(ANALYTICS_ROLLUP=rollup):
+                refresh_rollup()
+                data = self._analytics("accommodation-analytics", **query)
+                self.assertEqual(len(data["results"]), 1)  # type: ignore
+                self.assertEqual(
+                    [
+                        (m["booked_nights"], m["revenue"])
+                        for m in data["results"][0]["months"]  # type: ignore
+                    ],
+                    [(16, "3200.00"), (1, "200.00")],
+                )
+
+    def test_analytics_rollup_follows_booking_writes(self):
+        refresh_rollup()
+        query = {"from": "2025-03-01", "to": "2025-04-01"}
+
+        with self.settings(ANALYTICS_ROLLUP=True):
+            booking = Booking.objects.create(
+                accommodation=self._hotel,
+                start_date="2025-03-10",
+                end_date="2025-03-15",
+                guest_name="Guest 5",
+            )
+            data = self._analytics("accommodation-analytics", **query)
+            self.assertEqual(
+                data["results"][1]["months"][0]["booked_nights"], 5  # type: ignore
+            )
+
+            booking.delete()
+            data = self._analytics("accommodation-analytics", **query)
+            self.assertEqual(
+                data["results"][1]["months"][0]["booked_nights"], 0  # type: ignore
+            )
+
+    def test_location_analytics(self):
+        Accommodation.objects.create(
+            name="Acc 3",
+            description="",
+            price="50.0",
+            location="Town",
+            type="apartment",
+        )
+
+        data = self._analytics(
+            "location-analytics", **{"from": "2025-01-01", "to": "2025-02-01"}
+        )
+
+        self.assertEqual(
+            data,
+            [
+                {
+                    "location": "City",
+                    "accommodations": 2,
+                    "months": [
+                        {
+                            "month": "2025-01-01",
+                            "available_nights": 62,
+                            "booked_nights": 13,
+                            "occupancy": 0.2097,
+                            "revenue": "2500.00",
+                        }
+                    ],
+                },
+                {
+                    "location": "Town",
+                    "accommodations": 1,
+                    "months": [
+                        {
+                            "month": "2025-01-01",
+                            "available_nights": 31,
+                            "booked_nights": 0,
+                            "occupancy": 0.0,
+                            "revenue": "0.00",
+                        }
+                    ],
+                },
+            ],
+        )
+
+    def test_analytics_rejects_invalid_window(self):
+        for name in ["accommodation-analytics", "location-analytics"]:
+            for window in [
+                {"from": "2025-01-05", "to": "2025-01-05"},
+                {"from": "2025-01-01", "to": "2030-01-01"},
+                {"to": "2025-01-05"},
+            ]:
+                response = self.client.get(reverse(name), data=window)
+                self.assertEqual(response.status_code, 400)
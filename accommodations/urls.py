@@ -1,17 +1,70 @@
+from django.conf import settings
 from django.urls import path
 
+from .async_views import (
+    AsyncAccommodationAvailabilityView,
+    AsyncAccommodationDetailView,
+    AsyncAccommodationListView,
+)
 from .views import (
+    AccommodationAnalyticsView,
     AccommodationAvailabilityView,
+    AccommodationBatchAvailabilityView,
+    AccommodationBatchCalendarView,
+    AccommodationCalendarView,
     AccommodationDetailView,
+    AccommodationImportView,
     AccommodationListCreateView,
+    AccommodationSearchView,
+    LocationAnalyticsView,
 )
 
+if settings.ASYNC_VIEWS:
+    AccommodationListCreateView = AsyncAccommodationListView
+    AccommodationDetailView = AsyncAccommodationDetailView
+    AccommodationAvailabilityView = AsyncAccommodationAvailabilityView
+
 urlpatterns = [
     path("", AccommodationListCreateView.as_view(), name="accommodation-list-create"),
+    path(
+        "analytics/",
+        AccommodationAnalyticsView.as_view(),
+        name="accommodation-analytics",
+    ),
+    path(
+        "analytics/locations/",
+        LocationAnalyticsView.as_view(),
+        name="location-analytics",
+    ),
+    path(
+        "availability/",
+        AccommodationBatchAvailabilityView.as_view(),
+        name="accommodation-batch-availability",
+    ),
+    path(
+        "calendar/",
+        AccommodationBatchCalendarView.as_view(),
+        name="accommodation-batch-calendar",
+    ),
+    path(
+        "import/",
+        AccommodationImportView.as_view(),
+        name="accommodation-import",
+    ),
+    path(
+        "search/",
+        AccommodationSearchView.as_view(),
+        name="accommodation-search",
+    ),
     path("<int:pk>/", AccommodationDetailView.as_view(), name="accommodation-detail"),
     path(
         "<int:pk>/availability/",
         AccommodationAvailabilityView.as_view(),
         name="accommodation-availability",
     ),
+    path(
+        "<int:pk>/calendar/",
+        AccommodationCalendarView.as_view(),
+        name="accommodation-calendar",
+    ),
 ]
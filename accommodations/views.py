@@ -1,15 +1,48 @@
+from decimal import Decimal
+from functools import partial
+
+from dependency_injector.wiring import Provide, inject
+from django.db.models import Count, Exists, OuterRef, Sum
+from django.db.models.functions import Coalesce
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
-from rest_framework import generics, serializers
+from rest_framework import generics, serializers, status
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 
-from bookings.models import Booking
+from accommodation_booking.application.protocols.availability_engine import (
+    AvailabilityEngine,
+)
+from accommodation_booking.container import ApplicationContainer
+from accommodation_booking.fast_reads import FastListMixin
+from accommodation_booking.pagination import IdCursorPagination
+from accommodation_booking.sparse_fields import (
+    SparseFieldsMixin,
+    sparse_fields_parameter,
+)
+from bookings.models import Booking, RoomInventory
 
+from .analytics import Segment, booked_nights, month_segments
+from .availability import next_available_dates
+from .caching import (
+    ACCOMMODATIONS,
+    accommodation_version,
+    availability_version,
+    cached_response,
+)
+from .calendar import busy_nights, encode_bitmap, encode_runs
+from .importing import (
+    UnreadableFile,
+    detect_format,
+    import_accommodations,
+    read_rows,
+)
 from .models import Accommodation
+from .search import search_accommodations
 from .serializers import AccommodationSerializer
 
 
-class AccommodationListCreateView(generics.ListCreateAPIView):
+class AccommodationListCreateView(FastListMixin, generics.ListCreateAPIView):
     """List all accommodations or create a new accommodation"""
 
     queryset = Accommodation.objects.all()
@@ -17,7 +50,10 @@ class AccommodationListCreateView(generics.ListCreateAPIView):
 
     @extend_schema(
         summary="List all accommodations",
-        description="Get a list of all accommodations",
+        description=(
+            "Get a list of all accommodations. With q, only those matching it, "
+            "the most relevant first"
+        ),
         parameters=[
             OpenApiParameter(
                 name="type",
@@ -25,12 +61,26 @@ class AccommodationListCreateView(generics.ListCreateAPIView):
                 required=False,
                 type=OpenApiTypes.STR,
                 enum=[t.value for t in Accommodation.AccommodationType],
-            )
+            ),
+            OpenApiParameter(
+                name="q",
+                description=(
+                    "Words of the name, location or description, or part of "
+                    "the name or location, misspellings included"
+                ),
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+            sparse_fields_parameter(AccommodationSerializer),
         ],
         tags=["Accommodations"],
     )
     def get(self, request, *args, **kwargs):
-        return super().get(request, *args, **kwargs)
+        return cached_response(
+            request,
+            [ACCOMMODATIONS],
+            partial(super().get, request, *args, **kwargs),
+        )
 
     @extend_schema(
         summary="Create a new accommodation",
@@ -45,10 +95,86 @@ class AccommodationListCreateView(generics.ListCreateAPIView):
         accommodation_type = self.request.query_params.get("type")
         if accommodation_type:
             queryset = queryset.filter(type=accommodation_type.lower())
+        text = self.request.query_params.get("q")
+        if text:
+            queryset = search_accommodations(queryset, text)
         return queryset
 
 
-class AccommodationDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AccommodationImportView(generics.GenericAPIView):
+    """Create many accommodations from a CSV or NDJSON file"""
+
+    parser_classes = [MultiPartParser]
+
+    class RejectedRow(serializers.Serializer):
+        row = serializers.IntegerField()
+        errors = serializers.DictField(
+            child=serializers.ListField(child=serializers.CharField())
+        )
+
+    class ImportResponse(serializers.Serializer):
+        created = serializers.IntegerField()
+        rejected = serializers.IntegerField()
+
+        def get_fields(self):
+            fields = super().get_fields()
+            fields["errors"] = AccommodationImportView.RejectedRow(many=True)
+            return fields
+
+    @extend_schema(
+        summary="Import accommodations",
+        description=(
+            "Creates accommodations from a CSV file (header row with name, "
+            "description, price, location, type) or NDJSON file (one object per "
+            "line), sent as the multipart `file` or as the request body with a "
+            "text/csv or application/x-ndjson content type. Rows are validated "
+            "like single accommodations, invalid ones are reported by row number "
+            "(the first 1000) and the others are created. Responds 201 when "
+            "every row was created, 207 when only some were and 400 when none were"
+        ),
+        tags=["Accommodations"],
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {"file": {"type": "string", "format": "binary"}},
+            },
+            "text/csv": {"type": "string"},
+            "application/x-ndjson": {"type": "string"},
+        },
+        responses={201: ImportResponse, 207: ImportResponse, 400: ImportResponse},
+    )
+    def post(self, request, *args, **kwargs):
+        # A CSV or NDJSON body is read as it arrives, without a parser
+        file_format = detect_format(content_type=request.content_type)
+        if file_format is not None:
+            file = request.stream
+        else:
+            file = request.data.get("file")
+            if file is None:
+                raise serializers.ValidationError({"file": ["No file was submitted."]})
+            file_format = detect_format(file.name, file.content_type)
+            if file_format is None:
+                raise serializers.ValidationError(
+                    {"file": ["Upload a .csv, .ndjson or .jsonl file."]}
+                )
+
+        try:
+            result = import_accommodations(read_rows(file or [], file_format))
+        except UnreadableFile as ex:
+            raise serializers.ValidationError({"file": [str(ex)]})
+        if not result.created and not result.rejected:
+            raise serializers.ValidationError({"file": ["The file has no rows."]})
+
+        if not result.rejected:
+            response_status = status.HTTP_201_CREATED
+        elif result.created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(self.ImportResponse(result).data, status=response_status)
+
+
+class AccommodationDetailView(SparseFieldsMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete an accommodation"""
 
     queryset = Accommodation.objects.all()
@@ -58,9 +184,14 @@ class AccommodationDetailView(generics.RetrieveUpdateDestroyAPIView):
         summary="Get accommodation by ID",
         description="Retrieve a specific accommodation by its ID",
         tags=["Accommodations"],
+        parameters=[sparse_fields_parameter(AccommodationSerializer)],
     )
     def get(self, request, *args, **kwargs):
-        return super().get(request, *args, **kwargs)
+        return cached_response(
+            request,
+            [accommodation_version(kwargs["pk"])],
+            partial(super().get, request, *args, **kwargs),
+        )
 
     @extend_schema(
         summary="Update accommodation",
@@ -119,40 +250,594 @@ class AccommodationAvailabilityView(generics.GenericAPIView):
             200: AvailabilityResponse,
         },
     )
+    @inject
+    def get(
+        self,
+        request,
+        availability_engine: AvailabilityEngine = Provide[
+            ApplicationContainer.availability_engine
+        ],
+        *args,
+        **kwargs,
+    ):
+        def build_response():
+            accommodation = self.get_object()
+
+            request_serializer = self.RequestSerializer(data=request.query_params)
+            request_serializer.is_valid(raise_exception=True)
+
+            next_available_date = availability_engine.next_available_date(
+                accommodation, request_serializer.validated_data["date"]
+            )
+
+            serializer = self.AvailabilityResponse(
+                {
+                    "accommodation_id": accommodation.id,
+                    "next_available_date": next_available_date,
+                }
+            )
+
+            return Response(serializer.data)
+
+        return cached_response(
+            request,
+            [accommodation_version(kwargs["pk"]), availability_version(kwargs["pk"])],
+            build_response,
+        )
+
+
+class AccommodationBatchAvailabilityView(generics.GenericAPIView):
+    """Check the next available date of many accommodations at once"""
+
+    class RequestSerializer(serializers.Serializer):
+        """Serializer to validate request body"""
+
+        ids = serializers.ListField(
+            child=serializers.IntegerField(min_value=1),
+            allow_empty=False,
+            max_length=1000,
+        )
+        date = serializers.DateField()
+
+    serializer_class = RequestSerializer
+
+    @extend_schema(
+        summary="Get next available dates",
+        description=(
+            "Given a list of accommodation ids and a reference date, returns the "
+            "next available date of every accommodation in a single query"
+        ),
+        tags=["Accommodations"],
+        request=RequestSerializer,
+        responses={
+            200: AccommodationAvailabilityView.AvailabilityResponse(many=True),
+        },
+    )
+    def post(self, request, *args, **kwargs):
+        request_serializer = self.RequestSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        accommodation_ids = list(
+            dict.fromkeys(request_serializer.validated_data["ids"])
+        )
+        dates = next_available_dates(
+            accommodation_ids, request_serializer.validated_data["date"]
+        )
+
+        missing_ids = [str(id) for id in accommodation_ids if id not in dates]
+        if missing_ids:
+            raise serializers.ValidationError(
+                {"ids": [f"Invalid accommodation ID: {', '.join(missing_ids)}"]}
+            )
+
+        serializer = AccommodationAvailabilityView.AvailabilityResponse(
+            [
+                {"accommodation_id": id, "next_available_date": dates[id]}
+                for id in accommodation_ids
+            ],
+            many=True,
+        )
+        return Response(serializer.data)
+
+
+class AccommodationCalendarView(generics.GenericAPIView):
+    """Free/busy nights of an accommodation over a date window"""
+
+    MAX_NIGHTS = 732
+
+    queryset = Accommodation.objects.all()
+
+    class RequestSerializer(serializers.Serializer):
+        """Serializer to validate query input parameters"""
+
+        to = serializers.DateField()
+        encoding = serializers.ChoiceField(choices=["bitmap", "rle"], default="bitmap")
+
+        def get_fields(self):
+            fields = super().get_fields()
+            fields["from"] = serializers.DateField()
+            return fields
+
+        def validate(self, data):
+            nights = (data["to"] - data["from"]).days
+            if nights <= 0:
+                raise serializers.ValidationError("'to' must be after 'from'")
+            if nights > AccommodationCalendarView.MAX_NIGHTS:
+                raise serializers.ValidationError(
+                    f"Calendar window is limited to {AccommodationCalendarView.MAX_NIGHTS} nights"
+                )
+            return data
+
+    class CalendarResponse(serializers.Serializer):
+        """Serializer for calendar response"""
+
+        accommodation_id = serializers.IntegerField()
+        to = serializers.DateField()
+        nights = serializers.IntegerField()
+        encoding = serializers.CharField()
+        busy = serializers.JSONField(
+            help_text=(
+                "bitmap: base64 of one bit per night, most significant bit first, "
+                "1 meaning busy. rle: lengths of alternating free and busy runs, "
+                "starting with a free run."
+            )
+        )
+
+        def get_fields(self):
+            fields = super().get_fields()
+            return {
+                "accommodation_id": fields.pop("accommodation_id"),
+                "from": serializers.DateField(),
+                **fields,
+            }
+
+    calendar_parameters = [
+        OpenApiParameter(
+            name="from",
+            description="First night of the window (YYYY-MM-DD)",
+            required=True,
+            type=OpenApiTypes.DATE,
+        ),
+        OpenApiParameter(
+            name="to",
+            description="Day after the last night of the window (YYYY-MM-DD)",
+            required=True,
+            type=OpenApiTypes.DATE,
+        ),
+        OpenApiParameter(
+            name="encoding",
+            description="Encoding of the busy nights",
+            required=False,
+            type=OpenApiTypes.STR,
+            enum=["bitmap", "rle"],
+        ),
+    ]
+
+    @classmethod
+    def build_calendars(cls, accommodation_ids: list[int], params: dict) -> list:
+        calendars = busy_nights(accommodation_ids, params["from"], params["to"])
+        encode = encode_bitmap if params["encoding"] == "bitmap" else encode_runs
+        return [
+            {
+                "accommodation_id": id,
+                "from": params["from"],
+                "to": params["to"],
+                "nights": len(calendars[id]),
+                "encoding": params["encoding"],
+                "busy": encode(calendars[id]),
+            }
+            for id in accommodation_ids
+        ]
+
+    @extend_schema(
+        summary="Get availability calendar",
+        description="Returns the booked nights of the accommodation in a compact encoding",
+        tags=["Accommodations"],
+        parameters=calendar_parameters,
+        responses={
+            200: CalendarResponse,
+        },
+    )
     def get(self, request, *args, **kwargs):
         accommodation = self.get_object()
 
         request_serializer = self.RequestSerializer(data=request.query_params)
         request_serializer.is_valid(raise_exception=True)
 
-        if accommodation.type != Accommodation.AccommodationType.APARTMENT:
-            serializer = self.AvailabilityResponse(
+        [calendar] = self.build_calendars(
+            [accommodation.id], request_serializer.validated_data
+        )
+        return Response(self.CalendarResponse(calendar).data)
+
+
+class AccommodationBatchCalendarView(generics.GenericAPIView):
+    """Free/busy nights of many accommodations over a date window"""
+
+    class RequestSerializer(AccommodationCalendarView.RequestSerializer):
+        """Serializer to validate query input parameters"""
+
+        ids = serializers.ListField(
+            child=serializers.IntegerField(min_value=1),
+            allow_empty=False,
+            max_length=1000,
+        )
+
+    @extend_schema(
+        summary="Get availability calendars",
+        description=(
+            "Returns the booked nights of many accommodations in a compact "
+            "encoding, in the order of the requested ids"
+        ),
+        tags=["Accommodations"],
+        parameters=[
+            OpenApiParameter(
+                name="ids",
+                description="Accommodation id, repeated for every accommodation",
+                required=True,
+                type=OpenApiTypes.INT,
+                many=True,
+            ),
+            *AccommodationCalendarView.calendar_parameters,
+        ],
+        responses={
+            200: AccommodationCalendarView.CalendarResponse(many=True),
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        request_serializer = self.RequestSerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        accommodation_ids = list(
+            dict.fromkeys(request_serializer.validated_data["ids"])
+        )
+        existing_ids = set(
+            Accommodation.objects.filter(id__in=accommodation_ids).values_list(
+                "id", flat=True
+            )
+        )
+        missing_ids = [str(id) for id in accommodation_ids if id not in existing_ids]
+        if missing_ids:
+            raise serializers.ValidationError(
+                {"ids": [f"Invalid accommodation ID: {', '.join(missing_ids)}"]}
+            )
+
+        calendars = AccommodationCalendarView.build_calendars(
+            accommodation_ids, request_serializer.validated_data
+        )
+        return Response(
+            AccommodationCalendarView.CalendarResponse(calendars, many=True).data
+        )
+
+
+class AccommodationSearchView(SparseFieldsMixin, generics.ListAPIView):
+    """Search accommodations free for a whole stay"""
+
+    serializer_class = AccommodationSerializer
+    pagination_class = IdCursorPagination
+
+    class RequestSerializer(serializers.Serializer):
+        """Serializer to validate query input parameters"""
+
+        start_date = serializers.DateField()
+        end_date = serializers.DateField()
+        location = serializers.CharField(required=False)
+        type = serializers.ChoiceField(
+            choices=Accommodation.AccommodationType.choices, required=False
+        )
+        min_price = serializers.DecimalField(
+            max_digits=10, decimal_places=2, required=False
+        )
+        max_price = serializers.DecimalField(
+            max_digits=10, decimal_places=2, required=False
+        )
+
+        def validate(self, data):
+            if data["end_date"] <= data["start_date"]:
+                raise serializers.ValidationError("End date must be after start date")
+            return data
+
+    @extend_schema(
+        summary="Search available accommodations",
+        description=(
+            "Lists accommodations free for every night from start_date to "
+            "end_date, optionally filtered by location, type and price. Hotels "
+            "are included unless they have no room left on one of the nights. "
+            "Results are ordered by id and paginated with an opaque cursor."
+        ),
+        tags=["Accommodations"],
+        parameters=[
+            OpenApiParameter(
+                name="start_date",
+                description="Check-in date (YYYY-MM-DD)",
+                required=True,
+                type=OpenApiTypes.DATE,
+            ),
+            OpenApiParameter(
+                name="end_date",
+                description="Check-out date (YYYY-MM-DD)",
+                required=True,
+                type=OpenApiTypes.DATE,
+            ),
+            OpenApiParameter(
+                name="location",
+                description="Location, case insensitive",
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="type",
+                description="Filter by accommodation type",
+                required=False,
+                type=OpenApiTypes.STR,
+                enum=[t.value for t in Accommodation.AccommodationType],
+            ),
+            OpenApiParameter(
+                name="min_price",
+                description="Minimum price",
+                required=False,
+                type=OpenApiTypes.DECIMAL,
+            ),
+            OpenApiParameter(
+                name="max_price",
+                description="Maximum price",
+                required=False,
+                type=OpenApiTypes.DECIMAL,
+            ),
+            sparse_fields_parameter(AccommodationSerializer),
+        ],
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        request_serializer = self.RequestSerializer(data=self.request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+        params = request_serializer.validated_data
+
+        queryset = Accommodation.objects.filter(
+            ~Exists(
+                Booking.objects.apartment_overlaps(
+                    params["start_date"], params["end_date"]
+                ).filter(accommodation_id=OuterRef("id"))
+            ),
+            ~Exists(
+                RoomInventory.objects.filter(
+                    accommodation_id=OuterRef("id"),
+                    night__gte=params["start_date"],
+                    night__lt=params["end_date"],
+                    remaining=0,
+                )
+            ),
+        )
+        if "location" in params:
+            queryset = queryset.filter(location__iexact=params["location"])
+        if "type" in params:
+            queryset = queryset.filter(type=params["type"])
+        if "min_price" in params:
+            queryset = queryset.filter(price__gte=params["min_price"])
+        if "max_price" in params:
+            queryset = queryset.filter(price__lte=params["max_price"])
+        return queryset
+
+
+class AccommodationAnalyticsView(generics.ListAPIView):
+    """Occupancy and revenue of accommodations per month"""
+
+    MAX_NIGHTS = 732
+
+    queryset = Accommodation.objects.all()
+    pagination_class = IdCursorPagination
+
+    class RequestSerializer(serializers.Serializer):
+        """Serializer to validate query input parameters"""
+
+        to = serializers.DateField()
+        location = serializers.CharField(required=False)
+        type = serializers.ChoiceField(
+            choices=Accommodation.AccommodationType.choices, required=False
+        )
+
+        def get_fields(self):
+            fields = super().get_fields()
+            fields["from"] = serializers.DateField()
+            return fields
+
+        def validate(self, data):
+            nights = (data["to"] - data["from"]).days
+            if nights <= 0:
+                raise serializers.ValidationError("'to' must be after 'from'")
+            if nights > AccommodationAnalyticsView.MAX_NIGHTS:
+                raise serializers.ValidationError(
+                    f"Analytics window is limited to {AccommodationAnalyticsView.MAX_NIGHTS} nights"
+                )
+            return data
+
+    class MonthResponse(serializers.Serializer):
+        """Serializer for the figures of one month"""
+
+        month = serializers.DateField(help_text="First day of the month")
+        available_nights = serializers.IntegerField(
+            help_text="Nights of the month inside the window, times rooms"
+        )
+        booked_nights = serializers.IntegerField()
+        occupancy = serializers.FloatField(
+            help_text=(
+                "Booked nights over available nights. Hotels without a room "
+                "count take any number of bookings a night, so theirs can "
+                "exceed 1."
+            )
+        )
+        revenue = serializers.DecimalField(
+            max_digits=16,
+            decimal_places=2,
+            help_text="Booked nights at the current price",
+        )
+
+    class AnalyticsResponse(serializers.Serializer):
+        """Serializer for the analytics of an accommodation"""
+
+        accommodation_id = serializers.IntegerField()
+        name = serializers.CharField()
+        location = serializers.CharField()
+        type = serializers.CharField()
+
+        def get_fields(self):
+            fields = super().get_fields()
+            fields["months"] = AccommodationAnalyticsView.MonthResponse(many=True)
+            return fields
+
+    serializer_class = AnalyticsResponse
+
+    analytics_parameters = [
+        OpenApiParameter(
+            name="from",
+            description="First night of the window (YYYY-MM-DD)",
+            required=True,
+            type=OpenApiTypes.DATE,
+        ),
+        OpenApiParameter(
+            name="to",
+            description="Day after the last night of the window (YYYY-MM-DD)",
+            required=True,
+            type=OpenApiTypes.DATE,
+        ),
+        OpenApiParameter(
+            name="location",
+            description="Location, case insensitive",
+            required=False,
+            type=OpenApiTypes.STR,
+        ),
+        OpenApiParameter(
+            name="type",
+            description="Filter by accommodation type",
+            required=False,
+            type=OpenApiTypes.STR,
+            enum=[t.value for t in Accommodation.AccommodationType],
+        ),
+    ]
+
+    @staticmethod
+    def build_months(segments: list[Segment], key, nights: dict, rooms: int) -> list:
+        months = []
+        for segment in segments:
+            booked, revenue = nights.get((key, segment.month), (0, Decimal(0)))
+            available = segment.nights * rooms
+            months.append(
                 {
-                    "accommodation_id": accommodation.id,
-                    "next_available_date": request_serializer.data.get("date"),
+                    "month": segment.month,
+                    "available_nights": available,
+                    "booked_nights": booked,
+                    "occupancy": round(booked / available, 4),
+                    "revenue": revenue,
                 }
             )
-            return Response(serializer.data)
+        return months
 
-        queryset = Booking.objects.filter(
-            accommodation_id=accommodation.id,
-            end_date__gte=request_serializer.data.get("date"),
-        ).order_by("start_date")
-
-        next_available_date = (request_serializer.validated_data or {}).get("date")
-        for booking in queryset:
-            if (
-                next_available_date < booking.start_date
-                or next_available_date >= booking.end_date
-            ):
-                break
-            next_available_date = booking.end_date
-
-        serializer = self.AvailabilityResponse(
+    @extend_schema(
+        summary="Get accommodation analytics",
+        description=(
+            "Returns the booked nights, occupancy and revenue of every "
+            "accommodation in each month of the window, bookings clipped to "
+            "the window. Results are ordered by id and paginated with an "
+            "opaque cursor."
+        ),
+        tags=["Accommodations"],
+        parameters=analytics_parameters,
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        request_serializer = self.RequestSerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+        params = request_serializer.validated_data
+
+        queryset = self.get_queryset().only("id", "name", "location", "type", "rooms")
+        if "location" in params:
+            queryset = queryset.filter(location__iexact=params["location"])
+        if "type" in params:
+            queryset = queryset.filter(type=params["type"])
+        page = self.paginate_queryset(queryset)
+
+        segments = month_segments(params["from"], params["to"])
+        nights = booked_nights(
+            segments,
+            "accommodation",
+            accommodation_ids=[accommodation.id for accommodation in page],
+        )
+        analytics = [
             {
                 "accommodation_id": accommodation.id,
-                "next_available_date": next_available_date,
+                "name": accommodation.name,
+                "location": accommodation.location,
+                "type": accommodation.type,
+                "months": self.build_months(
+                    segments, accommodation.id, nights, accommodation.rooms or 1
+                ),
             }
+            for accommodation in page
+        ]
+        return self.get_paginated_response(
+            self.get_serializer(analytics, many=True).data
         )
 
-        return Response(serializer.data)
+
+class LocationAnalyticsView(generics.GenericAPIView):
+    """Occupancy and revenue of locations per month"""
+
+    class LocationAnalyticsResponse(serializers.Serializer):
+        """Serializer for the analytics of a location"""
+
+        location = serializers.CharField()
+        accommodations = serializers.IntegerField()
+        months = AccommodationAnalyticsView.MonthResponse(many=True)
+
+    @extend_schema(
+        summary="Get location analytics",
+        description=(
+            "Returns the booked nights, occupancy and revenue of the "
+            "accommodations of every location in each month of the window, "
+            "bookings clipped to the window, ordered by location"
+        ),
+        tags=["Accommodations"],
+        parameters=AccommodationAnalyticsView.analytics_parameters,
+        responses={
+            200: LocationAnalyticsResponse(many=True),
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        request_serializer = AccommodationAnalyticsView.RequestSerializer(
+            data=request.query_params
+        )
+        request_serializer.is_valid(raise_exception=True)
+        params = request_serializer.validated_data
+
+        queryset = Accommodation.objects.all()
+        if "location" in params:
+            queryset = queryset.filter(location__iexact=params["location"])
+        if "type" in params:
+            queryset = queryset.filter(type=params["type"])
+        locations = (
+            queryset.values("location")
+            .annotate(accommodations=Count("id"), rooms=Sum(Coalesce("rooms", 1)))
+            .order_by("location")
+        )
+
+        segments = month_segments(params["from"], params["to"])
+        nights = booked_nights(
+            segments,
+            "location",
+            location=params.get("location"),
+            accommodation_type=params.get("type"),
+        )
+        analytics = [
+            {
+                "location": location["location"],
+                "accommodations": location["accommodations"],
+                "months": AccommodationAnalyticsView.build_months(
+                    segments, location["location"], nights, location["rooms"]
+                ),
+            }
+            for location in locations
+        ]
+        return Response(self.LocationAnalyticsResponse(analytics, many=True).data)
@@ -0,0 +1,15 @@
+"""Benchmarks run against the database configured in settings.
+
+Run them as modules from the repository root, e.g.
+`python -m benchmarks.concurrent_bookings --help`. Each benchmark creates its
+own accommodations and deletes them when it finishes.
+"""
+
+import os
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "accommodation_booking.settings")
+    django.setup()
@@ -0,0 +1,130 @@
+"""Accommodations created per second: one at a time, `bulk_create`, `COPY`.
+
+Every method loads the same generated rows, every 50th of them invalid. The
+one-at-a-time method saves each row through `AccommodationSerializer`, as
+`POST /accommodations/` does, on the first `--sample` rows only; the others
+read the whole CSV file. Each method runs twice: timed,
+then with `tracemalloc` for the peak of Python allocations.
+"""
+
+import argparse
+import csv
+import tracemalloc
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks import setup_django
+
+setup_django()
+
+from rest_framework import serializers  # noqa: E402
+
+from accommodations.importing import import_accommodations, read_rows  # noqa: E402
+from accommodations.models import Accommodation  # noqa: E402
+from accommodations.serializers import AccommodationSerializer  # noqa: E402
+
+NAME = "Benchmark import"
+
+
+def write_rows(path: Path, rows: int):
+    with open(path, "w", newline="") as fout:
+        writer = csv.writer(fout)
+        writer.writerow(["name", "description", "price", "location", "type"])
+        for index in range(rows):
+            writer.writerow(
+                [
+                    f"{NAME} {index}",
+                    'Sea view, "quiet", 2 bedrooms',
+                    (
+                        "-1"
+                        if index % 50 == 0
+                        else f"{50 + index % 500}.{index % 100:02d}"
+                    ),
+                    "Lisbon",
+                    "hotel" if index % 10 == 0 else "apartment",
+                ]
+            )
+
+
+def one_at_a_time(path: Path, sample: int) -> int:
+    created = 0
+    with open(path, "rb") as fin:
+        for index, row in enumerate(read_rows(fin, "csv")):
+            if index == sample:
+                break
+            serializer = AccommodationSerializer(data=row)
+            if serializer.is_valid():
+                serializer.save()
+                created += 1
+    return created
+
+
+def bulk_create(path: Path, batch_size: int) -> int:
+    created, batch = 0, []
+    serializer = AccommodationSerializer()
+    with open(path, "rb") as fin:
+        for row in read_rows(fin, "csv"):
+            try:
+                batch.append(Accommodation(**serializer.run_validation(row)))
+            except serializers.ValidationError:
+                continue
+            if len(batch) == batch_size:
+                created += len(Accommodation.objects.bulk_create(batch))
+                batch = []
+    return created + len(Accommodation.objects.bulk_create(batch))
+
+
+def copy(path: Path, batch_size: int) -> int:
+    with open(path, "rb") as fin:
+        return import_accommodations(read_rows(fin, "csv"), batch_size).created
+
+
+def measure(method, *args) -> dict:
+    # Timed without tracing, which slows Python down, then run again traced
+    try:
+        started = perf_counter()
+        created = method(*args)
+        elapsed = perf_counter() - started
+        Accommodation.objects.filter(name__startswith=NAME).delete()
+
+        tracemalloc.start()
+        method(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        Accommodation.objects.filter(name__startswith=NAME).delete()
+    return {
+        "method": method.__name__,
+        "created": created,
+        "rows_per_second": created / elapsed,
+        "peak_mib": peak / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--sample", type=int, default=2_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        path = Path(directory) / "accommodations.csv"
+        write_rows(path, args.rows)
+        results = [
+            measure(one_at_a_time, path, args.sample),
+            measure(bulk_create, path, args.batch_size),
+            measure(copy, path, args.batch_size),
+        ]
+
+    print(f"{'method':<14} {'created':>8} {'rows/s':>8} {'peak MiB':>9}")
+    for result in results:
+        print(
+            f"{result['method']:<14} {result['created']:>8} "
+            f"{result['rows_per_second']:>8.0f} {result['peak_mib']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
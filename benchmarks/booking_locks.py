@@ -0,0 +1,122 @@
+"""Booking throughput with and without advisory locks, by number of hot apartments.
+
+Parallel bookers book one random night of one of the hot apartments at a
+time, through `BookingSerializer`. Without advisory locks, concurrent bookings
+of an apartment are sorted out by the exclusion constraint; with them, each
+write first waits for the lock of its apartment. The fewer the apartments,
+the more often bookers wait on each other.
+"""
+
+import argparse
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from time import perf_counter
+
+from benchmarks import setup_django
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from rest_framework.exceptions import ValidationError  # noqa: E402
+
+from accommodations.models import Accommodation  # noqa: E402
+from bookings.locks import lock_wait  # noqa: E402
+from bookings.models import Booking  # noqa: E402
+from bookings.serializers import BookingSerializer  # noqa: E402
+
+FIRST_NIGHT = date(2030, 1, 1)
+MODES = {"constraint": False, "advisory": True}
+
+
+def book(attempts: list[tuple[int, int]]) -> tuple[int, int]:
+    created = rejected = 0
+    try:
+        for accommodation_id, night in attempts:
+            start_date = FIRST_NIGHT + timedelta(days=night)
+            serializer = BookingSerializer(
+                data={
+                    "accommodation_id": accommodation_id,
+                    "start_date": start_date,
+                    "end_date": start_date + timedelta(days=1),
+                    "guest_name": "Benchmark",
+                }
+            )
+            serializer.is_valid(raise_exception=True)
+            try:
+                serializer.save()
+                created += 1
+            except ValidationError:
+                rejected += 1
+    finally:
+        connection.close()
+    return created, rejected
+
+
+def run(mode: str, hot: int, bookers: int, attempts: int, window: int) -> dict:
+    settings.BOOKING_ADVISORY_LOCKS = MODES[mode]
+    apartments = Accommodation.objects.bulk_create(
+        Accommodation(
+            name=f"Benchmark apartment {index}",
+            price="100.00",
+            location="Benchmark",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+        for index in range(hot)
+    )
+    work = [
+        (random.choice(apartments).id, random.randrange(window))
+        for _ in range(attempts)
+    ]
+    waits, waited = lock_wait.count, lock_wait.sum
+    try:
+        started = perf_counter()
+        with ThreadPoolExecutor(bookers) as executor:
+            results = list(
+                executor.map(book, [work[index::bookers] for index in range(bookers)])
+            )
+        elapsed = perf_counter() - started
+        assert Booking.objects.filter(accommodation__in=apartments).count() == sum(
+            created for created, _ in results
+        )
+    finally:
+        Accommodation.objects.filter(id__in=[a.id for a in apartments]).delete()
+
+    locks = lock_wait.count - waits
+    return {
+        "mode": mode,
+        "hot": hot,
+        "attempts_per_second": attempts / elapsed,
+        "created": sum(created for created, _ in results),
+        "rejected": sum(rejected for _, rejected in results),
+        "mean_wait_ms": (lock_wait.sum - waited) / locks * 1000 if locks else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hot", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--bookers", type=int, default=16)
+    parser.add_argument("--attempts", type=int, default=2000)
+    parser.add_argument("--window", type=int, default=365, help="nights to pick from")
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':<11} {'hot':>4} {'attempts/s':>11} {'created':>8} "
+        f"{'rejected':>9} {'wait ms':>8}"
+    )
+    for hot in args.hot:
+        for mode in MODES:
+            result = run(mode, hot, args.bookers, args.attempts, args.window)
+            wait = result["mean_wait_ms"]
+            print(
+                f"{result['mode']:<11} {result['hot']:>4} "
+                f"{result['attempts_per_second']:>11.0f} {result['created']:>8} "
+                f"{result['rejected']:>9} "
+                f"{'-' if wait is None else f'{wait:.2f}':>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Throughput of parallel bookers racing for nights of the same apartment.
+
+Every attempt books one random night inside a window, so some attempts
+collide and must be rejected by the overlap constraint. With `--rooms`, they
+race for the rooms of a hotel instead, and must be rejected once a night is
+sold out.
+"""
+
+import argparse
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from time import perf_counter
+
+from benchmarks import setup_django
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from rest_framework.exceptions import ValidationError  # noqa: E402
+
+from accommodations.models import Accommodation  # noqa: E402
+from bookings.models import Booking  # noqa: E402
+from bookings.serializers import BookingSerializer  # noqa: E402
+
+FIRST_NIGHT = date(2030, 1, 1)
+
+
+def book(accommodation_id: int, nights: list[int]) -> tuple[int, int]:
+    created = rejected = 0
+    try:
+        for night in nights:
+            start_date = FIRST_NIGHT + timedelta(days=night)
+            serializer = BookingSerializer(
+                data={
+                    "accommodation_id": accommodation_id,
+                    "start_date": start_date,
+                    "end_date": start_date + timedelta(days=1),
+                    "guest_name": "Benchmark",
+                }
+            )
+            serializer.is_valid(raise_exception=True)
+            try:
+                serializer.save()
+                created += 1
+            except ValidationError:
+                rejected += 1
+    finally:
+        connection.close()
+    return created, rejected
+
+
+def run(bookers: int, attempts: int, window: int, rooms: int | None) -> dict:
+    accommodation = Accommodation.objects.create(
+        name="Benchmark hotel" if rooms else "Benchmark apartment",
+        price="100.00",
+        location="Benchmark",
+        type=(
+            Accommodation.AccommodationType.HOTEL
+            if rooms
+            else Accommodation.AccommodationType.APARTMENT
+        ),
+        rooms=rooms,
+    )
+    nights = [random.randrange(window) for _ in range(attempts)]
+    try:
+        started = perf_counter()
+        with ThreadPoolExecutor(bookers) as executor:
+            results = list(
+                executor.map(
+                    book,
+                    [accommodation.id] * bookers,
+                    [nights[index::bookers] for index in range(bookers)],
+                )
+            )
+        elapsed = perf_counter() - started
+        bookings = Booking.objects.filter(accommodation=accommodation)
+        assert bookings.count() == sum(created for created, _ in results)
+        # Every attempt books a single night
+        assert (
+            not bookings.values("start_date")
+            .annotate(booked=Count("id"))
+            .filter(booked__gt=rooms or 1)
+        )
+    finally:
+        accommodation.delete()
+
+    return {
+        "bookers": bookers,
+        "attempts_per_second": attempts / elapsed,
+        "created": sum(created for created, _ in results),
+        "rejected": sum(rejected for _, rejected in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookers", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--attempts", type=int, default=2000)
+    parser.add_argument("--window", type=int, default=1500, help="nights to pick from")
+    parser.add_argument("--rooms", type=int, help="book a hotel with this many rooms")
+    args = parser.parse_args()
+
+    print(f"{'bookers':>8} {'attempts/s':>11} {'created':>8} {'rejected':>9}")
+    for bookers in args.bookers:
+        result = run(bookers, args.attempts, args.window, args.rooms)
+        print(
+            f"{result['bookers']:>8} {result['attempts_per_second']:>11.0f} "
+            f"{result['created']:>8} {result['rejected']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Throughput of the read endpoints served by WSGI and by ASGI workers.
+
+Starts gunicorn twice on the configured database: with sync workers on the
+WSGI application, then with uvicorn workers on the ASGI application and
+`ASYNC_VIEWS=True`. Both are driven by the same clients, each opening a
+connection per request for the detail or availability of a random
+accommodation on a random date. Slow clients, trickling their request headers
+like clients on a bad network, can run alongside; they are not counted.
+
+Each server can be run in several `DB_CONNECTIONS` modes, to compare opening a
+database connection per request with persistent and pooled ones.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from statistics import quantiles
+
+from benchmarks import setup_django
+
+setup_django()
+
+from accommodations.models import Accommodation  # noqa: E402
+
+HOST = "127.0.0.1"
+
+DB_CONNECTIONS = ["per_request", "persistent", "pool"]
+PATHS = ["mixed", "availability"]
+
+MODES = {
+    "wsgi": (["accommodation_booking.wsgi:application"], {}),
+    "asgi": (
+        [
+            "accommodation_booking.asgi:application",
+            "-k",
+            "uvicorn.workers.UvicornWorker",
+        ],
+        {"ASYNC_VIEWS": "True"},
+    ),
+}
+
+
+def start_server(
+    mode: str, db_connections: str, port: int, workers: int
+) -> subprocess.Popen:
+    arguments, environment = MODES[mode]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", *arguments]
+        + ["-w", str(workers), "-b", f"{HOST}:{port}", "--log-level", "warning"],
+        env={
+            **os.environ,
+            "DEBUG": "False",
+            "DB_CONNECTIONS": db_connections,
+            **environment,
+        },
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+def random_path(accommodation_ids: list[int], paths: str = "mixed") -> str:
+    accommodation_id = random.choice(accommodation_ids)
+    if paths == "mixed" and random.random() < 0.5:
+        return f"/accommodations/{accommodation_id}/"
+    day = date(2025, 1, 1) + timedelta(days=random.randrange(365))
+    return f"/accommodations/{accommodation_id}/availability/?date={day}"
+
+
+async def get(port: int, path: str, delay: float = 0) -> int:
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\n".encode())
+        if delay:
+            await writer.drain()
+            await asyncio.sleep(delay)
+        writer.write(f"Host: {HOST}\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+async def load(
+    port, accommodation_ids, clients, slow_clients, slow_delay, seconds, paths="mixed"
+):
+    latencies, failures = [], 0
+    deadline = time.monotonic() + seconds
+
+    async def client():
+        nonlocal failures
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                status = await get(port, random_path(accommodation_ids, paths))
+            except (OSError, IndexError, ValueError):
+                status = None
+            if status == 200:
+                latencies.append(time.monotonic() - started)
+            else:
+                failures += 1
+
+    async def slow_client():
+        while time.monotonic() < deadline:
+            try:
+                await get(port, random_path(accommodation_ids, paths), slow_delay)
+            except OSError:
+                pass
+
+    await asyncio.gather(
+        *(client() for _ in range(clients)),
+        *(slow_client() for _ in range(slow_clients)),
+    )
+    percentiles = quantiles(latencies, n=100)
+    return {
+        "requests_per_second": len(latencies) / seconds,
+        "p50_ms": percentiles[49] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument(
+        "--db-connections",
+        nargs="+",
+        choices=DB_CONNECTIONS,
+        default=["per_request"],
+    )
+    parser.add_argument(
+        "--paths",
+        choices=PATHS,
+        default="mixed",
+        help="detail and availability, or availability only",
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--clients", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--slow-clients", type=int, default=0)
+    parser.add_argument("--slow-delay", type=float, default=0.5)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8106)
+    args = parser.parse_args()
+
+    accommodation_ids = list(Accommodation.objects.values_list("id", flat=True))
+    if not accommodation_ids:
+        parser.error("the database has no accommodations to read")
+
+    print(
+        f"{'mode':<6} {'db':<12} {'clients':>8} {'slow':>6} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'failed':>7}"
+    )
+    for mode, db_connections in [
+        (mode, db_connections)
+        for mode in args.modes
+        for db_connections in args.db_connections
+    ]:
+        server = start_server(mode, db_connections, args.port, args.workers)
+        try:
+            # Let every worker load the URLconf and connect to the database
+            asyncio.run(
+                load(
+                    args.port,
+                    accommodation_ids,
+                    args.workers * 4,
+                    0,
+                    0,
+                    2,
+                    args.paths,
+                )
+            )
+            for clients in args.clients:
+                result = asyncio.run(
+                    load(
+                        args.port,
+                        accommodation_ids,
+                        clients,
+                        args.slow_clients,
+                        args.slow_delay,
+                        args.seconds,
+                        args.paths,
+                    )
+                )
+                print(
+                    f"{mode:<6} {db_connections:<12} {clients:>8} "
+                    f"{args.slow_clients:>6} "
+                    f"{result['requests_per_second']:>8.0f} "
+                    f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+                    f"{result['failures']:>7}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Time to build and render a 10k-row list page, serializers versus `values()`.
+
+Every list view is called unpaginated over its benchmark rows, once as is and
+once with the plain DRF list implementation, and both outputs are checked to
+be byte-identical.
+"""
+
+import argparse
+from datetime import date, timedelta
+from statistics import median
+from time import perf_counter
+
+from benchmarks import setup_django
+
+setup_django()
+
+from rest_framework import generics  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from accommodations.models import Accommodation  # noqa: E402
+from accommodations.views import AccommodationListCreateView  # noqa: E402
+from bookings.models import Booking, VoiceNote  # noqa: E402
+from bookings.views import BookingListCreateView, VoiceNoteListCreateView  # noqa: E402
+
+NAME = "Benchmark list ✓"
+
+
+def timed(view, request, **kwargs) -> tuple[float, bytes]:
+    started = perf_counter()
+    response = view(request, **kwargs)
+    content = response.render().content
+    return perf_counter() - started, content
+
+
+def compare(view_class, queryset, repeat: int, **kwargs) -> dict:
+    # Both skip the response cache of the accommodation list
+    fast = type("Fast", (view_class,), {"get": generics.ListAPIView.get}).as_view(
+        queryset=queryset, pagination_class=None
+    )
+    reference = type(
+        "Reference",
+        (view_class,),
+        {
+            "get": generics.ListAPIView.get,
+            "list": generics.ListAPIView.list,
+            "renderer_classes": [JSONRenderer],
+        },
+    ).as_view(queryset=queryset, pagination_class=None)
+
+    request = APIRequestFactory().get("/")
+    fast_times, reference_times = [], []
+    for _ in range(repeat):
+        elapsed, fast_content = timed(fast, request, **kwargs)
+        fast_times.append(elapsed)
+        elapsed, reference_content = timed(reference, request, **kwargs)
+        reference_times.append(elapsed)
+    assert fast_content == reference_content, f"{view_class.__name__} differs"
+
+    return {
+        "view": view_class.__name__,
+        "serializer_ms": median(reference_times) * 1000,
+        "values_ms": median(fast_times) * 1000,
+    }
+
+
+def run(rows: int, repeat: int) -> list[dict]:
+    accommodations = Accommodation.objects.bulk_create(
+        Accommodation(
+            name=f"{NAME} {index}",
+            description="Sea view, 2 bedrooms",
+            price=f"{50 + index % 500}.{index % 100:02d}",
+            location="Lisbon",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+        for index in range(rows)
+    )
+    try:
+        bookings = Booking.objects.bulk_create(
+            Booking(
+                accommodation=accommodation,
+                accommodation_type=accommodation.type,
+                start_date=date(2030, 1, 1) + timedelta(days=index % 300),
+                end_date=date(2030, 1, 3) + timedelta(days=index % 300),
+                guest_name=f"Guest {index}",
+            )
+            for index, accommodation in enumerate(accommodations)
+        )
+        VoiceNote.objects.bulk_create(
+            VoiceNote(
+                booking=bookings[0],
+                transcript="Arriving late, please leave the keys at the desk.",
+                status=VoiceNote.Status.SUCCEEDED,
+                file_name=f"note-{index}.mp3",
+                file_type="audio/mpeg",
+            )
+            for index in range(rows)
+        )
+
+        return [
+            compare(
+                AccommodationListCreateView,
+                Accommodation.objects.filter(name__startswith=NAME),
+                repeat,
+            ),
+            compare(
+                BookingListCreateView,
+                Booking.objects.select_related("accommodation").filter(
+                    accommodation__name__startswith=NAME
+                ),
+                repeat,
+            ),
+            compare(
+                VoiceNoteListCreateView,
+                None,
+                repeat,
+                booking_id=bookings[0].id,
+            ),
+        ]
+    finally:
+        Accommodation.objects.filter(name__startswith=NAME).delete()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'view':<28} {'serializer ms':>14} {'values ms':>10} {'speedup':>8}")
+    for result in run(args.rows, args.repeat):
+        print(
+            f"{result['view']:<28} {result['serializer_ms']:>14.1f} "
+            f"{result['values_ms']:>10.1f} "
+            f"{result['serializer_ms'] / result['values_ms']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Peak memory of storing a voice-note upload: read whole, or streamed.
+
+Each upload is a `TemporaryUploadedFile`, as Django hands over multipart files
+larger than `FILE_UPLOAD_MAX_MEMORY_SIZE`. It is stored with
+`save_file_as(upload.read())`, as the view used to, then with
+`save_stream(upload.chunks())`. Each run is timed, then repeated with
+`tracemalloc` for the peak of Python allocations.
+"""
+
+import argparse
+import tracemalloc
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks import setup_django
+
+setup_django()
+
+from django.core.files.uploadedfile import TemporaryUploadedFile  # noqa: E402
+
+from accommodation_booking.infrastructure.local.file_storage import (  # noqa: E402
+    LocalFileStorage,
+)
+
+BLOCK = 2**20
+
+
+def make_upload(megabytes: int) -> TemporaryUploadedFile:
+    upload = TemporaryUploadedFile("note.wav", "audio/wav", megabytes * BLOCK, None)
+    block = bytes(range(256)) * (BLOCK // 256)
+    for _ in range(megabytes):
+        upload.write(block)
+    upload.seek(0)
+    return upload
+
+
+def read_whole(storage: LocalFileStorage, upload: TemporaryUploadedFile):
+    storage.save_file_as(upload.read(), "note")
+
+
+def streamed(storage: LocalFileStorage, upload: TemporaryUploadedFile):
+    storage.save_stream(upload.chunks(), "note")
+
+
+def measure(method, storage: LocalFileStorage, megabytes: int) -> dict:
+    # Timed without tracing, which slows Python down, then run again traced
+    with make_upload(megabytes) as upload:
+        started = perf_counter()
+        method(storage, upload)
+        elapsed = perf_counter() - started
+
+        upload.seek(0)
+        tracemalloc.start()
+        try:
+            method(storage, upload)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {
+        "method": method.__name__,
+        "megabytes": megabytes,
+        "seconds": elapsed,
+        "peak_mib": peak / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=int, nargs="+", default=[16, 64, 256])
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        storage = LocalFileStorage(Path(directory))
+        results = [
+            measure(method, storage, megabytes)
+            for megabytes in args.megabytes
+            for method in (read_whole, streamed)
+        ]
+
+    print(f"{'method':<10} {'MB':>5} {'seconds':>8} {'peak MiB':>9}")
+    for result in results:
+        print(
+            f"{result['method']:<10} {result['megabytes']:>5} "
+            f"{result['seconds']:>8.2f} {result['peak_mib']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,29 @@
 from django.contrib import admin
 
+from accommodation_booking.text_search import TextSearchAdmin
+
 from .models import Booking, VoiceNote
+from .search import booking_filter, guest_rank, transcript_filter, transcript_rank
 
 
 @admin.register(Booking)
-class BookingAdmin(admin.ModelAdmin):
+class BookingAdmin(TextSearchAdmin):
     list_display = ["accommodation", "guest_name", "start_date", "end_date"]
     list_filter = ["start_date", "end_date"]
     search_fields = ["guest_name", "accommodation__name"]
+    search_help_text = "Part of the guest name, or the accommodation's name"
     date_hierarchy = "start_date"
 
+    search_filter = staticmethod(booking_filter)
+    search_rank = staticmethod(guest_rank)
+
 
 @admin.register(VoiceNote)
-class VoiceNoteAdmin(admin.ModelAdmin):
+class VoiceNoteAdmin(TextSearchAdmin):
     list_display = ["booking", "transcript", "status"]
     list_filter = ["status"]
     search_fields = ["transcript"]
+    search_help_text = "Words of the transcript"
+
+    search_filter = staticmethod(transcript_filter)
+    search_rank = staticmethod(transcript_rank)
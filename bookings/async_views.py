@@ -0,0 +1,40 @@
+from dependency_injector.wiring import Provide, inject
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+
+from accommodation_booking.application.protocols.file_storage import FileStorage
+from accommodation_booking.async_views import AsyncAPIView
+from accommodation_booking.container import ApplicationContainer
+
+from .audio import AudioDownload
+from .models import VoiceNote
+from .views import VoiceNoteAudioDownloadView
+
+
+class AsyncVoiceNoteAudioDownloadView(AsyncAPIView):
+    """Async `VoiceNoteAudioDownloadView`, streaming the audio without holding
+    a thread for the request"""
+
+    sync_view = VoiceNoteAudioDownloadView
+
+    @inject
+    async def get(
+        self,
+        request,
+        booking_id,
+        pk,
+        file_storage: FileStorage = Provide[ApplicationContainer.file_storage],
+    ):
+        try:
+            voice_note = await VoiceNote.objects.aget(booking_id=booking_id, pk=pk)
+        except VoiceNote.DoesNotExist:
+            raise NotFound
+
+        try:
+            download = AudioDownload(request, voice_note, file_storage)
+        except FileNotFoundError:
+            return self.respond(
+                {"message": "Audio file not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return await download.aresponse()
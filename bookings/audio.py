@@ -0,0 +1,210 @@
+import asyncio
+import re
+from typing import BinaryIO
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseBase,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response
+from django.utils.http import (
+    content_disposition_header,
+    http_date,
+    parse_http_date_safe,
+    quote_etag,
+)
+
+from accommodation_booking.application.protocols.file_storage import FileStorage
+
+from .models import VoiceNote
+
+# Bytes read from the file at a time when it is not handed to the server whole
+CHUNK_SIZE = 64 * 2**10
+
+BYTE_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class FileRange:
+    """The next `length` bytes of `file`, read like a file"""
+
+    def __init__(self, file: BinaryIO, length: int):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        chunk = self.file.read(size)
+        self.remaining -= len(chunk)
+        return chunk
+
+    def close(self):
+        self.file.close()
+
+
+async def aread_range(file: BinaryIO, start: int, stop: int):
+    """Bytes `start` to `stop` of `file`, read off the event loop"""
+    try:
+        file.seek(start)
+        remaining = stop - start
+        while remaining:
+            chunk = await asyncio.to_thread(file.read, min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+class AudioDownload:
+    """Response to a download of a voice note's audio.
+
+    Conditional requests are answered from the ETag and Last-Modified of the
+    file, and a single byte range with 206 Partial Content so players can
+    seek. The ETag is the SHA-256 recorded on upload, or else derived from the
+    size and modification time of the file.
+
+    With `AUDIO_ACCEL_REDIRECT_PREFIX` set, the transfer is left to the front
+    proxy with `X-Accel-Redirect`, ranges included.
+
+    Raises `FileNotFoundError` when the audio is not stored.
+    """
+
+    def __init__(self, request, voice_note: VoiceNote, file_storage: FileStorage):
+        self.request = request
+        self.file_storage = file_storage
+        self.file_id = voice_note.storage_key.as_string()
+        self.file_name = voice_note.file_name or self.file_id
+        self.content_type = voice_note.file_type or "application/octet-stream"
+
+        stat = file_storage.path(self.file_id).stat()
+        self.size = stat.st_size
+        self.last_modified = int(stat.st_mtime)
+        self.etag = quote_etag(
+            voice_note.file_sha256 or f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+        )
+
+    def response(self) -> HttpResponseBase:
+        """Response of a sync view.
+
+        Whole files are handed to the WSGI server's `wsgi.file_wrapper`, which
+        can send them with `sendfile`; ranges are read a chunk at a time.
+        """
+        response = self.bodiless_response()
+        if response is not None:
+            return response
+
+        start, stop = self.byte_range()
+        file = self.file_storage.open_stream(self.file_id)
+        if stop - start < self.size:
+            file.seek(start)
+            file = FileRange(file, stop - start)
+        response = FileResponse(
+            file,
+            content_type=self.content_type,
+            as_attachment=True,
+            filename=self.file_name,
+        )
+        response.block_size = CHUNK_SIZE
+        return self.describe(response, start, stop)
+
+    async def aresponse(self) -> HttpResponseBase:
+        """Response of an async view, read a chunk at a time in a thread.
+
+        Django's ASGI handler would read a file-like content whole before
+        sending it, so the content is an async iterator.
+        """
+        response = self.bodiless_response()
+        if response is not None:
+            return response
+
+        start, stop = self.byte_range()
+        file = self.file_storage.open_stream(self.file_id)
+        response = StreamingHttpResponse(
+            aread_range(file, start, stop), content_type=self.content_type
+        )
+        response["Content-Disposition"] = content_disposition_header(
+            True, self.file_name
+        )
+        return self.describe(response, start, stop)
+
+    def bodiless_response(self) -> HttpResponseBase | None:
+        """304 or 412 for conditional requests, 416 for ranges past the end of
+        the file, or the redirect to the front proxy"""
+        response = get_conditional_response(
+            self.request, etag=self.etag, last_modified=self.last_modified
+        )
+        if response is None:
+            try:
+                self.byte_range()
+            except RangeNotSatisfiable:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{self.size}"
+        if response is None and settings.AUDIO_ACCEL_REDIRECT_PREFIX:
+            response = HttpResponse(content_type=self.content_type)
+            response["X-Accel-Redirect"] = (
+                settings.AUDIO_ACCEL_REDIRECT_PREFIX.rstrip("/")
+                + "/"
+                + quote(self.file_id)
+            )
+            response["Content-Disposition"] = content_disposition_header(
+                True, self.file_name
+            )
+        if response is not None:
+            response["ETag"] = self.etag
+            response["Last-Modified"] = http_date(self.last_modified)
+        return response
+
+    def byte_range(self) -> tuple[int, int]:
+        """Start and stop of the bytes to send: the `Range` requested, or the
+        whole file.
+
+        Only single ranges are served; several ranges, malformed ones, and
+        ranges of a file changed since the `If-Range` validator get the whole
+        file. Raises `RangeNotSatisfiable` for ranges starting past the end.
+        """
+        whole = 0, self.size
+        match = BYTE_RANGE.fullmatch(self.request.headers.get("Range", "").strip())
+        if match is None or not any(match.groups()) or not self.is_unchanged():
+            return whole
+
+        first, last = match.groups()
+        if not first:
+            # The last `last` bytes
+            if int(last) == 0:
+                raise RangeNotSatisfiable
+            return max(self.size - int(last), 0), self.size
+        start = int(first)
+        if last and int(last) < start:
+            return whole
+        if start >= self.size:
+            raise RangeNotSatisfiable
+        return start, min(int(last) + 1, self.size) if last else self.size
+
+    def is_unchanged(self) -> bool:
+        """Whether the file still matches the `If-Range` validator, if any"""
+        validator = self.request.headers.get("If-Range", "").strip()
+        if not validator:
+            return True
+        if validator.startswith(('"', "W/")):
+            return validator == self.etag
+        return parse_http_date_safe(validator) == self.last_modified
+
+    def describe(self, response: HttpResponseBase, start: int, stop: int):
+        response["Accept-Ranges"] = "bytes"
+        response["ETag"] = self.etag
+        response["Last-Modified"] = http_date(self.last_modified)
+        response["Content-Length"] = stop - start
+        if stop - start < self.size:
+            response.status_code = 206
+            response["Content-Range"] = f"bytes {start}-{stop - 1}/{self.size}"
+        return response
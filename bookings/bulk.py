@@ -0,0 +1,150 @@
+from collections import defaultdict
+from datetime import date
+from typing import Any
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+
+from accommodations.models import Accommodation
+
+from .inventory import take_rooms
+from .locks import lock_accommodations
+from .models import Booking, is_overlap_violation
+from .signals import bump_bookings_version
+
+ALREADY_BOOKED = "Accommodation already booked for the selected date"
+NO_ROOMS_LEFT = "No rooms left for the selected dates"
+
+# Indices of the given items overlapping an existing apartment booking
+EXISTING_OVERLAPS_SQL = """
+SELECT DISTINCT item.index
+FROM unnest(%s::integer[], %s::bigint[], %s::date[], %s::date[])
+    AS item(index, accommodation_id, start_date, end_date)
+JOIN booking
+    ON booking.accommodation_id = item.accommodation_id
+    AND booking.accommodation_type = 'apartment'
+    AND booking.start_date < item.end_date
+    AND booking.end_date > item.start_date
+"""
+
+# A booking committed concurrently between the overlap check and the insert
+# makes the insert fail; the check is repeated so it reports that booking.
+# With BOOKING_ADVISORY_LOCKS the apartments are locked first, so it cannot.
+ATTEMPTS = 3
+
+Errors = dict[int, dict[str, list[str]]]
+
+
+def create_bookings(
+    items: dict[int, dict[str, Any]],
+) -> tuple[dict[int, Booking], Errors]:
+    """Create the bookings of a batch in one transaction.
+
+    `items` maps item positions to validated booking data. Returns the created
+    bookings and the errors of the rejected items, both keyed by position.
+    Items referencing unknown accommodations, overlapping an existing or
+    another item's apartment booking, or taking a hotel room on a night
+    without one left are rejected; the rest are created.
+    """
+    errors: Errors = {}
+    accommodations = Accommodation.objects.in_bulk(
+        {item["accommodation_id"] for item in items.values()}
+    )
+    candidates = {}
+    for index, item in items.items():
+        accommodation = accommodations.get(item["accommodation_id"])
+        if accommodation is None:
+            errors[index] = {"accommodation_id": ["Invalid accommodation ID"]}
+            continue
+        candidates[index] = Booking(
+            accommodation=accommodation,
+            accommodation_type=accommodation.type,
+            start_date=item["start_date"],
+            end_date=item["end_date"],
+            guest_name=item["guest_name"],
+        )
+
+    for attempt in range(ATTEMPTS):
+        try:
+            with transaction.atomic():
+                if settings.BOOKING_ADVISORY_LOCKS:
+                    lock_accommodations(
+                        booking.accommodation_id
+                        for booking in candidates.values()
+                        if booking.accommodation_type
+                        == Accommodation.AccommodationType.APARTMENT
+                    )
+                for index in _existing_overlaps(candidates):
+                    errors[index] = {"non_field_errors": [ALREADY_BOOKED]}
+                    del candidates[index]
+                for index, other in _batch_overlaps(candidates).items():
+                    errors[index] = {
+                        "non_field_errors": [f"Overlaps item {other} of this batch"]
+                    }
+                    del candidates[index]
+                for index in _sold_out(candidates):
+                    errors[index] = {"non_field_errors": [NO_ROOMS_LEFT]}
+                    del candidates[index]
+                Booking.objects.bulk_create(candidates.values())
+                bump_bookings_version(
+                    *{booking.accommodation_id for booking in candidates.values()}
+                )
+        except IntegrityError as ex:
+            if not is_overlap_violation(ex) or attempt == ATTEMPTS - 1:
+                raise
+        else:
+            return candidates, errors
+
+
+def _existing_overlaps(candidates: dict[int, Booking]) -> list[int]:
+    """Positions of the apartment candidates overlapping stored bookings"""
+    apartments = [
+        (index, booking.accommodation_id, booking.start_date, booking.end_date)
+        for index, booking in candidates.items()
+        if booking.accommodation_type == Accommodation.AccommodationType.APARTMENT
+    ]
+    if not apartments:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            EXISTING_OVERLAPS_SQL, [list(column) for column in zip(*apartments)]
+        )
+        return [index for (index,) in cursor.fetchall()]
+
+
+def _sold_out(candidates: dict[int, Booking]) -> list[int]:
+    """Positions of the hotel candidates finding no room left, in the order of
+    the batch; the others take their rooms"""
+    hotels = [
+        index
+        for index, booking in candidates.items()
+        if booking.accommodation.has_room_inventory
+    ]
+    sold_out = take_rooms([candidates[index].stay for index in hotels])
+    return [hotels[position] for position in sold_out]
+
+
+def _batch_overlaps(candidates: dict[int, Booking]) -> dict[int, int]:
+    """Map apartment candidates overlapping an earlier-starting one to it.
+
+    Candidates are swept per apartment in start order; each one is kept unless
+    it starts before the latest end among the kept ones.
+    """
+    by_apartment: dict[int, list[int]] = defaultdict(list)
+    for index, booking in candidates.items():
+        if booking.accommodation_type == Accommodation.AccommodationType.APARTMENT:
+            by_apartment[booking.accommodation_id].append(index)
+
+    overlaps = {}
+    for indices in by_apartment.values():
+        indices.sort(key=lambda index: (candidates[index].start_date, index))
+        reached: date | None = None
+        reached_by = None
+        for index in indices:
+            booking = candidates[index]
+            if reached is not None and booking.start_date < reached:
+                overlaps[index] = reached_by
+            else:
+                reached, reached_by = booking.end_date, index
+    return overlaps
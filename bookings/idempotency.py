@@ -0,0 +1,128 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import wraps
+from hashlib import sha256
+
+import orjson
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import connection
+from django.http import QueryDict
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Session-level, so the lock is held across the transactions of the request
+# and released by the server if the connection drops mid-request
+LOCK_SQL = "SELECT pg_advisory_lock(hashtextextended(%s, 0))"
+UNLOCK_SQL = "SELECT pg_advisory_unlock(hashtextextended(%s, 0))"
+
+
+def expiry_cutoff() -> datetime:
+    """Responses stored before this are no longer replayed"""
+    return timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+
+
+def fingerprint(request) -> str:
+    """SHA-256 of the parsed request data, uploaded files by their content"""
+    data = request.data
+    if isinstance(data, QueryDict):
+        data = {
+            name: [
+                file_digest(value) if isinstance(value, UploadedFile) else value
+                for value in values
+            ]
+            for name, values in data.lists()
+        }
+    return sha256(orjson.dumps(data, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def file_digest(file: UploadedFile) -> str:
+    digest = sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+@contextmanager
+def key_lock(name: str):
+    """Wait for the requests holding the same key to finish"""
+    with connection.cursor() as cursor:
+        cursor.execute(LOCK_SQL, [name])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(UNLOCK_SQL, [name])
+
+
+def idempotent(handler):
+    """Replay the response of a view method to retries with the same key.
+
+    Requests without an `Idempotency-Key` header run as usual. Otherwise the
+    first request with a key runs the handler and its response is stored,
+    unless it is a server error; requests with the same key, method and path
+    until it expires get the stored response back without running the
+    handler, or 422 if their data differs. A duplicate sent while the first
+    request is running waits for it to finish.
+    """
+
+    @wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return handler(self, request, *args, **kwargs)
+        if not 0 < len(key) <= MAX_KEY_LENGTH:
+            raise serializers.ValidationError(
+                {IDEMPOTENCY_HEADER: [f"Must be 1 to {MAX_KEY_LENGTH} characters"]}
+            )
+
+        scope = f"{request.method} {request.path}"
+        request_fingerprint = fingerprint(request)
+        with key_lock(f"{scope}\n{key}"):
+            stored = IdempotencyKey.objects.filter(scope=scope, key=key).first()
+            if stored is not None and stored.created_at <= expiry_cutoff():
+                stored.delete()
+                stored = None
+
+            if stored is not None:
+                if stored.fingerprint != request_fingerprint:
+                    return Response(
+                        {
+                            "message": f"{IDEMPOTENCY_HEADER} already used for "
+                            "a different request"
+                        },
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                response = Response(stored.data, status=stored.status_code)
+                response[REPLAYED_HEADER] = "true"
+                return response
+
+            try:
+                response = handler(self, request, *args, **kwargs)
+            except Exception as ex:
+                response = self.handle_exception(ex)
+            if response.status_code < status.HTTP_500_INTERNAL_SERVER_ERROR:
+                IdempotencyKey.objects.create(
+                    key=key,
+                    scope=scope,
+                    fingerprint=request_fingerprint,
+                    status_code=response.status_code,
+                    data=response.data,
+                )
+            return response
+
+    return wrapper
+
+
+def purge_expired() -> int:
+    """Delete the stored responses that are no longer replayed"""
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lte=expiry_cutoff()).delete()
+    return deleted
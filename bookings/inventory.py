@@ -0,0 +1,190 @@
+from datetime import date
+
+from django.db import connection
+
+# Inventory rows for the nights of each stay that have none yet, with every
+# room free. Only hotels with a room count get rows.
+ADD_NIGHTS_SQL = """
+INSERT INTO room_inventory (accommodation_id, night, remaining)
+SELECT accommodation.id, night::date, accommodation.rooms
+FROM unnest(%s::bigint[], %s::date[], %s::date[])
+    AS stay(accommodation_id, start_date, end_date)
+JOIN accommodation ON accommodation.id = stay.accommodation_id
+CROSS JOIN LATERAL generate_series(
+    stay.start_date::timestamp,
+    stay.end_date::timestamp - interval '1 day',
+    interval '1 day'
+) AS night
+WHERE accommodation.type = 'hotel' AND accommodation.rooms IS NOT NULL
+ON CONFLICT (accommodation_id, night) DO NOTHING
+"""
+
+# One room taken on every night of a stay that has one left. Rows are locked
+# in night order, so bookings racing for overlapping stays queue up on the
+# first shared night instead of deadlocking, and `remaining > 0` is checked
+# again on the row version left by the booking they waited for.
+TAKE_ROOMS_SQL = """
+WITH available AS (
+    SELECT id
+    FROM room_inventory
+    WHERE accommodation_id = %(accommodation_id)s
+        AND night >= %(start_date)s
+        AND night < %(end_date)s
+        AND remaining > 0
+    ORDER BY night
+    FOR UPDATE
+),
+taken AS (
+    UPDATE room_inventory
+    SET remaining = remaining - 1
+    FROM available
+    WHERE room_inventory.id = available.id
+    RETURNING room_inventory.id
+)
+SELECT array_agg(id), %(end_date)s::date - %(start_date)s::date
+FROM taken
+"""
+
+UNDO_TAKE_ROOMS_SQL = """
+UPDATE room_inventory SET remaining = remaining + 1 WHERE id = ANY(%s)
+"""
+
+RETURN_ROOMS_SQL = """
+WITH taken AS (
+    SELECT id
+    FROM room_inventory
+    WHERE accommodation_id = %(accommodation_id)s
+        AND night >= %(start_date)s
+        AND night < %(end_date)s
+    ORDER BY night
+    FOR UPDATE
+)
+UPDATE room_inventory
+SET remaining = remaining + 1
+FROM taken
+WHERE room_inventory.id = taken.id
+"""
+
+# Whether a night of a stay has no room left, not counting the room taken by
+# the excluded booking
+SOLD_OUT_SQL = """
+SELECT EXISTS (
+    SELECT 1
+    FROM room_inventory
+    WHERE accommodation_id = %(accommodation_id)s
+        AND night >= %(start_date)s
+        AND night < %(end_date)s
+        AND remaining = 0
+        AND NOT EXISTS (
+            SELECT 1
+            FROM booking
+            WHERE booking.id = %(exclude_booking_id)s
+                AND booking.accommodation_id = room_inventory.accommodation_id
+                AND booking.start_date <= room_inventory.night
+                AND booking.end_date > room_inventory.night
+        )
+)
+"""
+
+DELETE_INVENTORY_SQL = """
+DELETE FROM room_inventory WHERE accommodation_id = %(accommodation_id)s
+"""
+
+# Rooms left on every booked night of a hotel, counted from its bookings
+REBUILD_INVENTORY_SQL = """
+INSERT INTO room_inventory (accommodation_id, night, remaining)
+SELECT accommodation.id, night::date, accommodation.rooms - COUNT(*)
+FROM accommodation
+JOIN booking ON booking.accommodation_id = accommodation.id
+CROSS JOIN LATERAL generate_series(
+    booking.start_date::timestamp,
+    booking.end_date::timestamp - interval '1 day',
+    interval '1 day'
+) AS night
+WHERE accommodation.id = %(accommodation_id)s
+    AND accommodation.type = 'hotel'
+    AND accommodation.rooms IS NOT NULL
+GROUP BY accommodation.id, night
+"""
+
+Stay = tuple[int, date, date]
+
+
+class NoRoomsLeft(Exception):
+    """A hotel has no room left on a night of the stay being booked"""
+
+
+def take_rooms(stays: list[Stay]) -> list[int]:
+    """Take a room on every night of each (accommodation_id, start, end) stay.
+
+    Stays are booked in order, each one all or nothing, so later stays see the
+    rooms taken by earlier ones. Returns the positions of the stays that found
+    a night without a room left. Must run in the transaction writing the
+    bookings, which the row locks are held until.
+    """
+    if not stays:
+        return []
+
+    sold_out = []
+    with connection.cursor() as cursor:
+        cursor.execute(ADD_NIGHTS_SQL, [list(column) for column in zip(*stays)])
+        for position, (accommodation_id, start_date, end_date) in enumerate(stays):
+            cursor.execute(
+                TAKE_ROOMS_SQL,
+                {
+                    "accommodation_id": accommodation_id,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                },
+            )
+            taken, nights = cursor.fetchone()
+            if len(taken or []) < nights:
+                sold_out.append(position)
+                if taken:
+                    cursor.execute(UNDO_TAKE_ROOMS_SQL, [taken])
+    return sold_out
+
+
+def return_rooms(accommodation_id: int, start_date: date, end_date: date):
+    """Give back the rooms taken by a stay"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            RETURN_ROOMS_SQL,
+            {
+                "accommodation_id": accommodation_id,
+                "start_date": start_date,
+                "end_date": end_date,
+            },
+        )
+
+
+def is_sold_out(
+    accommodation_id: int,
+    start_date: date,
+    end_date: date,
+    exclude_booking_id: int | None = None,
+) -> bool:
+    """Whether a hotel has no room left on a night of [start_date, end_date)"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            SOLD_OUT_SQL,
+            {
+                "accommodation_id": accommodation_id,
+                "start_date": start_date,
+                "end_date": end_date,
+                "exclude_booking_id": exclude_booking_id,
+            },
+        )
+        return cursor.fetchone()[0]
+
+
+def rebuild_inventory(accommodation_id: int):
+    """Recount the rooms left of a hotel from its bookings.
+
+    Fails with an `IntegrityError` on the `room_inventory_remaining_non_negative`
+    constraint when a night has more bookings than rooms.
+    """
+    params = {"accommodation_id": accommodation_id}
+    with connection.cursor() as cursor:
+        cursor.execute(DELETE_INVENTORY_SQL, params)
+        cursor.execute(REBUILD_INVENTORY_SQL, params)
@@ -0,0 +1,32 @@
+from time import perf_counter
+from typing import Iterable
+
+from django.db import connection
+
+from accommodation_booking.metrics import histogram
+
+# unnest emits the ids in array order, so the locks are taken in id order and
+# writers locking several accommodations cannot deadlock each other
+LOCK_ACCOMMODATIONS_SQL = """
+SELECT pg_advisory_xact_lock(id) FROM unnest(%s::bigint[]) AS id
+"""
+
+lock_wait = histogram(
+    "booking_lock_wait_seconds",
+    "Time booking writes waited for the advisory locks of their accommodations",
+)
+
+
+def lock_accommodations(accommodation_ids: Iterable[int]):
+    """Wait until no other transaction writes bookings of the accommodations.
+
+    The locks are held until the current transaction ends, so they must be
+    taken inside the one checking for overlaps and inserting the bookings.
+    """
+    ids = sorted(set(accommodation_ids))
+    if not ids:
+        return
+    started = perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute(LOCK_ACCOMMODATIONS_SQL, [ids])
+    lock_wait.observe(perf_counter() - started)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from bookings.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the stored responses to Idempotency-Key requests older than "
+        "IDEMPOTENCY_KEY_TTL, to be run periodically"
+    )
+
+    def handle(self, *args, **options):
+        deleted = purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} idempotency keys"))
@@ -0,0 +1,58 @@
+# Generated by Django 5.0 on 2026-10-18 07:05
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+import bookings.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accommodations", "0004_accommodation_bookings_version"),
+        ("bookings", "0005_voicenote_created_at"),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddField(
+            model_name="booking",
+            name="accommodation_type",
+            field=models.CharField(
+                choices=[("apartment", "Apartment"), ("hotel", "Hotel")],
+                default="apartment",
+                editable=False,
+                max_length=20,
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE booking
+                SET accommodation_type = accommodation.type
+                FROM accommodation
+                WHERE accommodation.id = booking.accommodation_id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="booking",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(("accommodation_type", "apartment")),
+                expressions=[
+                    ("accommodation", "="),
+                    (
+                        bookings.models.DateRange(
+                            "start_date",
+                            "end_date",
+                            django.contrib.postgres.fields.ranges.RangeBoundary(),
+                        ),
+                        "&&",
+                    ),
+                ],
+                name="booking_apartment_no_overlap",
+            ),
+        ),
+    ]
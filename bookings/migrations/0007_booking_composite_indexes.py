@@ -0,0 +1,38 @@
+# Generated by Django 5.0 on 2026-10-18 06:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accommodations", "0006_accommodation_type_id"),
+        ("bookings", "0006_booking_apartment_no_overlap"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["accommodation", "start_date", "end_date"],
+                name="booking_accommodation_dates",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["accommodation", "end_date"], name="booking_accommodation_end"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="booking",
+            name="accommodation",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="bookings",
+                to="accommodations.accommodation",
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.0 on 2026-10-18 07:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accommodations", "0006_accommodation_type_id"),
+        ("bookings", "0007_booking_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OccupancyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField(help_text="First day of the month")),
+                ("booked_nights", models.PositiveIntegerField()),
+                (
+                    "accommodation",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occupancy",
+                        to="accommodations.accommodation",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "occupancy_rollup",
+                "ordering": ["accommodation", "month"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="occupancyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("accommodation", "month"),
+                name="occupancy_rollup_accommodation_month",
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.0 on 2026-10-18 07:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accommodations", "0007_accommodation_rooms"),
+        ("bookings", "0008_occupancy_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomInventory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("night", models.DateField()),
+                ("remaining", models.IntegerField()),
+                (
+                    "accommodation",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inventory",
+                        to="accommodations.accommodation",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "room_inventory",
+                "ordering": ["accommodation", "night"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("remaining", 0)),
+                        fields=["accommodation", "night"],
+                        name="room_inventory_sold_out",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="roominventory",
+            constraint=models.UniqueConstraint(
+                fields=("accommodation", "night"),
+                name="room_inventory_accommodation_night",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="roominventory",
+            constraint=models.CheckConstraint(
+                check=models.Q(("remaining__gte", 0)),
+                name="room_inventory_remaining_non_negative",
+            ),
+        ),
+    ]
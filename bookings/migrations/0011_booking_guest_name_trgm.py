@@ -0,0 +1,26 @@
+# Generated by Django 5.0 on 2026-10-18 08:24
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accommodations", "0008_accommodation_text_search"),
+        ("bookings", "0010_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("guest_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="booking_guest_name_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0 on 2026-10-18 08:33
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0011_booking_guest_name_trgm"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="voicenote",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "transcript", config="english"
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voicenote",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="voicenote_search_vector"
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0 on 2026-10-18 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0012_voicenote_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="voicenote",
+            name="file_sha256",
+            field=models.CharField(
+                blank=True,
+                help_text="SHA-256 of the stored audio, in hex",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="voicenote",
+            name="file_size",
+            field=models.PositiveBigIntegerField(
+                blank=True, help_text="Bytes of the stored audio", null=True
+            ),
+        ),
+    ]
@@ -1,8 +1,38 @@
-from django.db import models
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, RangeBoundary, RangeOperators
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
 
+from accommodation_booking.text_search import SEARCH_CONFIG, trigram_index
 from accommodations.models import Accommodation
+from bookings.inventory import NoRoomsLeft, return_rooms, take_rooms
 from bookings.valueobjects import VoiceNoteStorageKey
 
+APARTMENT_OVERLAP_CONSTRAINT = "booking_apartment_no_overlap"
+ROOMS_LEFT_CONSTRAINT = "room_inventory_remaining_non_negative"
+
+
+class DateRange(models.Func):
+    function = "DATERANGE"
+    output_field = DateRangeField()
+
+
+class BookingQuerySet(models.QuerySet):
+    def apartment_overlaps(self, start_date, end_date):
+        """Apartment bookings sharing at least one night with [start_date, end_date)
+
+        The range expression matches the one of the overlap constraint, so the
+        lookup is answered from its GiST index.
+        """
+        return self.alias(
+            period=DateRange("start_date", "end_date", RangeBoundary())
+        ).filter(
+            accommodation_type=Accommodation.AccommodationType.APARTMENT,
+            period__overlap=(start_date, end_date),
+        )
+
 
 class Booking(models.Model):
     """Booking model"""
@@ -11,19 +41,111 @@ class Booking(models.Model):
         Accommodation,
         on_delete=models.CASCADE,
         related_name="bookings",
+        # Covered by the composite indexes below
+        db_index=False,
     )
     start_date = models.DateField()
     end_date = models.DateField()
     guest_name = models.CharField(max_length=255)
+    # Copied from the accommodation so the overlap constraint can be scoped to apartments
+    accommodation_type = models.CharField(
+        max_length=20,
+        choices=Accommodation.AccommodationType,
+        editable=False,
+    )
+
+    objects = BookingQuerySet.as_manager()
+
+    _loaded_accommodation_id: int | None = None
+    _loaded_stay: tuple | None = None
 
     class Meta:
         db_table = "booking"
         ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["accommodation", "start_date", "end_date"],
+                name="booking_accommodation_dates",
+            ),
+            models.Index(
+                fields=["accommodation", "end_date"],
+                name="booking_accommodation_end",
+            ),
+            trigram_index("guest_name", "booking_guest_name_trgm"),
+        ]
+        constraints = [
+            ExclusionConstraint(
+                name=APARTMENT_OVERLAP_CONSTRAINT,
+                expressions=[
+                    ("accommodation", RangeOperators.EQUAL),
+                    (
+                        DateRange("start_date", "end_date", RangeBoundary()),
+                        RangeOperators.OVERLAPS,
+                    ),
+                ],
+                condition=models.Q(
+                    accommodation_type=Accommodation.AccommodationType.APARTMENT
+                ),
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so moving a booking also invalidates its previous accommodation
+        instance._loaded_accommodation_id = instance.__dict__.get("accommodation_id")
+        # and moving a hotel booking gives its rooms back
+        if (
+            instance.__dict__.get("accommodation_type")
+            == Accommodation.AccommodationType.HOTEL
+        ):
+            instance._loaded_stay = instance.stay
+        return instance
+
+    @property
+    def stay(self) -> tuple:
+        return (self.accommodation_id, self.start_date, self.end_date)
+
+    def save(self, *args, **kwargs):
+        self.accommodation_type = self.accommodation.type
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            self._update_rooms()
+
+    def _update_rooms(self):
+        """Move the rooms taken by the booking to its current stay.
+
+        Raises `NoRoomsLeft`, rolling the save back, when the hotel is full on
+        one of the nights.
+        """
+        if self._loaded_stay == self.stay:
+            return
+        if self._loaded_stay is not None:
+            return_rooms(*self._loaded_stay)
+        if self.accommodation.has_room_inventory and take_rooms([self.stay]):
+            raise NoRoomsLeft(self.accommodation_id)
+        if self.accommodation_type == Accommodation.AccommodationType.HOTEL:
+            self._loaded_stay = self.stay
 
     def __str__(self):
         return f"{self.guest_name} - {self.accommodation.name} ({self.start_date} to {self.end_date})"
 
 
+def violated_constraint(error: IntegrityError) -> str | None:
+    diag = getattr(error.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None)
+
+
+def is_overlap_violation(error: IntegrityError) -> bool:
+    """Whether a write failed because it overlaps an apartment booking"""
+    return violated_constraint(error) == APARTMENT_OVERLAP_CONSTRAINT
+
+
+def is_rooms_left_violation(error: IntegrityError) -> bool:
+    """Whether a write failed because a hotel has more bookings than rooms"""
+    return violated_constraint(error) == ROOMS_LEFT_CONSTRAINT
+
+
 class VoiceNote(models.Model):
     """Voice note model"""
 
@@ -45,15 +167,134 @@ class VoiceNote(models.Model):
     )
     file_name = models.TextField(blank=True)
     file_type = models.CharField(max_length=30, blank=True)
+    file_size = models.PositiveBigIntegerField(
+        null=True, blank=True, help_text="Bytes of the stored audio"
+    )
+    file_sha256 = models.CharField(
+        max_length=64, blank=True, help_text="SHA-256 of the stored audio, in hex"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Words of the transcript, recomputed by the update that stores it
+    search_vector = models.GeneratedField(
+        expression=SearchVector("transcript", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     @property
     def storage_key(self) -> VoiceNoteStorageKey:
-        return VoiceNoteStorageKey(self.booking.id, self.id)
+        return VoiceNoteStorageKey(self.booking_id, self.id)
 
     class Meta:
         db_table = "voicenote"
         ordering = ["id"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="voicenote_search_vector"),
+        ]
 
     def __str__(self):
         return f"Voice note for {self.booking.guest_name} - {self.status}"
+
+
+class OccupancyRollup(models.Model):
+    """Booked nights of an accommodation in a calendar month.
+
+    Derived from the bookings and only kept up to date when
+    `ANALYTICS_ROLLUP` is enabled; see `accommodations.analytics`.
+    """
+
+    accommodation = models.ForeignKey(
+        Accommodation,
+        on_delete=models.CASCADE,
+        related_name="occupancy",
+        db_index=False,
+    )
+    month = models.DateField(help_text="First day of the month")
+    booked_nights = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = "occupancy_rollup"
+        ordering = ["accommodation", "month"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["accommodation", "month"],
+                name="occupancy_rollup_accommodation_month",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.accommodation_id} {self.month:%Y-%m}: {self.booked_nights} nights"
+        )
+
+
+class RoomInventory(models.Model):
+    """Rooms left in a hotel on one night.
+
+    Only hotels with a room count have an inventory. A row is added with
+    every room free the first time a booking covers its night, and each
+    booking takes one room on each of its nights; see `bookings.inventory`.
+    """
+
+    accommodation = models.ForeignKey(
+        Accommodation,
+        on_delete=models.CASCADE,
+        related_name="inventory",
+        db_index=False,
+    )
+    night = models.DateField()
+    remaining = models.IntegerField()
+
+    class Meta:
+        db_table = "room_inventory"
+        ordering = ["accommodation", "night"]
+        indexes = [
+            models.Index(
+                fields=["accommodation", "night"],
+                condition=models.Q(remaining=0),
+                name="room_inventory_sold_out",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["accommodation", "night"],
+                name="room_inventory_accommodation_night",
+            ),
+            models.CheckConstraint(
+                check=models.Q(remaining__gte=0),
+                name=ROOMS_LEFT_CONSTRAINT,
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.accommodation_id} {self.night}: {self.remaining} rooms left"
+
+
+class IdempotencyKey(models.Model):
+    """Response to a POST sent with an `Idempotency-Key` header.
+
+    Replayed to retries of the same request until it expires; see
+    `bookings.idempotency`.
+    """
+
+    key = models.CharField(max_length=255)
+    scope = models.CharField(max_length=255, help_text="Method and path of the request")
+    fingerprint = models.CharField(
+        max_length=64, help_text="SHA-256 of the request data"
+    )
+    status_code = models.PositiveSmallIntegerField()
+    data = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "idempotency_key"
+        ordering = ["id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "key"],
+                name="idempotency_key_scope_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.key}: {self.status_code}"
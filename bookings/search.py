@@ -0,0 +1,118 @@
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, FloatField, Q, QuerySet, TextField, Value
+from django.db.models.functions import Cast, Replace
+
+from accommodation_booking.text_search import SEARCH_CONFIG, matches_text, text_query
+from accommodations.models import Accommodation
+from accommodations.search import text_filter
+
+# Marks around the matched words of a headline
+HEADLINE_START = "<mark>"
+HEADLINE_STOP = "</mark>"
+
+# Marks ts_headline puts around the matched words instead: control characters,
+# which outlast the escaping of the headline and are taken out of transcripts
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+# As `django.utils.html.escape`
+HTML_ESCAPES = [
+    ("&", "&amp;"),
+    ("<", "&lt;"),
+    (">", "&gt;"),
+    ('"', "&quot;"),
+    ("'", "&#x27;"),
+]
+
+
+def guest_rank(text: str):
+    """Similarity of a booking's guest name to `text`, in double precision as
+    `transcript_rank`"""
+    return Cast(TrigramWordSimilarity(text, "guest_name"), FloatField())
+
+
+def booking_filter(text: str) -> Q:
+    """Bookings whose guest name matches `text`, or whose accommodation does.
+
+    The matching accommodations are read first, so that both conditions are
+    answered from booking indexes rather than filtering a join.
+    """
+    accommodation_ids = list(
+        Accommodation.objects.filter(text_filter(text)).values_list("id", flat=True)
+    )
+    return matches_text("guest_name", text) | Q(accommodation_id__in=accommodation_ids)
+
+
+def search_bookings(queryset: QuerySet, text: str) -> QuerySet:
+    """Bookings whose guest name contains `text` or a word similar to it, the
+    closest first, with their `rank`"""
+    return (
+        queryset.filter(matches_text("guest_name", text))
+        .annotate(rank=guest_rank(text))
+        .order_by("-rank", "id")
+    )
+
+
+def transcript_filter(text: str) -> Q:
+    """Voice notes whose transcript has the words of `text`"""
+    return Q(search_vector=text_query(text))
+
+
+def transcript_rank(text: str):
+    """Relevance of a voice note's transcript to `text`.
+
+    Divided by the log of the transcript length, so long transcripts do not
+    outrank short ones by repeating words. Cast to double precision so the
+    rank read back compares equal to the one computed in SQL.
+    """
+    return Cast(
+        SearchRank(F("search_vector"), text_query(text), normalization=1),
+        FloatField(),
+    )
+
+
+def replace_all(expression, replacements):
+    for old, new in replacements:
+        expression = Replace(
+            expression, Value(old), Value(new), output_field=TextField()
+        )
+    return expression
+
+
+def transcript_headline(text: str):
+    """Fragments of the transcript around the words of `text`, HTML-escaped,
+    with the words marked"""
+    transcript = replace_all(
+        F("transcript"), [(HIGHLIGHT_START, ""), (HIGHLIGHT_STOP, "")]
+    )
+    headline = SearchHeadline(
+        transcript,
+        text_query(text),
+        config=SEARCH_CONFIG,
+        start_sel=HIGHLIGHT_START,
+        stop_sel=HIGHLIGHT_STOP,
+        max_fragments=3,
+        fragment_delimiter=" … ",
+    )
+    return replace_all(
+        headline,
+        [
+            *HTML_ESCAPES,
+            (HIGHLIGHT_START, HEADLINE_START),
+            (HIGHLIGHT_STOP, HEADLINE_STOP),
+        ],
+    )
+
+
+def search_voice_notes(queryset: QuerySet, text: str) -> QuerySet:
+    """Voice notes whose transcript has the words of `text`, the most relevant
+    first, with their `rank` and `headline`"""
+    return (
+        queryset.filter(transcript_filter(text))
+        .annotate(rank=transcript_rank(text), headline=transcript_headline(text))
+        .order_by("-rank", "id")
+    )
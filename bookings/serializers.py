@@ -1,14 +1,44 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, TextField, Value, When
+from django.db.models.functions import Concat, Left, Length
+from django.db.models.lookups import GreaterThan
 from rest_framework import serializers
 
 from accommodations.models import Accommodation
 
-from .models import Booking, VoiceNote
+from .inventory import NoRoomsLeft
+from .locks import lock_accommodations
+from .models import Booking, VoiceNote, is_overlap_violation
+
+ALREADY_BOOKED = "Accommodation already booked for the selected date"
+
+
+class AccommodationIdField(serializers.PrimaryKeyRelatedField):
+    """Accommodation referenced by id, loaded once per write.
+
+    When updating, the accommodation already loaded with the booking is reused
+    if the id does not change.
+    """
+
+    default_error_messages = {
+        "does_not_exist": "Invalid accommodation ID",
+    }
+
+    def __init__(self, **kwargs):
+        super().__init__(queryset=Accommodation.objects.all(), **kwargs)
+
+    def to_internal_value(self, data):
+        booking = self.parent.instance
+        if isinstance(booking, Booking) and str(data) == str(booking.accommodation_id):
+            return booking.accommodation
+        return super().to_internal_value(data)
 
 
 class BookingSerializer(serializers.ModelSerializer):
     """Serializer for Booking model"""
 
-    accommodation_id = serializers.IntegerField(write_only=True)
+    accommodation_id = AccommodationIdField(source="accommodation", write_only=True)
     accommodation = serializers.StringRelatedField(read_only=True)
 
     class Meta:
@@ -23,13 +53,15 @@ class BookingSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "accommodation"]
 
-    def validate_accommodation_id(self, value):
-        """Validate accommodation exists"""
-        try:
-            Accommodation.objects.get(id=value)
-        except Accommodation.DoesNotExist:
-            raise serializers.ValidationError("Invalid accommodation ID")
-        return value
+    # Output fields as columns, for list endpoints reading `values()`
+    read_columns = {
+        "id": "id",
+        # str() of an accommodation is its name
+        "accommodation": "accommodation__name",
+        "start_date": "start_date",
+        "end_date": "end_date",
+        "guest_name": "guest_name",
+    }
 
     def validate_guest_name(self, value):
         """Validate guest name length"""
@@ -47,35 +79,130 @@ class BookingSerializer(serializers.ModelSerializer):
         if start_date and end_date and end_date <= start_date:
             raise serializers.ValidationError("End date must be after start date")
 
-        accommodation_id = data.get("accommodation_id")
-        accommodation = Accommodation.objects.get(id=accommodation_id)
-        if accommodation.type == Accommodation.AccommodationType.APARTMENT:
-            queryset = Booking.objects.filter(
-                accommodation=accommodation,
-                start_date__lt=end_date,
-                end_date__gt=start_date,
-            )
-            if queryset.exists():
-                raise serializers.ValidationError("Accommodation already booked for the selected date")
-
         return data
 
     def create(self, validated_data):
         """Create booking with accommodation"""
-        accommodation_id = validated_data.pop("accommodation_id")
-        accommodation = Accommodation.objects.get(id=accommodation_id)
-
-        booking = Booking(accommodation=accommodation, **validated_data)
-        booking.save()
+        booking = Booking(**validated_data)
+        self._save(booking)
         return booking
 
+    def update(self, instance, validated_data):
+        """Update booking, moving it to another accommodation if requested"""
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        self._save(instance)
+        return instance
+
+    def _save(self, booking: Booking):
+        """Save booking, letting the database reject overlapping apartment
+        bookings and hotel bookings on nights without a room left.
+
+        With `BOOKING_ADVISORY_LOCKS`, apartment bookings are checked for
+        overlaps here instead, under the advisory lock of the apartment.
+        """
+        try:
+            with transaction.atomic():
+                if (
+                    settings.BOOKING_ADVISORY_LOCKS
+                    and booking.accommodation.type
+                    == Accommodation.AccommodationType.APARTMENT
+                ):
+                    lock_accommodations([booking.accommodation_id])
+                    if self._overlaps(booking):
+                        raise serializers.ValidationError(
+                            {"non_field_errors": [ALREADY_BOOKED]}
+                        )
+                booking.save()
+        except IntegrityError as ex:
+            if is_overlap_violation(ex):
+                raise serializers.ValidationError(
+                    {"non_field_errors": [ALREADY_BOOKED]}
+                )
+            raise
+        except NoRoomsLeft:
+            raise serializers.ValidationError(
+                {"non_field_errors": ["No rooms left for the selected dates"]}
+            )
+
+    @staticmethod
+    def _overlaps(booking: Booking) -> bool:
+        # Plain date comparisons, answered from the composite btree index of
+        # one accommodation rather than the GiST index of every booking
+        return (
+            Booking.objects.filter(
+                accommodation_id=booking.accommodation_id,
+                start_date__lt=booking.end_date,
+                end_date__gt=booking.start_date,
+            )
+            .exclude(pk=booking.pk)
+            .exists()
+        )
+
+
+class BulkBookingItemSerializer(BookingSerializer):
+    """Booking validated without database lookups, for the bulk import which
+    checks accommodations and overlaps for the whole batch at once"""
+
+    accommodation_id = serializers.IntegerField(write_only=True)
+
+
+# Characters of the transcript excerpts of voice-note lists
+TRANSCRIPT_EXCERPT_LENGTH = 200
+
+
+def transcript_excerpt(length: int = TRANSCRIPT_EXCERPT_LENGTH):
+    """The first `length` characters of the transcript, ending with an ellipsis
+    when it is cut"""
+    return Case(
+        When(
+            GreaterThan(Length("transcript"), length),
+            then=Concat(Left("transcript", length - 1), Value("…")),
+        ),
+        default=F("transcript"),
+        output_field=TextField(),
+    )
+
+
 class VoiceNoteSerializer(serializers.ModelSerializer):
     """Serializer for VoiceNote model"""
 
-    booking_id = serializers.IntegerField(source="booking.id")
+    # Read from the foreign key column, without loading the booking
+    booking_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = VoiceNote
-        fields = ["id", "booking_id", "transcript", "status", "file_name", "file_type", "created_at"]
-        read_only_fields = ["id", "booking_id", "transcript", "status", "file_name", "file_type", "created_at"]
-
+        fields = ["id", "booking_id", "transcript", "status", "file_name", "file_type", "file_size", "file_sha256", "created_at"]
+        read_only_fields = ["id", "booking_id", "transcript", "status", "file_name", "file_type", "file_size", "file_sha256", "created_at"]
+
+    # Output fields as columns, for list endpoints reading `values()`
+    read_columns = {
+        "id": "id",
+        "booking_id": "booking_id",
+        "transcript": "transcript",
+        "status": "status",
+        "file_name": "file_name",
+        "file_type": "file_type",
+        "file_size": "file_size",
+        "file_sha256": "file_sha256",
+        "created_at": "created_at",
+    }
+
+
+class VoiceNoteSearchResultSerializer(VoiceNoteSerializer):
+    """Voice note found by a transcript search"""
+
+    rank = serializers.FloatField(
+        read_only=True, help_text="Relevance to the search, higher first"
+    )
+    headline = serializers.CharField(
+        read_only=True,
+        help_text=(
+            "Fragments of the transcript around the matched words, which are "
+            "wrapped in <mark></mark>. The transcript text is HTML-escaped"
+        ),
+    )
+
+    class Meta(VoiceNoteSerializer.Meta):
+        fields = [*VoiceNoteSerializer.Meta.fields, "rank", "headline"]
+        read_only_fields = fields
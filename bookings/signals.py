@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accommodations.analytics import refresh_rollup
+from accommodations.caching import availability_version, invalidate
+from accommodations.models import Accommodation
+
+from .inventory import rebuild_inventory, return_rooms
+from .models import Booking
+
+
+def bump_bookings_version(*accommodation_ids: int | None):
+    """Mark the bookings of the given accommodations as changed.
+
+    Queryset `update()` and `bulk_create()` do not send model signals, so code
+    writing bookings that way must call this itself.
+    """
+    accommodation_ids = {id for id in accommodation_ids if id is not None}
+    Accommodation.objects.filter(id__in=accommodation_ids).update(
+        bookings_version=F("bookings_version") + 1
+    )
+    invalidate(*(availability_version(id) for id in accommodation_ids))
+    if settings.ANALYTICS_ROLLUP and accommodation_ids:
+        refresh_rollup(accommodation_ids)
+
+
+@receiver(post_save, sender=Booking)
+def booking_saved(sender, instance: Booking, **kwargs):
+    bump_bookings_version(instance.accommodation_id, instance._loaded_accommodation_id)
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance: Booking, **kwargs):
+    bump_bookings_version(instance.accommodation_id)
+    if instance.accommodation_type == Accommodation.AccommodationType.HOTEL:
+        return_rooms(*instance.stay)
+
+
+@receiver(post_save, sender=Accommodation)
+def accommodation_saved(sender, instance: Accommodation, created: bool, **kwargs):
+    if not created:
+        Booking.objects.filter(accommodation_id=instance.id).exclude(
+            accommodation_type=instance.type
+        ).update(accommodation_type=instance.type)
+        # Rooms left are counted again for a new room count or type
+        if instance._loaded_rooms != (instance.type, instance.rooms):
+            rebuild_inventory(instance.id)
+    instance._loaded_rooms = (instance.type, instance.rooms)
@@ -0,0 +1,31 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from bookings.models import IdempotencyKey
+
+
+class PurgeIdempotencyKeysCommandTests(TestCase):
+    def test_deletes_expired_keys(self):
+        for key in ["old", "new"]:
+            IdempotencyKey.objects.create(
+                key=key,
+                scope="POST /bookings/",
+                fingerprint="0" * 64,
+                status_code=201,
+                data={},
+            )
+        IdempotencyKey.objects.filter(key="old").update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+        stdout = StringIO()
+
+        call_command("purge_idempotency_keys", stdout=stdout)
+
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list("key", flat=True)), ["new"]
+        )
+        self.assertIn("Purged 1 idempotency keys", stdout.getvalue())
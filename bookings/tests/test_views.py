@@ -1,12 +1,41 @@
-from unittest.mock import patch
+import csv
+import hashlib
+import io
+import json
+from datetime import date
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, patch
 
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from rest_framework.test import APITestCase
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
 from typing import cast
 
+from accommodation_booking.application.commands.transcribe_voice_note import (
+    transcribe_voice_note_command,
+)
+from accommodation_booking.application.protocols.file_storage import StoredFile
+from accommodation_booking.application.protocols.transcription_service import (
+    TranscriptionResult,
+)
+from accommodation_booking.infrastructure.local.file_storage import LocalFileStorage
 from accommodations.models import Accommodation
-from bookings.models import Booking, VoiceNote
+from bookings.locks import lock_wait
+from bookings.models import Booking, IdempotencyKey, VoiceNote
+
+
+def consume_upload(chunks, file_id):
+    """Stand-in for `FileStorage.save_stream`, reading the upload"""
+    content = b"".join(chunks)
+    return StoredFile(size=len(content), sha256=hashlib.sha256(content).hexdigest())
 
 
 class BookingEndpointTests(APITestCase):
@@ -81,8 +110,625 @@ class BookingEndpointTests(APITestCase):
                 "guest_name": "Guest 3",
             }
 
-            response = self.client.post(url, payload, format="json")
+            # accommodation, insert, version bump and the savepoint around them
+            with self.assertNumQueries(5):
+                response = self.client.post(url, payload, format="json")
             self.assertEqual(response.status_code, 201)
+            self.assertEqual(
+                response.data["accommodation"], str(Accommodation.objects.get(id=id))
+            )
+
+    def test_search_guests(self):
+        for guest_name in ["Jonathan Smith", "Jon Smyth", "Maria Jones"]:
+            Booking.objects.create(
+                accommodation=self._hotel,
+                start_date="2025-02-01",
+                end_date="2025-02-02",
+                guest_name=guest_name,
+            )
+        url = reverse("booking-list-create")
+
+        def guests(text):
+            response = self.client.get(url, data={"q": text})
+            self.assertEqual(response.status_code, 200)
+            return [item["guest_name"] for item in response.data["results"]]
+
+        self.assertEqual(guests("jon"), ["Jon Smyth", "Jonathan Smith", "Maria Jones"])
+        self.assertEqual(guests("jonathon"), ["Jonathan Smith"])
+        self.assertEqual(guests("nobody"), [])
+
+        names, next_url = [], url
+        query = {"q": "jon", "pagination": "cursor", "page_size": 2}
+        while next_url:
+            response = self.client.get(next_url, data=query)
+            self.assertEqual(response.status_code, 200)
+            names += [item["guest_name"] for item in response.data["results"]]
+            next_url, query = response.data["next"], None
+        self.assertEqual(names, ["Jon Smyth", "Jonathan Smith", "Maria Jones"])
+
+    def test_admin_searches_guests_and_accommodations(self):
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "admin")
+        )
+        url = reverse("admin:bookings_booking_changelist")
+
+        def guests(text):
+            response = self.client.get(url, data={"q": text})
+            self.assertEqual(response.status_code, 200)
+            return [b.guest_name for b in response.context["cl"].result_list]
+
+        self.assertEqual(guests("guest 2")[0], "Guest 2")
+        self.assertEqual(guests("apartmnt"), ["Guest 1"])
+        self.assertEqual(guests("nobody"), [])
+
+    def test_database_rejects_overlapping_apartment_booking(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Booking.objects.create(
+                accommodation=self._apartment,
+                start_date="2025-01-05",
+                end_date="2025-01-10",
+                guest_name="Guest 3",
+            )
+
+        Booking.objects.create(
+            accommodation=self._hotel,
+            start_date="2025-01-05",
+            end_date="2025-01-10",
+            guest_name="Guest 3",
+        )
+
+    def test_should_not_allow_update_into_booked_dates(self):
+        booking = Booking.objects.create(
+            accommodation=self._apartment,
+            start_date="2025-01-10",
+            end_date="2025-01-12",
+            guest_name="Guest 3",
+        )
+        url = reverse("booking-detail", args=[booking.id])
+
+        response = self.client.patch(
+            url,
+            {
+                "accommodation_id": self._apartment.id,
+                "start_date": "2025-01-07",
+                "end_date": "2025-01-12",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("non_field_errors", response.data)  # type: ignore
+
+        # booking with its accommodation, update, version bump and savepoint
+        with self.assertNumQueries(5):
+            response = self.client.patch(
+                url,
+                {
+                    "accommodation_id": self._apartment.id,
+                    "start_date": "2025-01-09",
+                    "end_date": "2025-01-12",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_should_move_booking_to_another_accommodation(self):
+        booking = Booking.objects.get(guest_name="Guest 2")
+        url = reverse("booking-detail", args=[booking.id])
+
+        # booking, new accommodation, update, version bump and savepoint
+        with self.assertNumQueries(6):
+            response = self.client.patch(
+                url, {"accommodation_id": self._apartment.id}, format="json"
+            )
+        self.assertEqual(response.status_code, 400)
+
+        # and the rooms given back to the hotel it leaves
+        with self.assertNumQueries(7):
+            response = self.client.patch(
+                url,
+                {
+                    "accommodation_id": self._apartment.id,
+                    "start_date": "2025-02-01",
+                    "end_date": "2025-02-03",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["accommodation"], self._apartment.name)
+
+        response = self.client.patch(url, {"accommodation_id": 999_999}, format="json")
+        self.assertEqual(
+            response.data["accommodation_id"], ["Invalid accommodation ID"]
+        )
+
+    def test_accommodation_type_change_is_copied_to_bookings(self):
+        self._hotel.type = Accommodation.AccommodationType.APARTMENT
+        self._hotel.save()
+
+        self.assertEqual(
+            Booking.objects.get(guest_name="Guest 2").accommodation_type,
+            Accommodation.AccommodationType.APARTMENT,
+        )
+
+    def test_bulk_create_reports_errors_per_item(self):
+        url = reverse("booking-bulk-create")
+        bookings = [
+            # 0: free nights
+            (self._apartment.id, "2025-01-10", "2025-01-12"),
+            # 1: overlaps the existing booking
+            (self._apartment.id, "2025-01-05", "2025-01-09"),
+            # 2: overlaps item 0
+            (self._apartment.id, "2025-01-11", "2025-01-14"),
+            # 3: hotels can be booked twice
+            (self._hotel.id, "2025-01-01", "2025-01-03"),
+            # 4: unknown accommodation
+            (999_999, "2025-01-01", "2025-01-03"),
+            # 5: back to back with item 0
+            (self._apartment.id, "2025-01-12", "2025-01-13"),
+            # 6: invalid dates
+            (self._apartment.id, "2025-02-03", "2025-02-01"),
+        ]
+        payload = {
+            "bookings": [
+                {
+                    "accommodation_id": id,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "guest_name": "Guest 3",
+                }
+                for id, start_date, end_date in bookings
+            ]
+        }
+
+        # accommodations, existing overlaps, insert and version bump
+        with self.assertNumQueries(4 + 2):  # plus the transaction savepoint
+            response = self.client.post(url, payload, format="json")
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(
+            [item["index"] for item in response.data["created"]], [0, 3, 5]
+        )
+        errors = {item["index"]: item["errors"] for item in response.data["errors"]}
+        self.assertEqual(
+            errors[1],
+            {
+                "non_field_errors": [
+                    "Accommodation already booked for the selected date"
+                ]
+            },
+        )
+        self.assertEqual(
+            errors[2], {"non_field_errors": ["Overlaps item 0 of this batch"]}
+        )
+        self.assertEqual(errors[4], {"accommodation_id": ["Invalid accommodation ID"]})
+        self.assertIn("non_field_errors", errors[6])
+        self.assertEqual(Booking.objects.filter(guest_name="Guest 3").count(), 3)
+
+        self._apartment.refresh_from_db()
+        self.assertEqual(self._apartment.bookings_version, 2)
+
+    def test_bulk_create_rejects_batch_without_valid_items(self):
+        url = reverse("booking-bulk-create")
+        payload = {
+            "bookings": [
+                {
+                    "accommodation_id": self._apartment.id,
+                    "start_date": "2025-01-02",
+                    "end_date": "2025-01-03",
+                    "guest_name": "Guest 3",
+                }
+            ]
+        }
+
+        response = self.client.post(url, payload, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["created"], [])
+        self.assertFalse(Booking.objects.filter(guest_name="Guest 3").exists())
+
+    def test_hotel_with_rooms_is_booked_until_sold_out(self):
+        hotel = Accommodation.objects.create(
+            name="Small hotel",
+            description="",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.HOTEL,
+            rooms=2,
+        )
+        url = reverse("booking-list-create")
+
+        def book(start_date, end_date):
+            return self.client.post(
+                url,
+                {
+                    "accommodation_id": hotel.id,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "guest_name": "Guest 3",
+                },
+                format="json",
+            )
+
+        first = book("2025-01-01", "2025-01-05")
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(book("2025-01-03", "2025-01-06").status_code, 201)
+
+        # both rooms are taken on the 3rd and the 4th
+        response = book("2025-01-04", "2025-01-05")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["non_field_errors"], ["No rooms left for the selected dates"]
+        )
+        self.assertEqual(book("2025-01-05", "2025-01-06").status_code, 201)
+
+        # moving a booking gives its rooms back
+        response = self.client.patch(
+            reverse("booking-detail", args=[first.data["id"]]),
+            {"start_date": "2025-01-01", "end_date": "2025-01-03"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(book("2025-01-04", "2025-01-05").status_code, 201)
+
+        # and so does deleting it
+        self.assertEqual(book("2025-01-02", "2025-01-03").status_code, 201)
+        self.assertEqual(book("2025-01-02", "2025-01-03").status_code, 400)
+        Booking.objects.get(id=first.data["id"]).delete()
+        self.assertEqual(book("2025-01-02", "2025-01-03").status_code, 201)
+
+        self.assertEqual(
+            dict(hotel.inventory.values_list("night", "remaining")),
+            {
+                date(2025, 1, 1): 2,
+                date(2025, 1, 2): 0,
+                date(2025, 1, 3): 1,
+                date(2025, 1, 4): 0,
+                date(2025, 1, 5): 0,
+            },
+        )
+
+    def test_bulk_create_rejects_bookings_of_sold_out_nights(self):
+        hotel = Accommodation.objects.create(
+            name="Small hotel",
+            description="",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.HOTEL,
+            rooms=1,
+        )
+        url = reverse("booking-bulk-create")
+        bookings = [
+            (hotel.id, "2025-01-01", "2025-01-03"),
+            # the only room is taken by item 0 on the 2nd
+            (hotel.id, "2025-01-02", "2025-01-04"),
+            (hotel.id, "2025-01-03", "2025-01-04"),
+        ]
+        payload = {
+            "bookings": [
+                {
+                    "accommodation_id": id,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "guest_name": "Guest 3",
+                }
+                for id, start_date, end_date in bookings
+            ]
+        }
+
+        response = self.client.post(url, payload, format="json")
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([item["index"] for item in response.data["created"]], [0, 2])
+        self.assertEqual(
+            response.data["errors"],
+            [
+                {
+                    "index": 1,
+                    "errors": {
+                        "non_field_errors": ["No rooms left for the selected dates"]
+                    },
+                }
+            ],
+        )
+        self.assertFalse(hotel.inventory.exclude(remaining=0).exists())
+
+    @override_settings(BOOKING_ADVISORY_LOCKS=True)
+    def test_advisory_lock_mode_checks_overlaps_under_the_apartment_lock(self):
+        url = reverse("booking-list-create")
+        payload = {
+            "accommodation_id": self._apartment.id,
+            "start_date": "2025-01-05",
+            "end_date": "2025-01-10",
+            "guest_name": "Guest 3",
+        }
+        waits = lock_wait.count
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["non_field_errors"],
+            ["Accommodation already booked for the selected date"],
+        )
+        self.assertTrue(
+            any(
+                "pg_advisory_xact_lock" in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+        self.assertEqual(lock_wait.count, waits + 1)
+
+        response = self.client.post(
+            url, {**payload, "start_date": "2025-01-08"}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+
+        # a booking does not overlap itself
+        response = self.client.patch(
+            reverse("booking-detail", args=[response.data["id"]]),
+            {"start_date": "2025-01-09"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        # hotels are not locked
+        self.client.post(
+            url, {**payload, "accommodation_id": self._hotel.id}, format="json"
+        )
+        self.assertEqual(lock_wait.count, waits + 3)
+
+        response = self.client.post(
+            reverse("booking-bulk-create"),
+            {"bookings": [payload, {**payload, "start_date": "2025-01-01"}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [item["errors"]["non_field_errors"] for item in response.data["errors"]],
+            [["Accommodation already booked for the selected date"]] * 2,
+        )
+        self.assertEqual(lock_wait.count, waits + 4)
+
+    def _book_with_key(self, key, **data):
+        return self.client.post(
+            reverse("booking-list-create"),
+            {
+                "accommodation_id": self._apartment.id,
+                "start_date": "2025-02-01",
+                "end_date": "2025-02-03",
+                "guest_name": "Guest 3",
+                **data,
+            },
+            format="json",
+            headers={"Idempotency-Key": key},
+        )
+
+    def test_create_with_idempotency_key_is_replayed(self):
+        first = self._book_with_key("retry-1")
+        self.assertEqual(first.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", first)
+
+        # lock, stored response and unlock
+        with self.assertNumQueries(3):
+            retry = self._book_with_key("retry-1")
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Booking.objects.filter(guest_name="Guest 3").count(), 1)
+
+        # a new key runs again, and overlaps the first booking
+        self.assertEqual(self._book_with_key("retry-2").status_code, 400)
+        retry = self._book_with_key("retry-2")
+        self.assertEqual(retry.status_code, 400)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+
+    def test_idempotency_key_rejects_different_request(self):
+        self._book_with_key("retry-1")
+
+        response = self._book_with_key("retry-1", guest_name="Guest 4")
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(Booking.objects.filter(guest_name="Guest 4").exists())
+
+        response = self._book_with_key("k" * 256)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Idempotency-Key", response.data)
+
+    @override_settings(IDEMPOTENCY_KEY_TTL=0)
+    def test_expired_idempotency_key_runs_again(self):
+        self.assertEqual(self._book_with_key("retry-1").status_code, 201)
+
+        response = self._book_with_key("retry-1")
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(IdempotencyKey.objects.get().status_code, 400)
+
+    def test_export_streams_list_rows_as_ndjson(self):
+        response = self.client.get(reverse("booking-export"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="bookings.ndjson"'
+        )
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            self.client.get(reverse("booking-list-create")).json()["results"],
+        )
+
+    def test_export_filters_bookings_as_csv(self):
+        booking = Booking.objects.create(
+            accommodation=self._apartment,
+            start_date="2025-02-01",
+            end_date="2025-02-03",
+            guest_name='Guest, "quoted"',
+        )
+        url = reverse("booking-export")
+
+        response = self.client.get(
+            url,
+            {
+                "format": "csv",
+                "start_date": "2025-01-20",
+                "end_date": "2025-03-01",
+                "accommodation_id": self._apartment.id,
+            },
+        )
+
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        rows = list(csv.reader(io.StringIO(response.getvalue().decode())))
+        self.assertEqual(
+            rows[1:],
+            [
+                [
+                    str(booking.id),
+                    "Apartment",
+                    "2025-02-01",
+                    "2025-02-03",
+                    'Guest, "quoted"',
+                ]
+            ],
+        )
+        self.assertEqual(
+            rows[0], ["id", "accommodation", "start_date", "end_date", "guest_name"]
+        )
+
+        response = self.client.get(
+            url, {"start_date": "2026-01-01"}, HTTP_ACCEPT="text/csv"
+        )
+        self.assertEqual(
+            response.getvalue(), b"id,accommodation,start_date,end_date,guest_name\r\n"
+        )
+
+    def test_export_reports_errors_in_json(self):
+        response = self.client.get(
+            reverse("booking-export"),
+            {"format": "csv", "start_date": "2025-01-08", "end_date": "2025-01-01"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            response.json(), {"non_field_errors": ["End date must be after start date"]}
+        )
+
+
+class ConcurrentBookingTests(APITransactionTestCase):
+    def setUp(self) -> None:
+        self._apartment = Accommodation.objects.create(
+            name="Apartment",
+            description="",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+
+    def test_only_one_of_concurrent_overlapping_bookings_succeeds(self):
+        self._race_for_apartment()
+
+    @override_settings(BOOKING_ADVISORY_LOCKS=True)
+    def test_only_one_of_concurrent_bookings_succeeds_with_advisory_locks(self):
+        self._race_for_apartment()
+
+    def _race_for_apartment(self):
+        url = reverse("booking-list-create")
+        bookers = 8
+        barrier = Barrier(bookers)
+
+        def book(index):
+            barrier.wait()
+            try:
+                return (
+                    APIClient()
+                    .post(
+                        url,
+                        {
+                            "accommodation_id": self._apartment.id,
+                            "start_date": "2025-01-01",
+                            "end_date": "2025-01-08",
+                            "guest_name": f"Guest {index}",
+                        },
+                        format="json",
+                    )
+                    .status_code
+                )
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(bookers) as executor:
+            status_codes = sorted(executor.map(book, range(bookers)))
+
+        self.assertEqual(status_codes, [201] + [400] * (bookers - 1))
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_concurrent_hotel_bookings_never_overbook(self):
+        hotel = Accommodation.objects.create(
+            name="Hotel",
+            description="",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.HOTEL,
+            rooms=3,
+        )
+        url = reverse("booking-list-create")
+        bookers = 8
+        barrier = Barrier(bookers)
+
+        def book(index):
+            barrier.wait()
+            try:
+                # stays overlapping on the 4th, starting on different nights
+                return (
+                    APIClient()
+                    .post(
+                        url,
+                        {
+                            "accommodation_id": hotel.id,
+                            "start_date": f"2025-01-0{1 + index % 4}",
+                            "end_date": "2025-01-05",
+                            "guest_name": f"Guest {index}",
+                        },
+                        format="json",
+                    )
+                    .status_code
+                )
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(bookers) as executor:
+            status_codes = sorted(executor.map(book, range(bookers)))
+
+        self.assertEqual(status_codes, [201] * 3 + [400] * (bookers - 3))
+        self.assertEqual(hotel.inventory.get(night="2025-01-04").remaining, 0)
+
+    def test_concurrent_duplicates_wait_for_the_first_request(self):
+        url = reverse("booking-list-create")
+        bookers = 8
+        barrier = Barrier(bookers)
+
+        def book(index):
+            barrier.wait()
+            try:
+                response = APIClient().post(
+                    url,
+                    {
+                        "accommodation_id": self._apartment.id,
+                        "start_date": "2025-01-01",
+                        "end_date": "2025-01-08",
+                        "guest_name": "Guest",
+                    },
+                    format="json",
+                    headers={"Idempotency-Key": "retry-1"},
+                )
+                return response.status_code, response.data["id"]
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(bookers) as executor:
+            responses = set(executor.map(book, range(bookers)))
+
+        self.assertEqual(responses, {(201, Booking.objects.get().id)})
 
 
 class VoiceNoteEndpointTests(APITestCase):
@@ -105,7 +751,8 @@ class VoiceNoteEndpointTests(APITestCase):
         "accommodation_booking.application.usecases.create_voice_note.transcribe_voice_note_command.delay"
     )
     @patch(
-        "accommodation_booking.infrastructure.local.file_storage.LocalFileStorage.save_file_as"
+        "accommodation_booking.infrastructure.local.file_storage.LocalFileStorage.save_stream",
+        side_effect=consume_upload,
     )
     def test_should_create_voice_note_and_enqueue_transcription(
         self, mock_save_file, mock_delay
@@ -123,6 +770,10 @@ class VoiceNoteEndpointTests(APITestCase):
         self.assertEqual(voice_note.status, VoiceNote.Status.PENDING)
         self.assertEqual(voice_note.file_name, "note.mp3")
         self.assertEqual(voice_note.file_type, "audio/mpeg")
+        self.assertEqual(voice_note.file_size, len(b"dummy-bytes"))
+        self.assertEqual(
+            voice_note.file_sha256, hashlib.sha256(b"dummy-bytes").hexdigest()
+        )
         mock_save_file.assert_called_once()
         mock_delay.assert_called_once_with(
             booking_id=self.booking.id,
@@ -135,7 +786,8 @@ class VoiceNoteEndpointTests(APITestCase):
         "accommodation_booking.application.usecases.create_voice_note.transcribe_voice_note_command.delay"
     )
     @patch(
-        "accommodation_booking.infrastructure.local.file_storage.LocalFileStorage.save_file_as"
+        "accommodation_booking.infrastructure.local.file_storage.LocalFileStorage.save_stream",
+        side_effect=consume_upload,
     )
     def test_should_reject_invalid_mime(self, mock_save_file, mock_delay):
         url = reverse("voice-note-list-create", kwargs={"booking_id": self.booking.id})
@@ -150,35 +802,319 @@ class VoiceNoteEndpointTests(APITestCase):
         mock_save_file.assert_not_called()
         mock_delay.assert_not_called()
 
+    @patch(
+        "accommodation_booking.application.usecases.create_voice_note.transcribe_voice_note_command.delay"
+    )
+    @patch(
+        "accommodation_booking.infrastructure.local.file_storage.LocalFileStorage.save_stream",
+        side_effect=consume_upload,
+    )
+    def test_should_replay_voice_note_with_idempotency_key(
+        self, mock_save_file, mock_delay
+    ):
+        url = reverse("voice-note-list-create", kwargs={"booking_id": self.booking.id})
+
+        def post(content):
+            audio = SimpleUploadedFile("note.mp3", content, content_type="audio/mpeg")
+            return self.client.post(
+                url,
+                {"audio_file": audio},
+                format="multipart",
+                headers={"Idempotency-Key": "retry-1"},
+            )
+
+        first = post(b"dummy-bytes")
+        retry = post(b"dummy-bytes")
+
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(VoiceNote.objects.count(), 1)
+        mock_save_file.assert_called_once()
+        mock_delay.assert_called_once()
+
+        self.assertEqual(post(b"other-bytes").status_code, 422)
+
     def test_should_require_audio_file(self):
         url = reverse("voice-note-list-create", kwargs={"booking_id": self.booking.id})
         response = self.client.post(url, {}, format="multipart")
         self.assertEqual(response.status_code, 400)
 
-    @patch(
-        "accommodation_booking.infrastructure.local.file_storage.LocalFileStorage.load_file"
-    )
-    def test_should_download_voice_note_audio(self, mock_load_file):
-        mock_load_file.return_value = b"audio-bytes"
-        voice_note = VoiceNote.objects.create(
+    def test_should_export_voice_notes(self):
+        other_accommodation = Accommodation.objects.create(
+            name="Other",
+            description="",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+        other_booking = Booking.objects.create(
+            accommodation=other_accommodation,
+            start_date="2025-01-01",
+            end_date="2025-01-08",
+            guest_name="Other guest",
+        )
+        for booking in [self.booking, other_booking]:
+            VoiceNote.objects.create(
+                booking=booking,
+                transcript="Late arrival",
+                status=VoiceNote.Status.SUCCEEDED,
+                file_name="note.mp3",
+                file_type="audio/mpeg",
+            )
+
+        response = self.client.get(
+            reverse("voice-note-export"),
+            {"accommodation_id": self.accommodation.id},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            self.client.get(
+                reverse("voice-note-list-create", args=[self.booking.id])
+            ).json()["results"],
+        )
+
+    def test_should_search_transcripts_across_bookings(self):
+        other_accommodation = Accommodation.objects.create(
+            name="Other",
+            description="",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+        other_booking = Booking.objects.create(
+            accommodation=other_accommodation,
+            start_date="2025-01-01",
+            end_date="2025-01-08",
+            guest_name="Other guest",
+        )
+        arriving, asking, breakfast = [
+            VoiceNote.objects.create(booking=booking, transcript=transcript)
+            for booking, transcript in [
+                (self.booking, ""),
+                (other_booking, "Late check-in please, a late check-in"),
+                (other_booking, "Breakfast at eight"),
+            ]
+        ]
+        transcription_service = Mock()
+        transcription_service.transcribe.return_value = TranscriptionResult(
+            "We will arrive late, so check-in after midnight"
+        )
+        transcribe_voice_note_command(
+            self.booking.id,
+            arriving.id,
+            "note.mp3",
+            "audio/mpeg",
+            file_storage=Mock(),
+            transcription_service=transcription_service,
+        )
+        url = reverse("voice-note-search")
+
+        response = self.client.get(url, {"q": "late check-in"})
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([note["id"] for note in results], [asking.id, arriving.id])
+        self.assertEqual(results[1]["booking_id"], self.booking.id)
+        self.assertEqual(
+            results[1]["headline"],
+            "will arrive <mark>late</mark>, so <mark>check</mark>-in after midnight",
+        )
+        self.assertGreater(results[0]["rank"], results[1]["rank"])
+        self.assertIsNone(response.json()["next"])
+
+        response = self.client.get(
+            url, {"q": "late check-in", "accommodation_id": self.accommodation.id}
+        )
+        self.assertEqual(
+            [note["id"] for note in response.json()["results"]], [arriving.id]
+        )
+        response = self.client.get(url, {"q": "breakfast -eight"})
+        self.assertEqual(response.json()["results"], [])
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+    def test_should_escape_search_headlines(self):
+        VoiceNote.objects.create(
             booking=self.booking,
-            transcript="",
+            transcript='We are "late" & \x02it\'s\x03 2 < 3, check-in',
+        )
+
+        response = self.client.get(reverse("voice-note-search"), {"q": "late check"})
+
+        self.assertEqual(
+            response.json()["results"][0]["headline"],
+            "<mark>late</mark>&quot; &amp; it&#x27;s 2 &lt; 3, <mark>check</mark>",
+        )
+
+    def test_should_page_tied_search_results_by_id(self):
+        notes = [
+            VoiceNote.objects.create(booking=self.booking, transcript="Late check-in")
+            for _ in range(5)
+        ]
+        ids, url = [], reverse("voice-note-search") + "?q=late&page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(response.json()["previous"])
+            ids += [note["id"] for note in response.json()["results"]]
+            url = response.json()["next"]
+
+        self.assertEqual(ids, [note.id for note in notes])
+        response = self.client.get(
+            reverse("voice-note-search"), {"q": "late", "cursor": "bad"}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_admin_searches_transcripts(self):
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "admin")
+        )
+        for transcript in ["Breakfast at eight", "Late check-in, very late"]:
+            VoiceNote.objects.create(booking=self.booking, transcript=transcript)
+
+        response = self.client.get(
+            reverse("admin:bookings_voicenote_changelist"), {"q": "late"}
+        )
+
+        self.assertEqual(
+            [note.transcript for note in response.context["cl"].result_list],
+            ["Late check-in, very late"],
+        )
+
+
+class VoiceNoteAudioDownloadTests(APITestCase):
+    AUDIO = bytes(range(256)) * 40
+
+    def setUp(self) -> None:
+        accommodation = Accommodation.objects.create(
+            name="Apartment",
+            description="",
+            price="100.0",
+            location="City",
+            type=Accommodation.AccommodationType.APARTMENT,
+        )
+        booking = Booking.objects.create(
+            accommodation=accommodation,
+            start_date="2025-01-01",
+            end_date="2025-01-08",
+            guest_name="Guest",
+        )
+        self.voice_note = VoiceNote.objects.create(
+            booking=booking,
             status=VoiceNote.Status.SUCCEEDED,
             file_name="note.mp3",
             file_type="audio/mpeg",
+            file_sha256=hashlib.sha256(self.AUDIO).hexdigest(),
         )
-
-        url = reverse(
+        self.url = reverse(
             "voice-note-audio",
-            kwargs={"booking_id": self.booking.id, "pk": voice_note.id},
+            kwargs={"booking_id": booking.id, "pk": self.voice_note.id},
+        )
+
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.audio_path = Path(directory.name) / self.voice_note.storage_key.as_string()
+        self.audio_path.write_bytes(self.AUDIO)
+        get_file_path = patch.object(
+            LocalFileStorage,
+            "get_file_path",
+            lambda _, file_id: Path(directory.name) / file_id,
         )
+        get_file_path.start()
+        self.addCleanup(get_file_path.stop)
+
+    def get(self, **headers):
+        return self.client.get(self.url, headers=headers)
+
+    def content(self, response) -> bytes:
+        return b"".join(response.streaming_content)
 
-        response = self.client.get(url)
+    def test_should_download_voice_note_audio(self):
+        response = self.get()
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.content, b"audio-bytes")
+        self.assertEqual(self.content(response), self.AUDIO)
         self.assertEqual(response["Content-Type"], "audio/mpeg")
+        self.assertEqual(response["Content-Length"], str(len(self.AUDIO)))
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="note.mp3"'
+        )
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["ETag"], f'"{self.voice_note.file_sha256}"')
+        self.assertIn("Last-Modified", response)
+
+    def test_should_serve_byte_ranges(self):
+        size = len(self.AUDIO)
+        for header, start, stop in [
+            ("bytes=100-199", 100, 200),
+            ("bytes=10000-", 10000, size),
+            ("bytes=-24", size - 24, size),
+            ("bytes=10000-99999", 10000, size),
+        ]:
+            with self.subTest(header=header):
+                response = self.get(range=header)
+
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(self.content(response), self.AUDIO[start:stop])
+                self.assertEqual(response["Content-Length"], str(stop - start))
+                self.assertEqual(
+                    response["Content-Range"], f"bytes {start}-{stop - 1}/{size}"
+                )
+
+    def test_should_serve_the_whole_file_for_unsupported_ranges(self):
+        for headers in [
+            {"range": "bytes=0-9,20-29"},
+            {"range": "bytes=20-10"},
+            {"range": "items=0-9"},
+            {"range": "bytes=0-9", "if_range": '"other"'},
+            {"range": "bytes=0-9", "if_range": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        ]:
+            with self.subTest(headers=headers):
+                response = self.get(**headers)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.content(response), self.AUDIO)
+
+        etag = self.get()["ETag"]
+        self.assertEqual(self.get(range="bytes=0-9", if_range=etag).status_code, 206)
+
+    def test_should_reject_ranges_past_the_end(self):
+        response = self.get(range=f"bytes={len(self.AUDIO)}-")
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.AUDIO)}")
+
+    def test_should_answer_conditional_requests(self):
+        first = self.get()
+
+        not_modified = self.get(if_none_match=first["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], first["ETag"])
+        self.assertEqual(
+            self.get(if_modified_since=first["Last-Modified"]).status_code, 304
+        )
+        self.assertEqual(self.get(if_match='"other"').status_code, 412)
+
+    @override_settings(AUDIO_ACCEL_REDIRECT_PREFIX="/protected-audio/")
+    def test_should_hand_the_file_to_the_proxy(self):
+        response = self.get(range="bytes=0-9")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            f"/protected-audio/{self.voice_note.storage_key.as_string()}",
+        )
         self.assertEqual(
             response["Content-Disposition"], 'attachment; filename="note.mp3"'
         )
-        mock_load_file.assert_called_once_with(voice_note.storage_key.as_string())
+
+    def test_should_return_404_when_audio_is_missing(self):
+        self.audio_path.unlink()
+
+        response = self.get()
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"message": "Audio file not found"})
@@ -1,15 +1,36 @@
+from django.conf import settings
 from django.urls import path
 
+from .async_views import AsyncVoiceNoteAudioDownloadView
 from .views import (
+    BookingBulkCreateView,
     BookingDetailView,
+    BookingExportView,
     BookingListCreateView,
     VoiceNoteAudioDownloadView,
     VoiceNoteDetailView,
+    VoiceNoteExportView,
     VoiceNoteListCreateView,
+    VoiceNoteSearchView,
 )
 
+if settings.ASYNC_VIEWS:
+    VoiceNoteAudioDownloadView = AsyncVoiceNoteAudioDownloadView
+
 urlpatterns = [
     path("", BookingListCreateView.as_view(), name="booking-list-create"),
+    path("bulk/", BookingBulkCreateView.as_view(), name="booking-bulk-create"),
+    path("export/", BookingExportView.as_view(), name="booking-export"),
+    path(
+        "voice-notes/export/",
+        VoiceNoteExportView.as_view(),
+        name="voice-note-export",
+    ),
+    path(
+        "voice-notes/search/",
+        VoiceNoteSearchView.as_view(),
+        name="voice-note-search",
+    ),
     path("<int:pk>/", BookingDetailView.as_view(), name="booking-detail"),
     path(
         "<int:booking_id>/voice-notes/",
@@ -2,22 +2,57 @@ from logging import getLogger
 
 from dependency_injector.wiring import Provide, inject
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema
-from rest_framework import generics, status
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    extend_schema,
+    extend_schema_serializer,
+)
+from rest_framework import generics, serializers, status
 from rest_framework.parsers import MultiPartParser
 from rest_framework.views import Response
-from django.http import HttpResponse
 
 from accommodation_booking.application.protocols.file_storage import FileStorage
 from accommodation_booking.container import ApplicationContainer, UseCases
-
+from accommodation_booking.exports import StreamingExportMixin
+from accommodation_booking.fast_reads import FastListMixin
+from accommodation_booking.pagination import RankCursorPagination
+from accommodation_booking.sparse_fields import (
+    SparseFieldsMixin,
+    sparse_fields_parameter,
+)
+
+from .audio import AudioDownload
+from .bulk import create_bookings
+from .idempotency import IDEMPOTENCY_HEADER, idempotent
 from .models import Booking, VoiceNote
-from .serializers import BookingSerializer, VoiceNoteSerializer
+from .search import search_bookings, search_voice_notes
+from .serializers import (
+    BookingSerializer,
+    BulkBookingItemSerializer,
+    TRANSCRIPT_EXCERPT_LENGTH,
+    VoiceNoteSearchResultSerializer,
+    VoiceNoteSerializer,
+    transcript_excerpt,
+)
 
 logger = getLogger(__name__)
 
-
-class BookingListCreateView(generics.ListCreateAPIView):
+idempotency_key_parameter = OpenApiParameter(
+    name=IDEMPOTENCY_HEADER,
+    location=OpenApiParameter.HEADER,
+    description=(
+        "Client-chosen key of the request, at most 255 characters. A retry with "
+        "the same key and data gets the stored response, with an "
+        "Idempotent-Replayed header, instead of running again; a request reusing "
+        "it with different data gets 422"
+    ),
+    required=False,
+    type=OpenApiTypes.STR,
+)
+
+
+class BookingListCreateView(FastListMixin, generics.ListCreateAPIView):
     """List all bookings or create a new booking"""
 
     queryset = Booking.objects.select_related("accommodation").all()
@@ -25,22 +60,129 @@ class BookingListCreateView(generics.ListCreateAPIView):
 
     @extend_schema(
         summary="List all bookings",
-        description="Get a list of all bookings",
+        description=(
+            "Get a list of all bookings. With q, only those of matching guests, "
+            "the closest first"
+        ),
         tags=["Bookings"],
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                description="Part of the guest name, misspellings included",
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+            sparse_fields_parameter(BookingSerializer),
+        ],
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        text = self.request.query_params.get("q")
+        if text:
+            queryset = search_bookings(queryset, text)
+        return queryset
+
     @extend_schema(
         summary="Create a new booking",
-        description="Create a new booking for an accommodation",
+        description=(
+            "Create a new booking for an accommodation. Retries sent with the "
+            "same Idempotency-Key get the response to the first request back"
+        ),
         tags=["Bookings"],
+        parameters=[idempotency_key_parameter],
     )
+    @idempotent
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
 
 
-class BookingDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BookingBulkCreateView(generics.GenericAPIView):
+    """Create many bookings at once"""
+
+    @extend_schema_serializer(component_name="BookingBulkRequest")
+    class RequestSerializer(serializers.Serializer):
+        """Serializer to validate request body"""
+
+        bookings = serializers.ListField(
+            child=serializers.DictField(),
+            allow_empty=False,
+            max_length=5000,
+        )
+
+    class CreatedBooking(serializers.Serializer):
+        index = serializers.IntegerField()
+        booking = BookingSerializer()
+
+    class RejectedBooking(serializers.Serializer):
+        index = serializers.IntegerField()
+        errors = serializers.DictField(
+            child=serializers.ListField(child=serializers.CharField())
+        )
+
+    class BulkResponse(serializers.Serializer):
+        def get_fields(self):
+            fields = super().get_fields()
+            fields["created"] = BookingBulkCreateView.CreatedBooking(many=True)
+            fields["errors"] = BookingBulkCreateView.RejectedBooking(many=True)
+            return fields
+
+    serializer_class = RequestSerializer
+
+    @extend_schema(
+        summary="Create bookings in bulk",
+        description=(
+            "Creates a batch of bookings in one transaction. Invalid items, unknown "
+            "accommodations and items overlapping an existing booking or another "
+            "item of the batch are reported by position; the other items are "
+            "created. Responds 201 when every item was created, 207 when only some "
+            "were and 400 when none were"
+        ),
+        tags=["Bookings"],
+        request=RequestSerializer,
+        responses={201: BulkResponse, 207: BulkResponse, 400: BulkResponse},
+    )
+    def post(self, request, *args, **kwargs):
+        request_serializer = self.RequestSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        # One serializer validates every item, as ListSerializer does, so its
+        # fields are built once rather than per item
+        item_serializer = BulkBookingItemSerializer()
+        items, errors = {}, {}
+        for index, data in enumerate(request_serializer.validated_data["bookings"]):
+            try:
+                items[index] = item_serializer.run_validation(data)
+            except serializers.ValidationError as ex:
+                errors[index] = ex.detail
+
+        created, rejected = create_bookings(items) if items else ({}, {})
+        errors.update(rejected)
+
+        serializer = self.BulkResponse(
+            {
+                "created": [
+                    {"index": index, "booking": booking}
+                    for index, booking in sorted(created.items())
+                ],
+                "errors": [
+                    {"index": index, "errors": item_errors}
+                    for index, item_errors in sorted(errors.items())
+                ],
+            }
+        )
+        if not errors:
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(serializer.data, status=response_status)
+
+
+class BookingDetailView(SparseFieldsMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a booking"""
 
     queryset = Booking.objects.select_related("accommodation").all()
@@ -50,6 +192,7 @@ class BookingDetailView(generics.RetrieveUpdateDestroyAPIView):
         summary="Get booking by ID",
         description="Retrieve a specific booking by its ID",
         tags=["Bookings"],
+        parameters=[sparse_fields_parameter(BookingSerializer)],
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
@@ -79,7 +222,87 @@ class BookingDetailView(generics.RetrieveUpdateDestroyAPIView):
         return super().patch(request, *args, **kwargs)
 
 
-class VoiceNoteListCreateView(generics.ListCreateAPIView):
+class BookingExportView(StreamingExportMixin, generics.GenericAPIView):
+    """Stream all bookings as NDJSON or CSV"""
+
+    queryset = Booking.objects.all()
+    serializer_class = BookingSerializer
+    export_name = "bookings"
+
+    class RequestSerializer(serializers.Serializer):
+        """Serializer to validate query input parameters"""
+
+        start_date = serializers.DateField(required=False)
+        end_date = serializers.DateField(required=False)
+        accommodation_id = serializers.IntegerField(min_value=1, required=False)
+
+        def validate(self, data):
+            if (
+                "start_date" in data
+                and "end_date" in data
+                and data["end_date"] <= data["start_date"]
+            ):
+                raise serializers.ValidationError("End date must be after start date")
+            return data
+
+    export_parameters = [
+        OpenApiParameter(
+            name="start_date",
+            description="First day of the range (YYYY-MM-DD)",
+            required=False,
+            type=OpenApiTypes.DATE,
+        ),
+        OpenApiParameter(
+            name="end_date",
+            description="Day after the last day of the range (YYYY-MM-DD)",
+            required=False,
+            type=OpenApiTypes.DATE,
+        ),
+        OpenApiParameter(
+            name="accommodation_id",
+            description="Only rows of this accommodation",
+            required=False,
+            type=OpenApiTypes.INT,
+        ),
+        OpenApiParameter(
+            name="format",
+            description="Export format, instead of the Accept header",
+            required=False,
+            type=OpenApiTypes.STR,
+            enum=["ndjson", "csv"],
+        ),
+    ]
+
+    @extend_schema(
+        summary="Export bookings",
+        description=(
+            "Streams every booking, in the representation of the booking list, "
+            "as newline-delimited JSON or CSV. start_date and end_date select "
+            "the bookings whose stay overlaps the range."
+        ),
+        tags=["Bookings"],
+        parameters=[*export_parameters, sparse_fields_parameter(BookingSerializer)],
+        responses={
+            (200, "application/x-ndjson"): BookingSerializer,
+            (200, "text/csv"): OpenApiResponse(OpenApiTypes.STR),
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        request_serializer = self.RequestSerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+        params = request_serializer.validated_data
+
+        queryset = self.get_queryset()
+        if "start_date" in params:
+            queryset = queryset.filter(end_date__gt=params["start_date"])
+        if "end_date" in params:
+            queryset = queryset.filter(start_date__lt=params["end_date"])
+        if "accommodation_id" in params:
+            queryset = queryset.filter(accommodation_id=params["accommodation_id"])
+        return self.export(queryset)
+
+
+class VoiceNoteListCreateView(FastListMixin, generics.ListCreateAPIView):
     """List all voice notes or create a new voice note"""
 
     parser_classes = [MultiPartParser]
@@ -88,18 +311,46 @@ class VoiceNoteListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         return VoiceNote.objects.filter(booking_id=self.kwargs["booking_id"])
 
+    def get_read_columns(self):
+        columns = super().get_read_columns()
+        if (
+            self.request.query_params.get("transcript") == "excerpt"
+            and "transcript" in columns
+        ):
+            columns = {**columns, "transcript": transcript_excerpt()}
+        return columns
+
     @extend_schema(
         summary="List all voice notes",
         description="Get a list of all voice notes associated with a booking",
         tags=["VoiceNotes"],
+        parameters=[
+            sparse_fields_parameter(VoiceNoteSerializer),
+            OpenApiParameter(
+                name="transcript",
+                description=(
+                    "`excerpt` returns the first "
+                    f"{TRANSCRIPT_EXCERPT_LENGTH} characters of each transcript, "
+                    "ending with … when cut, instead of all of it"
+                ),
+                required=False,
+                type=OpenApiTypes.STR,
+                enum=["excerpt"],
+            ),
+        ],
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
     @extend_schema(
         summary="Create a new voice note",
-        description="Create a new voice note for a booking",
+        description=(
+            "Create a new voice note for a booking. Retries sent with the same "
+            "Idempotency-Key get the response to the first request back, without "
+            "storing or transcribing the audio again"
+        ),
         tags=["VoiceNotes"],
+        parameters=[idempotency_key_parameter],
         request={
             "multipart/form-data": {
                 "type": "object",
@@ -112,6 +363,7 @@ class VoiceNoteListCreateView(generics.ListCreateAPIView):
             }
         },
     )
+    @idempotent
     @inject
     def post(
         self,
@@ -127,14 +379,15 @@ class VoiceNoteListCreateView(generics.ListCreateAPIView):
             )
 
         booking_id = kwargs["booking_id"]
-        audio_file = audio_file_handle.read()
         file_name = audio_file_handle.name
         file_type = audio_file_handle.content_type
 
         try:
+            # Uploads over FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to a
+            # temporary file, and copied to storage a chunk at a time
             voice_note = usecases.create_voice_note.execute(
                 booking_id,
-                audio_file,
+                audio_file_handle.chunks(),
                 file_name,
                 file_type,
             )
@@ -156,6 +409,114 @@ class VoiceNoteListCreateView(generics.ListCreateAPIView):
         )
 
 
+class VoiceNoteExportView(StreamingExportMixin, generics.GenericAPIView):
+    """Stream the voice notes of all bookings as NDJSON or CSV"""
+
+    queryset = VoiceNote.objects.all()
+    serializer_class = VoiceNoteSerializer
+    export_name = "voice-notes"
+
+    @extend_schema(
+        summary="Export voice notes",
+        description=(
+            "Streams the voice notes of every booking, in the representation of "
+            "the voice-note list, as newline-delimited JSON or CSV. start_date "
+            "and end_date select the notes created in the range."
+        ),
+        tags=["VoiceNotes"],
+        parameters=[
+            *BookingExportView.export_parameters,
+            sparse_fields_parameter(VoiceNoteSerializer),
+        ],
+        responses={
+            (200, "application/x-ndjson"): VoiceNoteSerializer,
+            (200, "text/csv"): OpenApiResponse(OpenApiTypes.STR),
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        request_serializer = BookingExportView.RequestSerializer(
+            data=request.query_params
+        )
+        request_serializer.is_valid(raise_exception=True)
+        params = request_serializer.validated_data
+
+        queryset = self.get_queryset()
+        if "start_date" in params:
+            queryset = queryset.filter(created_at__date__gte=params["start_date"])
+        if "end_date" in params:
+            queryset = queryset.filter(created_at__date__lt=params["end_date"])
+        if "accommodation_id" in params:
+            queryset = queryset.filter(
+                booking__accommodation_id=params["accommodation_id"]
+            )
+        return self.export(queryset)
+
+
+class VoiceNoteSearchView(SparseFieldsMixin, generics.ListAPIView):
+    """Search the transcripts of the voice notes of all bookings"""
+
+    serializer_class = VoiceNoteSearchResultSerializer
+    pagination_class = RankCursorPagination
+
+    class RequestSerializer(serializers.Serializer):
+        """Serializer to validate query input parameters"""
+
+        q = serializers.CharField()
+        accommodation_id = serializers.IntegerField(min_value=1, required=False)
+        booking_id = serializers.IntegerField(min_value=1, required=False)
+
+    @extend_schema(
+        summary="Search voice notes",
+        description=(
+            "Lists the voice notes whose transcript has the words of q, across "
+            "bookings, the most relevant first, with the matched words marked in "
+            "fragments of the transcript. Results are paginated with an opaque "
+            "cursor."
+        ),
+        tags=["VoiceNotes"],
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                description=(
+                    'Words to find, in web search syntax: "quoted phrases", '
+                    "or, -excluded"
+                ),
+                required=True,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="accommodation_id",
+                description="Only notes of bookings of this accommodation",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+            OpenApiParameter(
+                name="booking_id",
+                description="Only notes of this booking",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+            sparse_fields_parameter(VoiceNoteSearchResultSerializer),
+        ],
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        request_serializer = self.RequestSerializer(data=self.request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+        params = request_serializer.validated_data
+
+        queryset = VoiceNote.objects.defer("search_vector")
+        if "accommodation_id" in params:
+            queryset = queryset.filter(
+                booking__accommodation_id=params["accommodation_id"]
+            )
+        if "booking_id" in params:
+            queryset = queryset.filter(booking_id=params["booking_id"])
+        return search_voice_notes(queryset, params["q"])
+
+
 class VoiceNoteAudioDownloadView(generics.GenericAPIView):
     """Download the raw audio file for a voice note"""
 
@@ -166,10 +527,17 @@ class VoiceNoteAudioDownloadView(generics.GenericAPIView):
 
     @extend_schema(
         summary="Download voice note audio",
-        description="Download the original audio file for a voice note",
+        description=(
+            "Download the original audio file for a voice note. A single "
+            "`Range: bytes=...` is answered with 206 Partial Content, and "
+            "`If-None-Match`/`If-Modified-Since` with 304 Not Modified."
+        ),
         tags=["VoiceNotes"],
         responses={
             200: OpenApiTypes.BINARY,
+            206: OpenApiTypes.BINARY,
+            304: None,
+            416: None,
             404: {
                 "type": "object",
                 "properties": {"message": {"type": "string"}},
@@ -186,22 +554,16 @@ class VoiceNoteAudioDownloadView(generics.GenericAPIView):
     ):
         voice_note = self.get_object()
         try:
-            audio_file = file_storage.load_file(voice_note.storage_key.as_string())
+            download = AudioDownload(request, voice_note, file_storage)
         except FileNotFoundError:
             return Response(
                 {"message": "Audio file not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-
-        file_name = voice_note.file_name or voice_note.storage_key.as_string()
-        content_type = voice_note.file_type or "application/octet-stream"
-
-        response = HttpResponse(audio_file, content_type=content_type)
-        response["Content-Disposition"] = f'attachment; filename="{file_name}"'
-        return response
+        return download.response()
 
 
-class VoiceNoteDetailView(generics.RetrieveDestroyAPIView):
+class VoiceNoteDetailView(SparseFieldsMixin, generics.RetrieveDestroyAPIView):
     """Retrieve or delete a voice note"""
 
     serializer_class = VoiceNoteSerializer
@@ -213,6 +575,7 @@ class VoiceNoteDetailView(generics.RetrieveDestroyAPIView):
         summary="Get voice note by ID",
         description="Retrieve a specific voice note by its ID",
         tags=["VoiceNotes"],
+        parameters=[sparse_fields_parameter(VoiceNoteSerializer)],
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
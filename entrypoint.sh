@@ -12,6 +12,7 @@ echo "PostgreSQL started"
 # Run migrations
 python manage.py makemigrations
 python manage.py migrate
+python manage.py createcachetable
 
 # Execute the main command
 exec "$@" 
\ No newline at end of file